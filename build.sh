@@ -1 +1 @@
-jupyter-book build denotational
+cd denotational && DENOT_STATIC_WIDGETS=1 python -m denot.notebook_cache --build
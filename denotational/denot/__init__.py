@@ -0,0 +1,8 @@
+"""
+Expression language and denotational semantics engine behind the book's
+interactive notebooks.
+"""
+
+from .compiler import compile_tree
+from .evaluator import evaluate_tree
+from .parser import ParseError, parse_expression, tokenize
@@ -0,0 +1,5 @@
+"""
+Benchmarks for the denot package.
+
+Run from the ``denotational`` directory, e.g. ``python -m denot.benchmarks.parsing``.
+"""
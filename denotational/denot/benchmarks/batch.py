@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Evaluate one expression over a million (x, y, z) environments: a Python loop
+over evaluate_tree against whole-array evaluation and chunked streaming.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from denot.benchmarks.corpus import random_expression
+from denot.evaluator import evaluate_tree
+from denot.parser import parse_expression
+from denot.vectorized import evaluate_batch, evaluate_batch_chunked
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10**6)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--loop-rows", type=int, default=10**4, help="rows timed in the Python loop (extrapolated)")
+    parser.add_argument("--chunk-size", type=int, default=1 << 16)
+    args = parser.parse_args(argv)
+
+    tree = parse_expression(random_expression(args.tokens, seed=args.tokens))
+    rng = np.random.default_rng(0)
+    columns = {name: rng.integers(-5, 6, size=args.rows) for name in ("x", "y", "z")}
+
+    loop_rows = min(args.loop_rows, args.rows)
+    start = time.perf_counter()
+    expected = [evaluate_tree(tree, {name: int(values[i]) for name, values in columns.items()}) for i in range(loop_rows)]
+    loop_s = (time.perf_counter() - start) * args.rows / loop_rows
+
+    start = time.perf_counter()
+    batch = evaluate_batch(tree, columns)
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    chunked = evaluate_batch_chunked(tree, columns, chunk_size=args.chunk_size)
+    chunked_s = time.perf_counter() - start
+
+    np.testing.assert_allclose(batch[:loop_rows].astype(float), np.array(expected, dtype=float))
+    np.testing.assert_array_equal(batch, chunked)
+
+    print(f"{args.rows} environments, {args.tokens}-token expression")
+    print(f"{'python loop (extrapolated)':>28}: {loop_s:9.3f} s")
+    print(f"{'evaluate_batch':>28}: {batch_s:9.3f} s ({loop_s / batch_s:.0f}x)")
+    print(f"{'evaluate_batch_chunked':>28}: {chunked_s:9.3f} s ({loop_s / chunked_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
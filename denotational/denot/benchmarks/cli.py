@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Throughput of the batch-evaluation CLI (denot.cli.run) against the number of
+worker processes, over a generated file of random expressions.
+"""
+
+import argparse
+import io
+import os
+import random
+import tempfile
+import time
+
+from denot.benchmarks.corpus import random_expression
+from denot.cli import run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--tokens", type=int, default=30, help="tokens per expression")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="default: 1, 2, 4, ... up to the core count")
+    args = parser.parse_args(argv)
+
+    workers = args.workers
+    if workers is None:
+        cores = os.cpu_count() or 1
+        workers = [1]
+        while workers[-1] * 2 <= cores:
+            workers.append(workers[-1] * 2)
+        if workers[-1] != cores:
+            workers.append(cores)
+
+    rng = random.Random(0)
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    with os.fdopen(fd, "w") as f:
+        for index in range(args.lines):
+            # Every 100th line is malformed, to exercise per-line errors.
+            f.write(random_expression(rng.randint(1, args.tokens), seed=index) + (" +" if index % 100 == 0 else "") + "\n")
+
+    print(f"{'workers':>8} {'lines/s':>10} {'speedup':>9}")
+    baseline = expected = None
+    for count in workers:
+        out = io.StringIO()
+        start = time.perf_counter()
+        with open(path) as stream:
+            lines = run(stream, out, {"x": 2, "y": 3, "z": 5}, workers=count, chunk_size=args.chunk_size)
+        throughput = lines / (time.perf_counter() - start)
+        if expected is None:
+            baseline, expected = throughput, out.getvalue()
+        assert out.getvalue() == expected, "output differs between worker counts"
+        print(f"{count:>8} {throughput:>10.0f} {throughput / baseline:>8.2f}x")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
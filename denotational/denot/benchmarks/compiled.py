@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Per-evaluation cost of compile_tree() against the interpretive evaluate_tree
+walker when one expression is evaluated over many variable bindings.
+"""
+
+import argparse
+import random
+import time
+
+from denot.benchmarks.corpus import random_expression
+from denot.compiler import compile_tree
+from denot.evaluator import evaluate_tree
+from denot.parser import parse_expression
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bindings", type=int, default=2000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    bindings = [{"x": rng.randint(-5, 5), "y": rng.randint(-5, 5), "z": rng.randint(-5, 5)} for _ in range(args.bindings)]
+
+    print(f"{'tokens':>8} {'compile (ms)':>13} {'walker (us)':>12} {'compiled (us)':>14} {'speedup':>9}")
+    for size in args.sizes:
+        tree = parse_expression(random_expression(size, seed=size))
+
+        start = time.perf_counter()
+        compiled = compile_tree(tree)
+        compile_ms = (time.perf_counter() - start) * 1e3
+
+        start = time.perf_counter()
+        expected = [evaluate_tree(tree, env) for env in bindings]
+        walker_us = (time.perf_counter() - start) / len(bindings) * 1e6
+
+        start = time.perf_counter()
+        actual = [compiled(env) for env in bindings]
+        compiled_us = (time.perf_counter() - start) / len(bindings) * 1e6
+
+        assert repr(actual) == repr(expected), "compiled function disagrees with evaluate_tree"
+        print(f"{size:>8} {compile_ms:>13.2f} {walker_us:>12.2f} {compiled_us:>14.2f} {walker_us / compiled_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Deterministic generators for benchmark expressions and grammars.
+"""
+
+import random
+
+OPERATORS = "+-*/"
+VARIABLES = ("x", "y", "z")
+
+
+def random_expression(n_tokens, seed=0, variables=VARIABLES, max_depth=8, variable_rate=0.3):
+    """Build a random expression of roughly ``n_tokens`` tokens with nested parentheses."""
+    rng = random.Random(seed)
+    parts = []
+    depth = 0
+    open_operands = []
+    count = 0
+    while count < n_tokens:
+        if parts:
+            parts.append(rng.choice(OPERATORS))
+            count += 1
+        if depth < max_depth and rng.random() < 0.15:
+            parts.append("(")
+            depth += 1
+            open_operands.append(0)
+            count += 1
+        if variables and rng.random() < variable_rate:
+            parts.append(rng.choice(variables))
+        else:
+            parts.append(str(rng.randint(1, 9)))
+        count += 1
+        if open_operands:
+            open_operands[-1] += 1
+            if open_operands[-1] >= 2 and rng.random() < 0.3:
+                parts.append(")")
+                depth -= 1
+                open_operands.pop()
+                count += 1
+    parts.extend(")" * depth)
+    return " ".join(parts)
+
+
+def chain_expression(n_operators, op="-", operand="1"):
+    """Build a left-deep chain such as ``1 - 1 - 1 ...``."""
+    return f" {op} ".join([operand] * (n_operators + 1))
+
+
+def nested_expression(depth, operand="1"):
+    """Build ``(((1 + 1) + 1) + 1)`` style nesting ``depth`` parentheses deep."""
+    return "(" * depth + operand + "".join(f" + {operand})" for _ in range(depth))
+
+
+def shared_expressions(count, pool_size=20, terms=8, seed=0):
+    """Build ``count`` expressions assembled from a small pool of common subexpressions."""
+    rng = random.Random(seed)
+    pool = [f"({random_expression(rng.randint(5, 25), seed=rng.random())})" for _ in range(pool_size)]
+    expressions = []
+    for _ in range(count):
+        parts = [rng.choice(pool) for _ in range(terms)]
+        expressions.append(" + ".join(parts))
+    return expressions
+
+
+def random_grammar(n_nonterminals, n_terminals, n_productions, seed=0, max_length=6, epsilon_rate=0.05):
+    """Random CFGVisualizer-style grammar dict; every nonterminal gets at least one production."""
+    rng = random.Random(seed)
+    nonterminals = [f"N{i}" for i in range(n_nonterminals)]
+    terminals = [f"t{i}" for i in range(n_terminals)]
+    rules = {name: [] for name in nonterminals}
+    for index in range(n_productions):
+        lhs = nonterminals[index] if index < n_nonterminals else rng.choice(nonterminals)
+        if rng.random() < epsilon_rate:
+            rules[lhs].append("")
+            continue
+        length = rng.randint(1, max_length)
+        rules[lhs].append(" ".join(rng.choice(nonterminals if rng.random() < 0.4 else terminals) for _ in range(length)))
+    return rules
+
+
+def layered_grammar(levels, operators_per_level=2):
+    """Unambiguous expression grammar with ``levels`` left-associative precedence levels (LALR(1), no conflicts)."""
+    rules = {}
+    for level in range(levels):
+        operators = [f"op{level}_{index}" for index in range(operators_per_level)]
+        rules[f"E{level}"] = [f"E{level} {op} E{level + 1}" for op in operators] + [f"E{level + 1}"]
+    rules[f"E{levels}"] = ["( E0 )", "id", "num"]
+    return rules
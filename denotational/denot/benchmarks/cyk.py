@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+CYK recognition: the packed-bitset NumPy chart against the textbook chart
+of Python sets (for every span, split point and pair of nonterminals in the
+two cells, look the pair up among the binary rules), both on the same
+Chomsky normal form, on sentences of the CFGVisualizer grammars of 50 to
+2000 tokens (and on each sentence with an extra ")" appended, which no
+grammar accepts). The set-based chart is only run up to --naive-limit
+tokens; beyond that its time is extrapolated as n^3 from the largest run.
+"""
+
+import argparse
+import random
+import time
+
+from denot.benchmarks.earley import arithmetic_tokens
+from denot.benchmarks.lalr import GRAMMARS
+from denot.cyk import CYKRecognizer
+from denot.sentences import language
+
+
+def naive_cyk(cnf, tokens):
+    """Textbook CYK over a chart of sets of nonterminal ids."""
+    n = len(tokens)
+    if n == 0:
+        return cnf.accepts_empty
+    heads = {}
+    for head, left, right in cnf.binary:
+        heads.setdefault((left, right), set()).add(head)
+    table = [[set() for _ in range(n + 1)] for _ in range(n + 1)]
+    for i, token in enumerate(tokens):
+        table[i][i + 1].update(cnf.lexical.get(token, ()))
+    for length in range(2, n + 1):
+        for i in range(n - length + 1):
+            j = i + length
+            cell = table[i][j]
+            for k in range(i + 1, j):
+                for left in table[i][k]:
+                    for right in table[k][j]:
+                        cell.update(heads.get((left, right), ()))
+    return 0 in table[0][n]
+
+
+def sentence(name, size, rng):
+    """A sentence of about ``size`` tokens: a random expression, or a uniform sample of derivations."""
+    if name == "Arithmetic Expressions":
+        return arithmetic_tokens(size, seed=size)
+    words = language(GRAMMARS[name])
+    while not words.derivations(size):
+        size += 1
+    return words.sample(size, rng)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 500, 1000, 2000], help="sentence lengths in tokens")
+    parser.add_argument("--naive-limit", type=int, default=600, help="longest input given to the set-based CYK")
+    args = parser.parse_args(argv)
+    rng = random.Random(0)
+
+    print(f"{'grammar':<24} {'CNF rules':>9} {'tokens':>7} {'bitset (ms)':>12} {'sets (ms)':>12} {'speedup':>8}")
+    for name in ("Arithmetic Expressions", "Balanced Parentheses", "If-Then-Else"):
+        recognizer = CYKRecognizer(GRAMMARS[name])
+        cnf = recognizer.cnf
+        n_rules = len(cnf.binary) + sum(len(heads) for heads in cnf.lexical.values())
+        measured = None
+        for size in args.sizes:
+            tokens = sentence(name, size, rng)
+            start = time.perf_counter()
+            accepted = recognizer.recognize(tokens)
+            rejected = recognizer.recognize(tokens + [")"])
+            bitset_s = time.perf_counter() - start
+            assert accepted and not rejected
+            if len(tokens) <= args.naive_limit:
+                start = time.perf_counter()
+                assert naive_cyk(cnf, tokens) and not naive_cyk(cnf, tokens + [")"])
+                sets_s = time.perf_counter() - start
+                measured = (len(tokens), sets_s)
+                sets = f"{sets_s * 1e3:.1f}"
+            elif measured:
+                sets_s = measured[1] * (len(tokens) / measured[0]) ** 3
+                sets = f"~{sets_s * 1e3:.0f}"
+            else:
+                sets_s, sets = None, "-"
+            speedup = f"{sets_s / bitset_s:.0f}x" if sets_s else "-"
+            print(f"{name:<24} {n_rules:>9} {len(tokens):>7} {bitset_s * 1e3:>12.1f} {sets:>12} {speedup:>8}")
+
+
+if __name__ == "__main__":
+    main()
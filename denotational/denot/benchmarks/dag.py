@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Memory and evaluation cost of hash-consed node DAGs against nested dict ASTs
+for a batch of expressions sharing common subexpressions.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from denot.benchmarks.corpus import shared_expressions
+from denot.evaluator import evaluate_tree
+from denot.nodes import NodeStore, evaluate_all
+from denot.optimize import count_nodes
+from denot.parser import parse_expression
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--expressions", type=int, default=2000)
+    parser.add_argument("--environments", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    sources = shared_expressions(args.expressions)
+
+    tracemalloc.start()
+    trees = [parse_expression(source) for source in sources]
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    store = NodeStore()
+    roots = [store.from_dict(tree) for tree in trees]
+    dag_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    environments = [{"x": i, "y": i - 3, "z": 2 * i} for i in range(args.environments)]
+
+    start = time.perf_counter()
+    expected = [[evaluate_tree(tree, env) for tree in trees] for env in environments]
+    tree_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = [evaluate_all(roots, env) for env in environments]
+    dag_s = time.perf_counter() - start
+
+    assert repr(actual) == repr(expected), "DAG evaluation disagrees with evaluate_tree"
+    print(f"{args.expressions} expressions, {sum(map(count_nodes, trees))} dict nodes, {len(store)} interned nodes")
+    print(f"memory: dict ASTs {dict_bytes / 1e6:.2f} MB, node store {dag_bytes / 1e6:.2f} MB")
+    print(f"evaluate {args.environments} environments: evaluate_tree {tree_s:.3f} s, memoized DAG {dag_s:.3f} s ({tree_s / dag_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Parse and evaluate very deep expressions with the iterative parser and
+evaluator: left-deep operator chains and deeply nested parentheses.
+"""
+
+import argparse
+import sys
+import time
+
+from denot.benchmarks.corpus import chain_expression, nested_expression
+from denot.evaluator import evaluate_tree
+from denot.parser import parse_expression
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-depth", type=int, default=10**6)
+    args = parser.parse_args(argv)
+
+    print(f"recursion limit: {sys.getrecursionlimit()}")
+    print(f"{'shape':>8} {'depth':>10} {'parse (s)':>12} {'eval (s)':>12} {'result':>10}")
+    depth = 10**3
+    while depth <= args.max_depth:
+        for shape, expr in (("chain", chain_expression(depth)), ("nested", nested_expression(depth))):
+            start = time.perf_counter()
+            tree = parse_expression(expr, iterative=True)
+            parsed = time.perf_counter()
+            result = evaluate_tree(tree, iterative=True)
+            done = time.perf_counter()
+            print(f"{shape:>8} {depth:>10} {parsed - start:>12.4f} {done - parsed:>12.4f} {result:>10}")
+        depth *= 10
+
+
+if __name__ == "__main__":
+    main()
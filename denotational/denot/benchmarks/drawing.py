@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Syntax-tree drawing: the original visualize_tree (one Circle patch, one
+text and two plot calls per node, halving the width at every level) against
+draw_tree (Reingold–Tilford layout, one EllipseCollection and one
+LineCollection) on random expressions, including saving a PNG. Also counts
+the pairs of overlapping nodes in each layout. The original runs only up to
+--legacy-limit nodes; it is recursive, so deeper trees would also hit the
+recursion limit.
+"""
+
+import argparse
+import collections
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from denot.benchmarks import legacy
+from denot.benchmarks.corpus import random_expression
+from denot.drawing import RADIUS, draw_tree, tidy_layout
+from denot.parser import parse_expression
+
+
+def legacy_positions(tree):
+    """(x, depth) of every node as placed by the original visualize_tree."""
+    positions = []
+    stack = [(tree, 0.0, 0, 1.0)]
+    while stack:
+        node, x, depth, width = stack.pop()
+        positions.append((x, depth))
+        if node["type"] == "BinaryOp":
+            stack.append((node["right"], x + width / 2, depth + 1, width / 2))
+            stack.append((node["left"], x - width / 2, depth + 1, width / 2))
+    return positions
+
+
+def overlaps(positions, diameter):
+    """Pairs of nodes on the same level whose circles of ``diameter`` intersect."""
+    levels = collections.defaultdict(list)
+    for x, depth in positions:
+        levels[depth].append(x)
+    count = 0
+    for xs in levels.values():
+        xs.sort()
+        start = 0
+        for end, x in enumerate(xs):
+            while x - xs[start] >= diameter:
+                start += 1
+            count += end - start
+    return count
+
+
+def render(draw):
+    fig, ax = plt.subplots(figsize=(12, 8))
+    start = time.perf_counter()
+    draw(ax)
+    ax.axis("off")
+    fig.savefig(io.BytesIO(), format="png")
+    elapsed = time.perf_counter() - start
+    plt.close(fig)
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000], help="expression lengths in tokens")
+    parser.add_argument("--legacy-limit", type=int, default=2000, help="largest tree (in nodes) given to the original renderer")
+    args = parser.parse_args(argv)
+
+    print(f"{'nodes':>7} {'depth':>6} {'layout (ms)':>12} {'draw_tree (s)':>14} {'original (s)':>13} {'overlaps (tidy / original)':>27}")
+    for size in args.sizes:
+        tree = parse_expression(random_expression(size, seed=size), iterative=True)
+        start = time.perf_counter()
+        layout = tidy_layout(tree)
+        layout_ms = (time.perf_counter() - start) * 1e3
+        n = len(layout.x)
+        tidy_s = render(lambda ax: draw_tree(layout, ax))
+        tidy_overlaps = overlaps(zip(layout.x, layout.y), 2 * RADIUS)
+        old = legacy_positions(tree)
+        old_overlaps = overlaps(old, 0.3)
+        if n <= args.legacy_limit:
+            legacy_s = f"{render(lambda ax: legacy.visualize_tree(tree, ax)):.2f}"
+        else:
+            legacy_s = "-"
+        print(f"{n:>7} {int(-layout.y.min()):>6} {layout_ms:>12.1f} {tidy_s:>14.2f} {legacy_s:>13} {tidy_overlaps:>13} / {old_overlaps:<11}")
+        assert tidy_overlaps == 0
+
+
+if __name__ == "__main__":
+    main()
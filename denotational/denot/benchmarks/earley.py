@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Earley parsing into shared packed parse forests on the CFGVisualizer
+grammars: time per token over growing inputs for the unambiguous
+left-recursive (Arithmetic Expressions) and right-recursive (Simple
+Language, with and without Leo's optimization) grammars, then forest size
+against tree count on the ambiguous If-Then-Else grammar.
+"""
+
+import argparse
+import time
+
+from denot.benchmarks.corpus import random_expression
+from denot.earley import parse_forest
+
+ARITHMETIC = {
+    "E": ["E + T", "E - T", "T"],
+    "T": ["T * F", "T / F", "F"],
+    "F": ["( E )", "id", "num"],
+}
+SIMPLE = {
+    "S": ["A B", "C"],
+    "A": ["a A", "a"],
+    "B": ["b B", "b"],
+    "C": ["c C", "c"],
+}
+IF_THEN_ELSE = {
+    "S": ["if E then S", "if E then S else S", "id = E", "print E"],
+    "E": ["E + E", "E * E", "id", "num", "E < E", "E = E"],
+}
+
+
+def arithmetic_tokens(n_tokens, seed=0):
+    """A random expression over the Arithmetic Expressions terminals."""
+    return ["num" if text.isdigit() else "id" if text.isalpha() else text for text in random_expression(n_tokens, seed).split()]
+
+
+def timed(rules, tokens, leo=True):
+    start = time.perf_counter()
+    forest = parse_forest(rules, tokens, leo=leo)
+    return forest, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 4000, 8000, 16000], help="input lengths in tokens")
+    parser.add_argument("--no-leo-limit", type=int, default=2000, help="largest input to parse without Leo (quadratic)")
+    parser.add_argument("--operands", type=int, nargs="+", default=[10, 20, 40, 80], help="operands in the ambiguous 'id = id + ... + id'")
+    args = parser.parse_args(argv)
+
+    print("Unambiguous grammars (microseconds per token):")
+    print(f"{'tokens':>8} {'arithmetic':>11} {'right rec.':>11} {'no Leo':>9}")
+    for size in args.sizes:
+        tokens = arithmetic_tokens(size, seed=size)
+        forest, arithmetic_s = timed(ARITHMETIC, tokens)
+        assert forest.count_trees() == 1
+        tokens = ["a"] * (size // 2) + ["b"] * (size - size // 2)
+        forest, leo_s = timed(SIMPLE, tokens)
+        assert forest.count_trees() == 1
+        no_leo = "-"
+        if size <= args.no_leo_limit:
+            forest, plain_s = timed(SIMPLE, tokens, leo=False)
+            assert forest.count_trees() == 1
+            no_leo = f"{plain_s / size * 1e6:.1f}"
+        print(f"{size:>8} {arithmetic_s / len(tokens) * 1e6:>11.1f} {leo_s / size * 1e6:>11.1f} {no_leo:>9}")
+
+    print()
+    print("Ambiguous 'id = id + id + ... + id' (If-Then-Else):")
+    print(f"{'operands':>8} {'parse (ms)':>11} {'nodes':>8} {'trees':>24}")
+    previous = 1
+    for operands in args.operands:
+        tokens = ["id", "="] + " + ".join(["id"] * operands).split()
+        forest, parse_s = timed(IF_THEN_ELSE, tokens)
+        trees = forest.count_trees()
+        # The bracketings of k operands are counted by the Catalan number C(k - 1).
+        catalan = 1
+        for k in range(1, operands):
+            catalan = catalan * 2 * (2 * k - 1) // (k + 1)
+        assert trees == catalan and trees >= previous
+        previous = trees
+        print(f"{operands:>8} {parse_s * 1e3:>11.1f} {forest.node_count():>8} {trees:>24.3e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Assignment semantics over a large environment: the notebook's dict copy
+({**env, var: value}) against the persistent Environment, keeping every
+intermediate environment alive as a program trace would.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from denot.semantics import semantic_function
+
+
+def dict_assignment(var, value):
+    return lambda env: {**env, var: value}
+
+
+def run(assignments, env):
+    """Apply assignments in order, keeping every version; returns (seconds, versions)."""
+    versions = [env]
+    start = time.perf_counter()
+    for assign in assignments:
+        env = assign(env)
+        versions.append(env)
+    return time.perf_counter() - start, versions
+
+
+def measure(assignments, env):
+    """Time a clean run, then repeat it under tracemalloc for the retained bytes."""
+    seconds, versions = run(assignments, env)
+    del versions
+    tracemalloc.start()
+    _, versions = run(assignments, env)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return seconds, retained, versions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variables", type=int, default=10**4)
+    parser.add_argument("--assignments", type=int, default=10**5)
+    parser.add_argument("--dict-assignments", type=int, default=2000, help="the dict copy is quadratic; time it on a prefix")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    names = [f"v{i}" for i in range(args.variables)]
+    initial = {name: 0 for name in names}
+    program = [(rng.choice(names), rng.randint(-100, 100)) for _ in range(args.assignments)]
+    prefix = program[: args.dict_assignments]
+
+    dict_seconds, dict_bytes, dict_versions = measure([dict_assignment(var, value) for var, value in prefix], initial)
+    env_seconds, env_bytes, env_versions = measure([semantic_function("assignment", (var, value)) for var, value in program], initial)
+
+    # Spot-check a few versions on the shared prefix.
+    for index in range(0, len(prefix) + 1, max(1, len(prefix) // 10)):
+        assert env_versions[index] == dict_versions[index], "persistent environment disagrees with dict copy"
+
+    print(f"{args.variables} variables, {args.assignments} assignments (dict copy timed on the first {len(prefix)})")
+    print(f"{'environment':>12} {'us/assign':>10} {'bytes/version':>14} {'total (s)':>10}")
+    dict_us = dict_seconds / len(prefix) * 1e6
+    env_us = env_seconds / len(program) * 1e6
+    print(f"{'dict copy':>12} {dict_us:>10.2f} {dict_bytes / len(prefix):>14.0f} {dict_us * len(program) / 1e6:>9.1f}*")
+    print(f"{'persistent':>12} {env_us:>10.2f} {env_bytes / len(program):>14.0f} {env_seconds:>10.2f}")
+    print("* extrapolated to the full program")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Kleene fixed-point engine: while-loops and recursive definitions run to
+10^6 iterations/unfoldings, a walk up the approximation chain, and the cost
+of detecting divergence under a step budget.
+"""
+
+import argparse
+import time
+
+from denot.fixpoint import Divergence, approximations, least_fixed_point
+from denot.semantics import semantic_function
+
+
+def count_down(n):
+    if n == 0:
+        return 0
+    return 1 + (yield n - 1)
+
+
+def fibonacci(n):
+    if n < 2:
+        return n
+    return ((yield n - 1) + (yield n - 2)) % 1000003
+
+
+def forever(n):
+    return (yield n + 1)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10**6)
+    parser.add_argument("--chain", type=int, default=2000, help="length of the approximation chain to walk")
+    args = parser.parse_args(argv)
+    n = args.iterations
+
+    print(f"{'workload':<34} {'steps':>9} {'seconds':>8} {'steps/s':>10}")
+
+    def report(name, steps, seconds):
+        print(f"{name:<34} {steps:>9} {seconds:>8.3f} {steps / seconds:>10.0f}")
+
+    # while i < n do (s := s + i; i := i + 1) over a persistent environment.
+    loop = semantic_function("while", (lambda env: env["i"] < n, lambda env: env.set("s", env["s"] + env["i"]).set("i", env["i"] + 1)))
+    env, seconds = timed(loop, {"i": 0, "s": 0})
+    assert env["s"] == n * (n - 1) // 2
+    report("while loop (Environment)", n, seconds)
+
+    for name, body in (("count_down (linear recursion)", count_down), ("fibonacci (memoized recursion)", fibonacci)):
+        function = least_fixed_point(body)
+        _, seconds = timed(function, n)
+        report(name, function.steps, seconds)
+
+    # F^k(⊥)(k - 1) for k = 1..chain: each iterate reuses the previous one's memo.
+    start = time.perf_counter()
+    chain = approximations(count_down)
+    next(chain)
+    for level in range(1, args.chain + 1):
+        assert next(chain)(level - 1) == level - 1
+    report(f"approximation chain F^1..F^{args.chain}", args.chain, time.perf_counter() - start)
+
+    function = least_fixed_point(forever, budget=n)
+    start = time.perf_counter()
+    try:
+        function(0)
+    except Divergence as divergence:
+        report("divergence (budget exhausted)", divergence.steps, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
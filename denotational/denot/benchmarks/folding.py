@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Node-count reduction and evaluation speedup from constant folding and
+partial evaluation on a corpus of mostly-constant expressions.
+"""
+
+import argparse
+import time
+
+from denot.benchmarks.corpus import random_expression
+from denot.evaluator import evaluate_tree
+from denot.optimize import count_nodes, fold_constants, specialize
+from denot.parser import parse_expression
+
+
+def time_evaluations(trees, environments):
+    start = time.perf_counter()
+    results = [[evaluate_tree(tree, env) for env in environments] for tree in trees]
+    return time.perf_counter() - start, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--expressions", type=int, default=200)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--variable-rate", type=float, default=0.05)
+    parser.add_argument("--environments", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    trees = [
+        parse_expression(random_expression(args.tokens, seed=i, variables=("x", "y"), variable_rate=args.variable_rate))
+        for i in range(args.expressions)
+    ]
+    environments = [{"x": i % 7 - 3, "y": i % 5 + 1} for i in range(args.environments)]
+
+    start = time.perf_counter()
+    folded = [fold_constants(tree) for tree in trees]
+    fold_s = time.perf_counter() - start
+    # Partial evaluation: x is known ahead of time, y varies.
+    specialized = [specialize(tree, {"x": 2}) for tree in trees]
+    y_environments = [{"y": env["y"]} for env in environments]
+
+    base_s, expected = time_evaluations(trees, environments)
+    folded_s, actual = time_evaluations(folded, environments)
+    assert repr(actual) == repr(expected), "folded trees disagree with the originals"
+    x_bound = [{"x": 2, **env} for env in y_environments]
+    spec_base_s, spec_expected = time_evaluations(trees, x_bound)
+    spec_s, spec_actual = time_evaluations(specialized, y_environments)
+    assert repr(spec_actual) == repr(spec_expected), "specialized trees disagree with the originals"
+
+    nodes = sum(map(count_nodes, trees))
+    folded_nodes = sum(map(count_nodes, folded))
+    specialized_nodes = sum(map(count_nodes, specialized))
+    print(f"{args.expressions} expressions of ~{args.tokens} tokens, variable rate {args.variable_rate}")
+    print(f"fold_constants: {fold_s * 1e3:.1f} ms for the corpus")
+    print(f"{'':>16} {'nodes':>8} {'reduction':>10} {'eval (s)':>10} {'speedup':>8}")
+    print(f"{'original':>16} {nodes:>8} {'':>10} {base_s:>10.3f} {'':>8}")
+    print(f"{'folded':>16} {folded_nodes:>8} {1 - folded_nodes / nodes:>9.1%} {folded_s:>10.3f} {base_s / folded_s:>7.1f}x")
+    print(f"{'specialized x=2':>16} {specialized_nodes:>8} {1 - specialized_nodes / nodes:>9.1%} {spec_s:>10.3f} {spec_base_s / spec_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Grammar analysis (nullable, FIRST, FOLLOW, reachable, productive) on random
+grammars: the bitset/worklist engine against a naive round-robin fixed point
+over Python sets that re-splits every production on every pass.
+"""
+
+import argparse
+import time
+
+from denot.benchmarks.corpus import random_grammar
+from denot.grammar import GrammarAnalysis, analyze, compile_grammar
+
+
+def naive_analysis(rules, start):
+    """Textbook fixed point: repeat passes over all productions until nothing changes."""
+    nullable = set()
+    first = {name: set() for name in rules}
+    follow = {name: set() for name in rules}
+    follow[start].add("$")
+
+    def first_of(symbols):
+        result = set()
+        for symbol in symbols:
+            if symbol not in rules:
+                result.add(symbol)
+                return result, False
+            result |= first[symbol]
+            if symbol not in nullable:
+                return result, False
+        return result, True
+
+    changed = True
+    while changed:
+        changed = False
+        for lhs, productions in rules.items():
+            for production in productions:
+                symbols = production.split()
+                if lhs not in nullable and all(symbol in nullable for symbol in symbols):
+                    nullable.add(lhs)
+                    changed = True
+                bits, _ = first_of(symbols)
+                if not bits <= first[lhs]:
+                    first[lhs] |= bits
+                    changed = True
+    changed = True
+    while changed:
+        changed = False
+        for lhs, productions in rules.items():
+            for production in productions:
+                symbols = production.split()
+                for index, symbol in enumerate(symbols):
+                    if symbol in rules:
+                        bits, rest_nullable = first_of(symbols[index + 1 :])
+                        if rest_nullable:
+                            bits = bits | follow[lhs]
+                        if not bits <= follow[symbol]:
+                            follow[symbol] |= bits
+                            changed = True
+    return nullable, first, follow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 20000], help="number of productions")
+    args = parser.parse_args(argv)
+
+    print(f"{'productions':>11} {'nonterminals':>12} {'naive (s)':>10} {'compile (s)':>12} {'analyze (s)':>12} {'cached (ms)':>12}")
+    for size in args.sizes:
+        rules = random_grammar(max(1, size // 5), max(1, size // 20), size, seed=size)
+        start = time.perf_counter()
+        nullable, first, follow = naive_analysis(rules, next(iter(rules)))
+        naive_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        grammar = compile_grammar(rules)
+        compile_s = time.perf_counter() - start
+        start = time.perf_counter()
+        analysis = GrammarAnalysis(grammar)
+        analyze_s = time.perf_counter() - start
+        analyze(rules)
+        start = time.perf_counter()
+        analyze(rules)
+        cached_ms = (time.perf_counter() - start) * 1e3
+
+        assert set(grammar.nonterminal_names(analysis.nullable)) == nullable
+        assert all(analysis.first_of(name) == first[name] and analysis.follow_of(name) == follow[name] for name in rules)
+        print(f"{size:>11} {len(rules):>12} {naive_s:>10.3f} {compile_s:>12.3f} {analyze_s:>12.3f} {cached_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
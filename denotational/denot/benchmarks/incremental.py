@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Latency of single edits with IncrementalParser against reparsing the whole
+expression, for expressions from 10^2 to 10^5 tokens.
+"""
+
+import argparse
+import time
+
+from denot.benchmarks.corpus import random_expression
+from denot.incremental import IncrementalParser
+from denot.parser import parse_expression, tokenize
+
+
+def median_time(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-tokens", type=int, default=10**5)
+    parser.add_argument("--repeat", type=int, default=21)
+    args = parser.parse_args(argv)
+
+    print(f"{'tokens':>8} {'full (ms)':>10} {'leaf edit (ms)':>15} {'group edit (ms)':>16}")
+    size = 100
+    while size <= args.max_tokens:
+        text = random_expression(size, seed=size)
+        tokens = tokenize(text)
+        middle = len(tokens) // 2
+        number = next(t for t in tokens[middle:] if t.kind == "NUMBER")
+        # The first ')' after the middle closes the innermost group open there.
+        close = next(t for t in tokens[middle:] if t.text == ")")
+        depth = 0
+        for t in reversed(tokens[: tokens.index(close)]):
+            if t.text == ")":
+                depth += 1
+            elif t.text == "(":
+                if depth == 0:
+                    open_paren = t
+                    break
+                depth -= 1
+
+        incremental = IncrementalParser(text)
+        full_ms = median_time(lambda: parse_expression(text), 5) * 1e3
+
+        digits = iter("123456789" * args.repeat)
+
+        def leaf_edit():
+            incremental.edit(number.start, number.end, next(digits))
+
+        leaf_ms = median_time(leaf_edit, args.repeat) * 1e3
+        assert incremental.last_mode == "leaf"
+
+        state = {"inserted": False}
+
+        def group_edit():
+            if state["inserted"]:
+                incremental.edit(open_paren.end, open_paren.end + 4, "")
+            else:
+                incremental.edit(open_paren.end, open_paren.end, "1 + ")
+            state["inserted"] = not state["inserted"]
+
+        group_ms = median_time(group_edit, args.repeat) * 1e3
+        assert incremental.last_mode == "group"
+        if size <= 1000:
+            # Dict comparison recurses, so only check the smaller trees.
+            assert incremental.tree == parse_expression(incremental.text)
+
+        print(f"{size:>8} {full_ms:>10.3f} {leaf_ms:>15.3f} {group_ms:>16.3f}")
+        size *= 10
+
+
+if __name__ == "__main__":
+    main()
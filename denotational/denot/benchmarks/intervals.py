@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Interval bounds of one expression over a grid of (x, y, z) parameter cells:
+one vectorized pass against a Python loop of per-cell analyses, plus a
+sampled check that the bounds contain every sampled value.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from denot.benchmarks.corpus import random_expression
+from denot.intervals import evaluate_intervals
+from denot.parser import parse_expression
+from denot.vectorized import evaluate_batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cells", type=int, default=10**4)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--loop-cells", type=int, default=200, help="cells analyzed one at a time (extrapolated)")
+    parser.add_argument("--samples", type=int, default=16, help="points sampled per cell for the soundness check")
+    args = parser.parse_args(argv)
+
+    tree = parse_expression(random_expression(args.tokens, seed=args.tokens))
+    rng = np.random.default_rng(0)
+    bounds = {}
+    for name in ("x", "y", "z"):
+        lower = rng.uniform(-5, 5, size=args.cells)
+        bounds[name] = (lower, lower + rng.uniform(0, 2, size=args.cells))
+
+    start = time.perf_counter()
+    result = evaluate_intervals(tree, bounds)
+    batch_s = time.perf_counter() - start
+
+    loop_cells = min(args.loop_cells, args.cells)
+    start = time.perf_counter()
+    for i in range(loop_cells):
+        single = evaluate_intervals(tree, {name: (lower[i], upper[i]) for name, (lower, upper) in bounds.items()})
+        assert single.lower == result.lower[i] and single.upper == result.upper[i]
+    loop_s = (time.perf_counter() - start) * args.cells / loop_cells
+
+    start = time.perf_counter()
+    inside = 0
+    for _ in range(args.samples):
+        points = {name: lower + rng.uniform(0, 1, size=args.cells) * (upper - lower) for name, (lower, upper) in bounds.items()}
+        with np.errstate(invalid="ignore"):
+            values = evaluate_batch(tree, points)
+        ok = ((result.lower <= values) & (values <= result.upper)) | (np.isnan(values) & result.maybe_nan)
+        assert ok.all(), "interval bounds exclude a sampled value"
+        inside += ok.sum()
+    sample_s = time.perf_counter() - start
+
+    finite = np.isfinite(result.lower) & np.isfinite(result.upper)
+    print(f"{args.cells} interval cells, {args.tokens}-token expression")
+    print(f"{'per-cell loop (extrapolated)':>30}: {loop_s:9.3f} s")
+    print(f"{'evaluate_intervals':>30}: {batch_s:9.3f} s ({loop_s / batch_s:.0f}x)")
+    print(f"{f'{args.samples} samples/cell (evaluate_batch)':>30}: {sample_s:9.3f} s, {inside} values all inside their bounds")
+    print(f"{'cells with finite bounds':>30}: {finite.mean():9.1%}, {result.maybe_nan.mean():.1%} may be nan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+LALR(1) tables: build time against loading from the disk cache, then the
+table-driven parser building dict ASTs with the Arithmetic Expressions
+grammar against SyntaxTreeBuilder's recursive descent (parse_expression)
+on random expressions.
+"""
+
+import argparse
+import tempfile
+import time
+
+from denot import lalr
+from denot.benchmarks.corpus import layered_grammar, random_expression
+from denot.benchmarks.earley import ARITHMETIC, IF_THEN_ELSE, SIMPLE
+from denot.nodes import NodeStore
+from denot.parser import NAME, NUMBER, number_value, parse_expression, token_kind, token_texts
+
+GRAMMARS = {
+    "Arithmetic Expressions": ARITHMETIC,
+    "Simple Language": SIMPLE,
+    "Balanced Parentheses": {"S": ["( S )", "S S", ""]},
+    "If-Then-Else": IF_THEN_ELSE,
+}
+
+
+def terminal(text):
+    """Arithmetic Expressions terminal of a SyntaxTreeBuilder token."""
+    kind = token_kind(text)
+    return "num" if kind == NUMBER else "id" if kind == NAME else text
+
+
+def ast_reducer(grammar):
+    """Reduction callback building SyntaxTreeBuilder dict ASTs."""
+    actions = []
+    for production in grammar.productions:
+        parts = production.text.split()
+        if len(parts) == 3 and parts[1] in "+-*/":
+            actions.append(lambda children, op=parts[1]: {"type": "BinaryOp", "op": op, "left": children[0], "right": children[2]})
+        elif parts == ["(", "E", ")"]:
+            actions.append(lambda children: children[1])
+        elif parts == ["id"]:
+            actions.append(lambda children: {"type": "Variable", "name": children[0]})
+        elif parts == ["num"]:
+            actions.append(lambda children: {"type": "Number", "value": number_value(children[0])})
+        else:
+            actions.append(lambda children: children[0])
+    return lambda production, children: actions[production](children)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="expression lengths in tokens")
+    parser.add_argument("--levels", type=int, nargs="+", default=[10, 100, 400], help="precedence levels of larger expression grammars")
+    args = parser.parse_args(argv)
+
+    grammars = dict(GRAMMARS)
+    for levels in args.levels:
+        grammars[f"{levels} precedence levels"] = layered_grammar(levels)
+
+    print(f"{'grammar':<28} {'states':>7} {'conflicts':>9} {'build (ms)':>11} {'load (ms)':>10} {'memory (us)':>12}")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, rules in grammars.items():
+            lalr._tables.clear()
+            start = time.perf_counter()
+            built = lalr.parse_table(rules, cache_dir=cache_dir)
+            build_ms = (time.perf_counter() - start) * 1e3
+            # A later run: nothing in memory, tables mapped from the cache file.
+            lalr._tables.clear()
+            start = time.perf_counter()
+            loaded = lalr.parse_table(rules, cache_dir=cache_dir)
+            load_ms = (time.perf_counter() - start) * 1e3
+            start = time.perf_counter()
+            lalr.parse_table(rules, cache_dir=cache_dir)
+            memory_us = (time.perf_counter() - start) * 1e6
+            assert list(built.action) == list(loaded.action) and list(built.goto) == list(loaded.goto)
+            assert loaded.report() == built.report()
+            print(f"{name:<28} {built.n_states:>7} {len(built.conflicts):>9} {build_ms:>11.2f} {load_ms:>10.2f} {memory_us:>12.1f}")
+
+    table = lalr.parse_table(ARITHMETIC, cache_dir=None)
+    reduce = ast_reducer(table.grammar)
+    print()
+    print(f"{'tokens':>8} {'LALR (ms)':>10} {'recursive descent (ms)':>23} {'ratio':>7}")
+    for size in args.sizes:
+        expr = random_expression(size, seed=size)
+        texts = token_texts(expr)
+        start = time.perf_counter()
+        tree = table.parse(texts, reduce, terminal)
+        table_s = time.perf_counter() - start
+        start = time.perf_counter()
+        expected = parse_expression(expr)
+        descent_s = time.perf_counter() - start
+        # Interning both trees in one store compares them without recursion.
+        store = NodeStore()
+        assert store.from_dict(tree) is store.from_dict(expected)
+        print(f"{len(texts):>8} {table_s * 1e3:>10.2f} {descent_s * 1e3:>23.2f} {table_s / descent_s:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
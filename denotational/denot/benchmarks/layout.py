@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+CFG graph layouts: networkx's spring layout (as visualize_cfg used it)
+against the layered layout, its cache hits, and an incremental re-layout
+after adding one production, on random grammars of growing size.
+"""
+
+import argparse
+import math
+import time
+
+import networkx as nx
+
+from denot.benchmarks.corpus import random_grammar
+from denot.grammar import compile_grammar
+from denot.layout import LayoutCache, layered_layout
+
+
+def grammar_graph(rules):
+    """The CFGVisualizer graph of a grammar: nonterminals point at the symbols of their productions."""
+    grammar = compile_grammar(rules)
+    graph = nx.DiGraph()
+    for index, name in enumerate(grammar.nonterminals):
+        graph.add_node(name, node_type="non_terminal")
+        for production in grammar.by_lhs[index]:
+            production = grammar.productions[production]
+            for symbol in production.rhs or ():
+                child = grammar.symbols[symbol]
+                if not grammar.is_nonterminal(symbol):
+                    graph.add_node(child, node_type="terminal")
+                graph.add_edge(name, child, label=production.text)
+    return graph
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500, 1000], help="nonterminals per grammar")
+    args = parser.parse_args(argv)
+
+    print(f"{'symbols':>8} {'edges':>7} {'spring (ms)':>12} {'layered (ms)':>13} {'hit (ms)':>9} {'incremental (ms)':>17} {'moved':>6}")
+    for size in args.sizes:
+        rules = random_grammar(size, max(2, size // 4), size * 3, seed=size, max_length=4, epsilon_rate=0.0)
+        graph = grammar_graph(rules)
+        start_symbol = next(iter(rules))
+        try:
+            _, spring_s = timed(nx.spring_layout, graph, k=3, iterations=50)
+            spring = f"{spring_s * 1e3:.1f}"
+        except ImportError:  # networkx needs scipy for graphs of 500+ nodes
+            spring = "-"
+        cache = LayoutCache()
+        positions, layered_s = timed(cache.layout, graph, [start_symbol])
+        assert layered_layout(graph, [start_symbol]) == positions  # deterministic
+        _, hit_s = timed(cache.layout, graph, [start_symbol])
+        assert cache.hits == 1
+
+        # One nonterminal gains a production; lay out again from the previous positions.
+        grown = dict(rules)
+        target = list(rules)[len(rules) // 2]
+        grown[target] = rules[target] + [f"new_terminal {target}"]
+        grown_graph = grammar_graph(grown)
+        updated, incremental_s = timed(cache.layout, grown_graph, [start_symbol], previous=positions)
+        scale = max(1.0, max(abs(x) for x, _ in positions.values()))
+        moved = sum(1 for node, (x, y) in positions.items() if y != updated[node][1] or abs(x - updated[node][0]) > 0.1 * scale)
+        print(
+            f"{graph.number_of_nodes():>8} {graph.number_of_edges():>7} {spring:>12} {layered_s * 1e3:>13.1f} "
+            f"{hit_s * 1e3:>9.2f} {incremental_s * 1e3:>17.1f} {moved / len(positions):>6.1%}"
+        )
+        assert all(not math.isnan(x) for x, _ in updated.values())
+
+
+if __name__ == "__main__":
+    main()
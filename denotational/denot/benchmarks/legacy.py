@@ -0,0 +1,97 @@
+"""
+The original notebook implementation of SyntaxTreeBuilder, kept verbatim as
+the baseline the benchmarks compare against.
+"""
+
+
+def parse_expression(expr):
+    """Simple recursive descent parser for arithmetic expressions"""
+    expr = expr.replace(" ", "")
+
+    # Handle parentheses
+    if expr.startswith("(") and expr.endswith(")"):
+        return parse_expression(expr[1:-1])
+
+    # Find the rightmost + or - (lowest precedence)
+    paren_count = 0
+    for i in range(len(expr) - 1, -1, -1):
+        if expr[i] == ")":
+            paren_count += 1
+        elif expr[i] == "(":
+            paren_count -= 1
+        elif paren_count == 0 and expr[i] in "+-":
+            return {"type": "BinaryOp", "op": expr[i], "left": parse_expression(expr[:i]), "right": parse_expression(expr[i + 1 :])}
+
+    # Find the rightmost * or / (higher precedence)
+    paren_count = 0
+    for i in range(len(expr) - 1, -1, -1):
+        if expr[i] == ")":
+            paren_count += 1
+        elif expr[i] == "(":
+            paren_count -= 1
+        elif paren_count == 0 and expr[i] in "*/":
+            return {"type": "BinaryOp", "op": expr[i], "left": parse_expression(expr[:i]), "right": parse_expression(expr[i + 1 :])}
+
+    # If it's just a number or variable
+    if expr.isdigit() or (expr[0] == "-" and expr[1:].isdigit()):
+        return {"type": "Number", "value": int(expr)}
+    else:
+        return {"type": "Variable", "name": expr}
+
+
+def evaluate_tree(tree, variables=None):
+    if variables is None:
+        variables = {}
+
+    if tree["type"] == "Number":
+        return tree["value"]
+    elif tree["type"] == "Variable":
+        return variables.get(tree["name"], 0)
+    elif tree["type"] == "BinaryOp":
+        left_val = evaluate_tree(tree["left"], variables)
+        right_val = evaluate_tree(tree["right"], variables)
+
+        if tree["op"] == "+":
+            return left_val + right_val
+        elif tree["op"] == "-":
+            return left_val - right_val
+        elif tree["op"] == "*":
+            return left_val * right_val
+        elif tree["op"] == "/":
+            return left_val / right_val if right_val != 0 else float("inf")
+
+    return 0
+
+
+def visualize_tree(tree, ax, x=0, y=0, width=1, level=0):
+    import matplotlib.pyplot as plt
+
+    # Draw current node
+    if tree["type"] == "BinaryOp":
+        node_text = tree["op"]
+        color = "lightblue"
+    elif tree["type"] == "Number":
+        node_text = str(tree["value"])
+        color = "lightgreen"
+    else:  # Variable
+        node_text = tree["name"]
+        color = "lightcoral"
+
+    # Draw node
+    circle = plt.Circle((x, y), 0.15, color=color, ec="black", linewidth=2)
+    ax.add_patch(circle)
+    ax.text(x, y, node_text, ha="center", va="center", fontsize=12, fontweight="bold")
+
+    # Draw children
+    if tree["type"] == "BinaryOp":
+        left_x = x - width / 2
+        right_x = x + width / 2
+        child_y = y - 0.4
+
+        # Draw edges
+        ax.plot([x, left_x], [y - 0.15, child_y + 0.15], "k-", linewidth=2)
+        ax.plot([x, right_x], [y - 0.15, child_y + 0.15], "k-", linewidth=2)
+
+        # Recursively draw children
+        visualize_tree(tree["left"], ax, left_x, child_y, width / 2, level + 1)
+        visualize_tree(tree["right"], ax, right_x, child_y, width / 2, level + 1)
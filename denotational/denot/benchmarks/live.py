@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Widget redraws: the original callbacks (a new pyplot figure per change, the
+networkx / patch drawing code, tight_layout and a PNG of the whole figure,
+as the inline backend shows it) against one LiveFigure per widget whose
+artists are updated and blitted, cycling through the grammar, expression and
+construct choices of interactive-demos.ipynb. Reports the median and max
+callback latency and how many frames were blitted rather than drawn in full.
+"""
+
+import argparse
+import io
+import itertools
+from collections.abc import Mapping
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import networkx as nx
+
+from denot import drawing, live
+from denot.benchmarks.lalr import GRAMMARS
+from denot.benchmarks.layout import grammar_graph
+from denot.evaluator import evaluate_tree
+from denot.layout import LayoutCache
+from denot.parser import parse_expression
+from denot.semantics import semantic_function
+
+EXPRESSIONS = ["2 + 3 * 4", "(x + y) * z", "1 + 2 + 3 + 4 + 5", "a * (b - c) / d", "((1 + 2) * (3 + 4)) - 5 * 6"]
+CONSTRUCTS = [("assignment", ("x", 5)), ("arithmetic", ("+", 3, 4)), ("conditional", (True, 10, 20))]
+ENV = {"x": 1, "y": 2, "z": 3}
+
+
+def png_of(fig):
+    png = io.BytesIO()
+    fig.savefig(png, format="png")
+    plt.close(fig)
+    return png.getvalue()
+
+
+def old_grammar(graph, pos, name):
+    fig = plt.figure(figsize=(14, 10))
+    non_terminals = [n for n, d in graph.nodes(data=True) if d.get("node_type") == "non_terminal"]
+    terminals = [n for n, d in graph.nodes(data=True) if d.get("node_type") == "terminal"]
+    nx.draw_networkx_nodes(graph, pos, nodelist=non_terminals, node_color="lightblue", node_size=2000, node_shape="s", alpha=0.8)
+    nx.draw_networkx_nodes(graph, pos, nodelist=terminals, node_color="lightcoral", node_size=1500, node_shape="o", alpha=0.8)
+    nx.draw_networkx_edges(graph, pos, edge_color="gray", arrows=True, arrowsize=20, alpha=0.6)
+    nx.draw_networkx_edge_labels(graph, pos, nx.get_edge_attributes(graph, "label"), font_size=8)
+    nx.draw_networkx_labels(graph, pos, font_size=12, font_weight="bold")
+    plt.title(f"Context-Free Grammar: {name}", fontsize=16, fontweight="bold")
+    plt.axis("off")
+    plt.tight_layout()
+    return png_of(fig)
+
+
+def old_tree(expr):
+    tree = parse_expression(expr)
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    drawing.draw_tree(tree, ax1)
+    ax1.set_aspect("equal")
+    ax1.set_title("Syntax Tree Structure", fontsize=14, fontweight="bold")
+    ax1.axis("off")
+    ax2.text(0.5, 0.5, f"Expression: {expr}\n\nResult: {evaluate_tree(tree)}", ha="center", va="center", fontsize=16, bbox=dict(boxstyle="round,pad=1", facecolor="lightblue", alpha=0.7))
+    ax2.axis("off")
+    ax2.set_title("Evaluation Result", fontsize=14, fontweight="bold")
+    plt.tight_layout()
+    return png_of(fig)
+
+
+def old_semantics(construct, params):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
+    ax1.bar(list(ENV), list(ENV.values()), color="lightblue", alpha=0.7)
+    ax1.set_title("Input Environment", fontweight="bold")
+    result = semantic_function(construct, params)(ENV)
+    if isinstance(result, Mapping):
+        ax2.bar(list(result), list(result.values()), color="lightgreen", alpha=0.7)
+        ax2.set_title("Output Environment", fontweight="bold")
+    else:
+        ax2.bar(["Result"], [result], color="lightcoral", alpha=0.7)
+        ax2.set_title("Computed Value", fontweight="bold")
+    plt.suptitle(f"Denotational Semantics: {construct.title()}", fontsize=16, fontweight="bold")
+    plt.tight_layout()
+    return png_of(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--changes", type=int, default=24, help="widget changes per demo")
+    args = parser.parse_args(argv)
+
+    layouts = LayoutCache()
+    graphs = {}
+    for name, rules in GRAMMARS.items():
+        graph = grammar_graph(rules)
+        graphs[name] = graph, layouts.layout(graph, [next(iter(rules))])
+    grammar_names = list(itertools.islice(itertools.cycle(GRAMMARS), args.changes))
+    expressions = list(itertools.islice(itertools.cycle(EXPRESSIONS), args.changes))
+    constructs = list(itertools.islice(itertools.cycle(CONSTRUCTS), args.changes))
+    old, new = live.LatencyLog(), live.LatencyLog()
+
+    grammar_figure = live.LiveFigure(figsize=(14, 10))
+    grammar_view = live.GraphView(grammar_figure, grammar_figure.figure.add_axes([0.02, 0.02, 0.96, 0.9]))
+    tree_figure = live.LiveFigure(figsize=(16, 6))
+    tree_view = live.TreeView(tree_figure, tree_figure.figure.add_subplot(1, 2, 1))
+    ax2 = tree_figure.figure.add_subplot(1, 2, 2)
+    ax2.axis("off")
+    ax2.set_title("Evaluation Result", fontsize=14, fontweight="bold")
+    result_text = ax2.text(0.5, 0.5, "", ha="center", va="center", fontsize=16, bbox=dict(boxstyle="round,pad=1", facecolor="lightblue", alpha=0.7))
+    tree_figure.animate(result_text)
+    semantics_figure = live.LiveFigure(figsize=(14, 6))
+    input_view = live.BarView(semantics_figure, semantics_figure.figure.add_subplot(1, 2, 1))
+    output_view = live.BarView(semantics_figure, semantics_figure.figure.add_subplot(1, 2, 2))
+    semantics_figure.figure.subplots_adjust(top=0.85, bottom=0.15, wspace=0.3)
+    title = semantics_figure.figure.suptitle("", fontsize=16, fontweight="bold")
+    semantics_figure.animate(title)
+
+    for name in grammar_names:
+        graph, pos = graphs[name]
+        with old.measure("on_grammar_change"):
+            old_grammar(graph, pos, name)
+        with new.measure("on_grammar_change"):
+            grammar_view.update(graph, pos, f"Context-Free Grammar: {name}")
+    for expr in expressions:
+        with old.measure("on_expression_submit"):
+            old_tree(expr)
+        with new.measure("on_expression_submit"):
+            tree = parse_expression(expr)
+            tree_view.update(tree, redraw=False)
+            result_text.set_text(f"Expression: {expr}\n\nResult: {evaluate_tree(tree)}")
+            tree_figure.redraw()
+    for construct, params in constructs:
+        with old.measure("on_construct_change"):
+            old_semantics(construct, params)
+        with new.measure("on_construct_change"):
+            result = semantic_function(construct, params)(ENV)
+            input_view.update(list(ENV), list(ENV.values()), "lightblue", "Input Environment", redraw=False)
+            if isinstance(result, Mapping):
+                output_view.update(list(result), list(result.values()), "lightgreen", "Output Environment", redraw=False)
+            else:
+                output_view.update(["Result"], [result], "lightcoral", "Computed Value", redraw=False)
+            title.set_text(f"Denotational Semantics: {construct.title()}")
+            semantics_figure.redraw()
+
+    figures = {"on_grammar_change": grammar_figure, "on_expression_submit": tree_figure, "on_construct_change": semantics_figure}
+    old_rows = {name: row for name, *row in old.report()}
+    print(f"{'callback':<22} {'old median (ms)':>16} {'old max':>8} {'live median (ms)':>17} {'live max':>9} {'full draws':>11} {'blits':>6}")
+    for name, calls, median, worst in new.report():
+        _, old_median, old_worst = old_rows[name]
+        figure = figures[name]
+        print(f"{name:<22} {old_median:>16.1f} {old_worst:>8.1f} {median:>17.1f} {worst:>9.1f} {figure.full_draws:>11} {figure.blits:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Compare the single-pass Pratt parser with the original notebook parser on
+expressions from 10 to 10^6 tokens.
+"""
+
+import argparse
+import sys
+import time
+
+from denot.benchmarks import legacy
+from denot.benchmarks.corpus import chain_expression, random_expression
+from denot.parser import parse_expression
+
+
+def best_time(func, arg, repeat):
+    """Return the best wall-clock time of ``repeat`` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-tokens", type=int, default=10**6)
+    parser.add_argument("--legacy-max-tokens", type=int, default=10**4, help="skip the quadratic parser above this size")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 4 * args.legacy_max_tokens))
+
+    workloads = {
+        "random": lambda size: random_expression(size, seed=size),
+        # No top-level + or -, so the legacy parser rescans the whole string at every level.
+        "product": lambda size: chain_expression(size // 2, op="*", operand="2"),
+    }
+    for shape, build in workloads.items():
+        print(f"\n{shape} expressions")
+        print(f"{'tokens':>10} {'pratt (s)':>12} {'legacy (s)':>12} {'speedup':>10}")
+        size = 10
+        while size <= args.max_tokens:
+            expr = build(size)
+            repeat = args.repeat if size <= 10**5 else 1
+            pratt = best_time(parse_expression, expr, repeat)
+            if size <= args.legacy_max_tokens:
+                old = best_time(legacy.parse_expression, expr, repeat)
+                print(f"{size:>10} {pratt:>12.6f} {old:>12.6f} {old / pratt:>9.1f}x")
+            else:
+                print(f"{size:>10} {pratt:>12.6f} {'skipped':>12} {'-':>10}")
+            size *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Sentence counting, sampling and enumeration on the CFGVisualizer grammars:
+derivation counts for the first lengths (checked against enumerated
+sentence counts, which are equal exactly when no sentence is ambiguous),
+then the time to fill the count tables, draw uniform samples and
+enumerate the first sentences at lengths in the hundreds (sentences of up
+to 201 tokens are parsed back with the Earley parser).
+"""
+
+import argparse
+import random
+import time
+
+from denot.benchmarks.lalr import GRAMMARS
+from denot.earley import parse_forest
+from denot.sentences import Language
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400, 800], help="sentence lengths in tokens")
+    parser.add_argument("--small", type=int, default=8, help="lengths up to which sentences are counted by enumeration")
+    parser.add_argument("--samples", type=int, default=20, help="samples drawn per length")
+    parser.add_argument("--first", type=int, default=100, help="sentences enumerated per length")
+    args = parser.parse_args(argv)
+    rng = random.Random(0)
+
+    for name, rules in GRAMMARS.items():
+        language = Language(rules)
+        print(f"{name}: longest sentence {'unbounded' if language.longest() is None else language.longest()}")
+        print(f"  {'length':>6} {'derivations':>12} {'sentences':>10}")
+        for length in range(args.small + 1):
+            derivations = language.derivations(length)
+            sentences = language.count_sentences(length)
+            assert sentences <= derivations and (sentences == 0) == (derivations == 0)
+            print(f"  {length:>6} {derivations:>12} {sentences:>10}")
+
+    print()
+    print(f"{'grammar':<24} {'length':>6} {'digits':>6} {'count (ms)':>11} {'sample (ms)':>12} {'first sentences (ms)':>21}")
+    for name, rules in GRAMMARS.items():
+        language = Language(rules)
+        for size in args.sizes:
+            start = time.perf_counter()
+            derivations = language.derivations(size)
+            count_ms = (time.perf_counter() - start) * 1e3
+            if derivations == 0:
+                # Balanced Parentheses only has even lengths.
+                size += 1
+                derivations = language.derivations(size)
+            start = time.perf_counter()
+            samples = [language.sample(size, rng) for _ in range(args.samples)]
+            sample_ms = (time.perf_counter() - start) * 1e3 / args.samples
+            start = time.perf_counter()
+            first = []
+            for sentence in language.sentences(size):
+                first.append(sentence)
+                if len(first) == args.first:
+                    break
+            first_ms = (time.perf_counter() - start) * 1e3
+            assert first == sorted(first) and all(len(sentence) == size for sentence in first)
+            if size <= 201:
+                # Earley is cubic on the ambiguous grammars, so only the shorter sentences are parsed back.
+                for sentence in samples[:3] + first[:3]:
+                    parse_forest(rules, sentence)
+            print(f"{name:<24} {size:>6} {len(str(derivations)):>6} {count_ms:>11.2f} {sample_ms:>12.2f} {first_ms:>21.2f}")
+
+
+if __name__ == "__main__":
+    main()
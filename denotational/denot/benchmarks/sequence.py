@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Long straight-line programs: nested two-statement closures (the notebook's
+old ``lambda env: stmt2(stmt1(env))``) against a flat Block, with and
+without fusion of adjacent assignments.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from denot.semantics import Block, semantic_function
+
+
+def nested(statements):
+    program = statements[0]
+    for statement in statements[1:]:
+        program = (lambda first, second: lambda env: second(first(env)))(program, statement)
+    return program
+
+
+def double_x(env):
+    return env.set("x", env.get("x", 0) * 2)
+
+
+def straight_line(length, rng, opaque_rate=0.05):
+    """Constant assignments to 100 variables, with occasional non-assignment statements."""
+    statements = []
+    for _ in range(length):
+        if rng.random() < opaque_rate:
+            statements.append(double_x)
+        else:
+            statements.append(semantic_function("assignment", (f"v{rng.randrange(100)}", rng.randint(-9, 9))))
+    return statements
+
+
+def timed(program, env, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = program(env)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    env = {"x": 1}
+    print(f"{'statements':>10} {'nested (ms)':>12} {'flat (ms)':>10} {'fused (ms)':>11} {'fused steps':>12}")
+    for length in args.lengths:
+        statements = straight_line(length, rng)
+        flat = Block(statements, fuse=False)
+        fused = Block(statements)
+        expected, flat_seconds = timed(flat, env, args.repeat)
+        result, fused_seconds = timed(fused, env, args.repeat)
+        assert result == expected, "fused block disagrees with the unfused one"
+        try:
+            result, nested_seconds = timed(nested(statements), env, args.repeat)
+            assert result == expected, "nested closures disagree with the flat block"
+            nested_ms = f"{nested_seconds * 1e3:.2f}"
+        except RecursionError:
+            nested_ms = f"depth>{sys.getrecursionlimit()}"
+        print(f"{length:>10} {nested_ms:>12} {flat_seconds * 1e3:>10.2f} {fused_seconds * 1e3:>11.2f} {len(fused):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Bytecode compiler and stack VM: compile time, serialized bytes per AST node
+and evaluations per second against evaluate_tree.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from denot.benchmarks.corpus import random_expression
+from denot.bytecode import compile_program, load
+from denot.evaluator import evaluate_tree
+from denot.optimize import count_nodes
+from denot.parser import parse_expression
+
+
+def rate(func, environments):
+    start = time.perf_counter()
+    results = [func(env) for env in environments]
+    return len(environments) / (time.perf_counter() - start), results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--evaluations", type=int, default=20000, help="node evaluations budget per size")
+    args = parser.parse_args(argv)
+
+    # Random expressions are left-deep chains, deeper than the default limit at 10^4 tokens.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 2 * max(args.sizes)))
+    rng = random.Random(0)
+    directory = tempfile.mkdtemp()
+    print(f"{'tokens':>8} {'nodes':>7} {'compile (ms)':>13} {'bytes/node':>11} {'dict eval/s':>12} {'vm eval/s':>10} {'mmap eval/s':>12}")
+    for size in args.sizes:
+        tree = parse_expression(random_expression(size, seed=size))
+        nodes = count_nodes(tree)
+        environments = [{"x": rng.randint(-5, 5), "y": rng.randint(-5, 5), "z": rng.randint(-5, 5)} for _ in range(max(20, args.evaluations * 10 // nodes))]
+
+        start = time.perf_counter()
+        program = compile_program(tree)
+        compile_ms = (time.perf_counter() - start) * 1e3
+
+        path = os.path.join(directory, f"expr{size}.dnbc")
+        program.save(path)
+        mapped = load(path)
+
+        tree_rate, expected = rate(lambda env: evaluate_tree(tree, env), environments)
+        vm_rate, actual = rate(program.evaluate, environments)
+        mmap_rate, mapped_actual = rate(mapped.evaluate, environments)
+        assert repr(actual) == repr(expected) == repr(mapped_actual), "VM disagrees with evaluate_tree"
+
+        bytes_per_node = os.path.getsize(path) / nodes
+        print(f"{size:>8} {nodes:>7} {compile_ms:>13.3f} {bytes_per_node:>11.1f} {tree_rate:>12.0f} {vm_rate:>10.0f} {mmap_rate:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+While-language benchmark suite: factorial, gcd and Fibonacci run through the
+closure-compiled denotation against a walker that re-inspects the AST on
+every step. Reports loop iterations per second and per minute.
+"""
+
+import argparse
+import time
+
+from denot.evaluator import evaluate_tree
+from denot.whilelang import COMPARISONS, denote, parse_program
+
+# Each program counts its loop iterations in 'steps'.
+PROGRAMS = {
+    "factorial": (
+        "k := 0; while k < rounds do ("
+        "  n := 20; f := 1;"
+        "  while n > 0 do (f := f * n; n := n - 1; steps := steps + 1);"
+        "  k := k + 1)"
+    ),
+    "gcd": "while a != b do (if a > b then a := a - b else b := b - a; steps := steps + 1)",
+    "fibonacci": (
+        "a := 0; b := 1;"
+        "while steps < rounds do ("
+        "  t := a + b; a := b; b := t;"
+        "  if b > 1000000 then (a := 0; b := 1) else skip;"
+        "  steps := steps + 1)"
+    ),
+}
+
+
+def inputs(name, size):
+    if name == "factorial":
+        return {"rounds": max(1, size // 20)}
+    if name == "gcd":
+        return {"a": 7 * size + 1, "b": 7}
+    return {"rounds": size}
+
+
+def _boolean(tree, env):
+    node_type = tree["type"]
+    if node_type == "Boolean":
+        return tree["value"]
+    if node_type == "Not":
+        return not _boolean(tree["operand"], env)
+    if node_type == "BoolOp":
+        if tree["op"] == "and":
+            return _boolean(tree["left"], env) and _boolean(tree["right"], env)
+        return _boolean(tree["left"], env) or _boolean(tree["right"], env)
+    return COMPARISONS[tree["op"]](evaluate_tree(tree["left"], env), evaluate_tree(tree["right"], env))
+
+
+def interpret(tree, env):
+    """Reference semantics: walk the statement AST over a dict environment."""
+    node_type = tree["type"]
+    if node_type == "Assign":
+        env[tree["name"]] = evaluate_tree(tree["expr"], env)
+    elif node_type == "Seq":
+        for statement in tree["statements"]:
+            interpret(statement, env)
+    elif node_type == "If":
+        interpret(tree["then"] if _boolean(tree["cond"], env) else tree["else"], env)
+    elif node_type == "While":
+        while _boolean(tree["cond"], env):
+            interpret(tree["body"], env)
+    return env
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=10**6, help="approximate loop iterations per program")
+    parser.add_argument("--walker-iterations", type=int, default=10**5, help="the walker is slow; run it on fewer")
+    args = parser.parse_args(argv)
+
+    print(f"{'program':<10} {'iterations':>10} {'compile (ms)':>13} {'walker it/s':>12} {'closures it/s':>14} {'it/min':>12}")
+    for name, source in PROGRAMS.items():
+        tree = parse_program(source)
+        start = time.perf_counter()
+        denotation = denote(tree)
+        compile_ms = (time.perf_counter() - start) * 1e3
+
+        walker_inputs = inputs(name, args.walker_iterations)
+        start = time.perf_counter()
+        expected = interpret(tree, dict(walker_inputs))
+        walker_rate = expected["steps"] / (time.perf_counter() - start)
+        actual = denotation.run(walker_inputs)
+        assert all(actual[key] == value for key, value in expected.items()), f"{name}: closures disagree with the walker"
+
+        start = time.perf_counter()
+        result = denotation.run(inputs(name, args.iterations))
+        rate = result["steps"] / (time.perf_counter() - start)
+        print(f"{name:<10} {result['steps']:>10} {compile_ms:>13.3f} {walker_rate:>12.0f} {rate:>14.0f} {rate * 60:>12.3g}")
+
+
+if __name__ == "__main__":
+    main()
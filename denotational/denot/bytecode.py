@@ -0,0 +1,233 @@
+"""
+Postfix bytecode and a stack machine for SyntaxTreeBuilder expressions.
+
+``compile_program`` turns a dict AST into a ``Program``:
+
+* ``code``   -- ``array('i')`` of (opcode, operand) pairs;
+* ``ints``   -- ``array('q')`` pool of integer constants;
+* ``floats`` -- ``array('d')`` pool of float constants;
+* ``names``  -- variable name for each variable slot.
+
+Operands index a register file laid out as ints, then floats, then
+variable slots; the registers are filled once per evaluation. The VM keeps
+the top of the stack in a local accumulator, and a binary operator whose
+right operand is a leaf is emitted as one register-operand instruction
+(e.g. ``ADD_R x``) instead of ``LOAD x; ADD``.
+
+Integers and floats live in separate pools so ``2 + 3`` still evaluates to
+the int 5, as in ``evaluate_tree``; integer constants must fit in 64 bits.
+
+``Program.to_bytes`` / ``from_bytes`` serialize a program into a flat,
+8-byte aligned buffer. ``load`` memory-maps a saved program and runs it
+straight from the mapping, without copying the code.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from .evaluator import INF
+
+LOAD = 0  # push the accumulator, load a register into it
+ADD = 1  # accumulator = pop() <op> accumulator
+SUB = 2
+MUL = 3
+DIV = 4
+ADD_R = 5  # accumulator = accumulator <op> register
+SUB_R = 6
+MUL_R = 7
+DIV_R = 8
+ZERO = 9  # unknown operator: pop one operand, accumulator = 0
+
+_BINARY_OPCODES = {"+": ADD, "-": SUB, "*": MUL, "/": DIV}
+_REGISTER_FORM = ADD_R - ADD
+
+MAGIC = b"DNBC"
+VERSION = 1
+# magic, version, max stack depth, then lengths of code, ints, floats and the names blob.
+_HEADER = struct.Struct("<4sIIIIII")
+
+
+def _pad(length):
+    return -length % 8
+
+
+class Program:
+    """Compiled bytecode plus its constant pools and variable slots."""
+
+    def __init__(self, code, ints, floats, names, max_stack):
+        self.code = code
+        self.ints = ints
+        self.floats = floats
+        self.names = names
+        self.max_stack = max_stack
+        self._constants = None
+
+    def __len__(self):
+        return len(self.code)
+
+    def registers(self):
+        """Constant registers (ints then floats), decoded once per Program."""
+        if self._constants is None:
+            self._constants = list(self.ints) + list(self.floats)
+        return self._constants
+
+    def evaluate(self, variables=None):
+        """Run the program; same semantics as ``evaluate_tree(tree, variables)``."""
+        if variables is None:
+            variables = {}
+        registers = self.registers() + [variables.get(name, 0) for name in self.names]
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        acc = None
+        code = iter(self.code)
+        for op, arg in zip(code, code):
+            if op == LOAD:
+                push(acc)
+                acc = registers[arg]
+            elif op == ADD_R:
+                acc = acc + registers[arg]
+            elif op == MUL_R:
+                acc = acc * registers[arg]
+            elif op == SUB_R:
+                acc = acc - registers[arg]
+            elif op == DIV_R:
+                right = registers[arg]
+                acc = acc / right if right != 0 else INF
+            elif op == ADD:
+                acc = pop() + acc
+            elif op == SUB:
+                acc = pop() - acc
+            elif op == MUL:
+                acc = pop() * acc
+            elif op == DIV:
+                left = pop()
+                acc = left / acc if acc != 0 else INF
+            else:
+                pop()
+                acc = 0
+        return acc
+
+    def to_bytes(self):
+        """Serialize to a little-endian, 8-byte aligned buffer."""
+        names = "\0".join(self.names).encode("utf-8")
+        sections = []
+        for values in (self.code, self.ints, self.floats):
+            values = array(values.typecode, values)
+            if sys.byteorder == "big":
+                values.byteswap()
+            sections.append(values.tobytes())
+        sections.append(names)
+        header = _HEADER.pack(MAGIC, VERSION, self.max_stack, len(self.code), len(self.ints), len(self.floats), len(names))
+        parts = [header, bytes(_pad(len(header)))]
+        for section in sections:
+            parts.append(section)
+            parts.append(bytes(_pad(len(section))))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, buffer):
+        """Build a Program over ``buffer`` (bytes, memoryview or mmap) without copying arrays."""
+        view = memoryview(buffer)
+        magic, version, max_stack, n_code, n_ints, n_floats, n_names = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a compiled expression (bad magic or version)")
+        offset = _HEADER.size + _pad(_HEADER.size)
+        arrays = []
+        for typecode, count in (("i", n_code), ("q", n_ints), ("d", n_floats)):
+            size = count * array(typecode).itemsize
+            section = view[offset : offset + size]
+            if sys.byteorder == "big":
+                swapped = array(typecode, section.tobytes())
+                swapped.byteswap()
+                arrays.append(swapped)
+            else:
+                arrays.append(section.cast(typecode))
+            offset += size + _pad(size)
+        names_blob = bytes(view[offset : offset + n_names]).decode("utf-8")
+        names = names_blob.split("\0") if n_names else []
+        return cls(arrays[0], arrays[1], arrays[2], names, max_stack)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def load(path):
+    """Memory-map a saved program and return a Program reading from the mapping."""
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return Program.from_bytes(mapping)
+
+
+def compile_program(tree):
+    """Compile a dict AST to postfix bytecode."""
+    code = array("i")
+    ints = array("q")
+    floats = array("d")
+    int_index = {}
+    float_index = {}
+    slots = {}
+    # Operands are (pool, index) until the pool sizes, and so register numbers, are known.
+    operands = []
+    depth = 0
+    max_stack = 0
+
+    def emit_load(pool, index):
+        code.extend((LOAD, len(operands)))
+        operands.append((pool, index))
+
+    def emit_int(value):
+        if not -(2**63) <= value < 2**63:
+            raise ValueError(f"Integer constant {value} does not fit in 64 bits")
+        if value not in int_index:
+            int_index[value] = len(ints)
+            ints.append(value)
+        emit_load(0, int_index[value])
+
+    work = [tree]
+    while work:
+        node = work.pop()
+        if type(node) is str:
+            opcode = _BINARY_OPCODES.get(node, ZERO)
+            if opcode != ZERO and len(code) >= 2 and code[-2] == LOAD:
+                # The right operand was a leaf: fold it into the operator.
+                code[-2] = opcode + _REGISTER_FORM
+            else:
+                code.extend((opcode, 0))
+            depth -= 1
+            continue
+        node_type = node["type"]
+        if node_type == "BinaryOp":
+            work.append(node["op"])
+            work.append(node["right"])
+            work.append(node["left"])
+            continue
+        if node_type == "Number":
+            value = node["value"]
+            if type(value) is int:
+                emit_int(value)
+            else:
+                key = repr(value)
+                if key not in float_index:
+                    float_index[key] = len(floats)
+                    floats.append(value)
+                emit_load(1, float_index[key])
+        elif node_type == "Variable":
+            name = node["name"]
+            if name not in slots:
+                slots[name] = len(slots)
+            emit_load(2, slots[name])
+        else:
+            emit_int(0)
+        depth += 1
+        max_stack = max(max_stack, depth)
+
+    bases = (0, len(ints), len(ints) + len(floats))
+    for position in range(1, len(code), 2):
+        if code[position - 1] in (LOAD, ADD_R, SUB_R, MUL_R, DIV_R):
+            pool, index = operands[code[position]]
+            code[position] = bases[pool] + index
+    return Program(code, ints, floats, list(slots), max_stack)
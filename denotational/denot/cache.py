@@ -0,0 +1,102 @@
+"""
+Bounded LRU cache for the interactive expression widget.
+
+Entries are keyed on the normalized expression (its token stream joined by
+single spaces), so ``2+3*4`` and ``2 + 3 * 4`` share one entry. Each entry
+holds the parsed AST, the evaluation result and the rendered PNG bytes.
+The cache evicts least-recently-used entries once it holds more than
+``max_entries`` entries or more than ``max_bytes`` of PNG data.
+"""
+
+from collections import OrderedDict, namedtuple
+
+from .parser import token_texts
+
+CacheEntry = namedtuple("CacheEntry", ["tree", "result", "png"])
+
+
+def normalize_expression(expr):
+    """Canonical cache key for an expression: its tokens separated by single spaces."""
+    return " ".join(token_texts(expr))
+
+
+class RenderCache:
+    """LRU cache of parse/evaluate/render results with hit and miss counters."""
+
+    def __init__(self, max_entries=64, max_bytes=32 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, expr):
+        return normalize_expression(expr) in self._entries
+
+    def get(self, expr):
+        """Return the cached entry for ``expr`` (and mark it recently used), or None."""
+        return self._get(normalize_expression(expr))
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, expr, tree, result, png):
+        """Store an entry for ``expr`` and evict old entries to stay within bounds."""
+        return self._put(normalize_expression(expr), tree, result, png)
+
+    def _put(self, key, tree, result, png):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.total_bytes -= len(old.png)
+        entry = CacheEntry(tree, result, png)
+        self._entries[key] = entry
+        self.total_bytes += len(png)
+        self._evict()
+        return entry
+
+    def get_or_create(self, expr, render):
+        """Return the entry for ``expr``, calling ``render(key) -> (tree, result, png)`` on a miss.
+
+        ``render`` receives the normalized expression. Exceptions from it
+        propagate and nothing is cached.
+        """
+        key = normalize_expression(expr)
+        entry = self._get(key)
+        if entry is None:
+            tree, result, png = render(key)
+            entry = self._put(key, tree, result, png)
+        return entry
+
+    def _evict(self):
+        # Always keep the newest entry, even if it alone exceeds max_bytes.
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self.total_bytes -= len(entry.png)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        """Counters and current size, e.g. for printing under the widget."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
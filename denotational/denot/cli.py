@@ -0,0 +1,126 @@
+"""
+Command-line batch evaluation of expressions, one per line.
+
+    python -m denot expressions.txt -o results.txt --var x=3 --var y=0.5
+
+Input is read as a stream and cut into chunks of ``--chunk-size`` lines.
+Chunks are parsed and evaluated in a ``ProcessPoolExecutor``, with at most
+``--workers * 4`` chunks in flight, so memory stays bounded for inputs of
+any length. Results are written in input order, one output line per input
+line: the value's repr, or ``error: <message>`` for a line that fails to
+parse or to evaluate (e.g. an overflowing float operation), so one bad
+line never stops the run. Throughput goes to stderr when the run finishes.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .evaluator import evaluate_tree
+from .parser import ParseError, parse_expression
+
+
+def evaluate_line(line, variables):
+    """Output text for one input line (without the newline)."""
+    try:
+        tree = parse_expression(line, iterative=True)
+        # repr is inside too: it raises ValueError for ints past Python's digit limit.
+        return repr(evaluate_tree(tree, variables, iterative=True))
+    except (ParseError, ArithmeticError, ValueError) as error:
+        return f"error: {error}"
+
+
+def evaluate_chunk(lines, variables):
+    """Evaluate a chunk of lines and return their output as one string."""
+    return "".join(evaluate_line(line, variables) + "\n" for line in lines)
+
+
+def iter_chunks(stream, chunk_size):
+    lines = (line.rstrip("\r\n") for line in stream)
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run(stream, out, variables=None, workers=None, chunk_size=1000):
+    """Evaluate every line of ``stream`` into ``out``; returns the number of lines.
+
+    ``workers=1`` evaluates in this process, without a pool.
+    """
+    if variables is None:
+        variables = {}
+    if workers is None:
+        workers = os.cpu_count() or 1
+    count = 0
+    if workers == 1:
+        for chunk in iter_chunks(stream, chunk_size):
+            out.write(evaluate_chunk(chunk, variables))
+            count += len(chunk)
+        return count
+
+    max_pending = workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in iter_chunks(stream, chunk_size):
+            pending.append((len(chunk), executor.submit(evaluate_chunk, chunk, variables)))
+            # Write from the head as soon as the window is full; later chunks keep the pool busy.
+            while len(pending) >= max_pending or (pending and pending[0][1].done()):
+                size, future = pending.popleft()
+                out.write(future.result())
+                count += size
+        while pending:
+            size, future = pending.popleft()
+            out.write(future.result())
+            count += size
+    return count
+
+
+def parse_binding(text):
+    name, sep, value = text.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    try:
+        number = int(value)
+    except ValueError:
+        try:
+            number = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"{value!r} is not a number") from None
+    return name, number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m denot", description="Parse and evaluate one expression per line.")
+    parser.add_argument("input", nargs="?", default="-", help="input file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    parser.add_argument("--var", type=parse_binding, action="append", default=[], metavar="NAME=VALUE", help="variable binding, may be repeated")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores; 1 runs in-process)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="lines per work unit")
+    parser.add_argument("-q", "--quiet", action="store_true", help="do not report throughput")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or (args.workers is not None and args.workers < 1):
+        parser.error("--workers and --chunk-size must be positive")
+
+    stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    start = time.perf_counter()
+    try:
+        count = run(stream, out, dict(args.var), args.workers, args.chunk_size)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - start
+    if not args.quiet:
+        print(f"{count} lines in {elapsed:.2f}s ({count / elapsed if elapsed else 0:.0f} lines/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Compile a SyntaxTreeBuilder dict AST once into a Python function.
+
+The tree is flattened into straight-line code, one temporary per BinaryOp,
+and run through ``compile()``:
+
+    def compiled(variables=None):
+        if variables is None:
+            variables = {}
+        get = variables.get
+        v0 = get('x', 0)
+        t0 = v0 * 3
+        t1 = 2 + t0
+        return t1
+
+Each variable is looked up once per call and no node types or operator
+names are inspected at evaluation time. Because the generated code is flat,
+trees of any depth compile and run without recursion.
+"""
+
+import math
+
+from .evaluator import INF
+
+_ARITHMETIC = {"+", "-", "*"}
+
+
+def _literal(value):
+    """Return Python source for a constant, or None if it cannot be inlined."""
+    if type(value) is int or (type(value) is float and math.isfinite(value)):
+        return repr(value)
+    return None
+
+
+def generate_source(tree, name="compiled"):
+    """Return the Python source of the function compile_tree() builds, plus its constant pool."""
+    body = []
+    variable_locals = {}
+    constants = []
+    operands = []
+    work = [tree]
+    while work:
+        node = work.pop()
+        if type(node) is str:
+            right = operands.pop()
+            left = operands.pop()
+            temp = f"t{len(body)}"
+            if node in _ARITHMETIC:
+                body.append(f"    {temp} = {left} {node} {right}")
+            elif node == "/":
+                body.append(f"    {temp} = {left} / {right} if {right} != 0 else INF")
+            else:
+                body.append(f"    {temp} = 0")
+            operands.append(temp)
+            continue
+        node_type = node["type"]
+        if node_type == "BinaryOp":
+            work.append(node["op"])
+            work.append(node["right"])
+            work.append(node["left"])
+        elif node_type == "Number":
+            literal = _literal(node["value"])
+            if literal is None:
+                literal = f"CONSTANTS[{len(constants)}]"
+                constants.append(node["value"])
+            operands.append(literal if not literal.startswith("-") else f"({literal})")
+        elif node_type == "Variable":
+            var = node["name"]
+            if var not in variable_locals:
+                variable_locals[var] = f"v{len(variable_locals)}"
+            operands.append(variable_locals[var])
+        else:
+            operands.append("0")
+
+    lines = [f"def {name}(variables=None):", "    if variables is None:", "        variables = {}"]
+    if variable_locals:
+        lines.append("    get = variables.get")
+        lines.extend(f"    {local} = get({var!r}, 0)" for var, local in variable_locals.items())
+    lines.extend(body)
+    lines.append(f"    return {operands.pop()}")
+    return "\n".join(lines) + "\n", constants
+
+
+def compile_tree(tree):
+    """Compile a dict AST into a reusable function ``f(variables=None)``.
+
+    The result has the same semantics as ``evaluate_tree(tree, variables)``;
+    the generated code is available as ``f.source``.
+    """
+    source, constants = generate_source(tree)
+    namespace = {"INF": INF, "CONSTANTS": tuple(constants)}
+    exec(compile(source, "<compiled expression>", "exec"), namespace)
+    function = namespace["compiled"]
+    function.source = source
+    return function
@@ -0,0 +1,194 @@
+"""
+CYK recognition of CFGVisualizer grammars through Chomsky normal form.
+
+``to_cnf`` starts from the grammar's proper form (``grammar.proper_form``:
+no ε-productions or unit productions), gives every terminal inside a longer
+right-hand side a nonterminal of its own (⟨+⟩ -> +) and splits right-hand
+sides longer than two into chains of binary rules through nonterminals named
+after the suffix they derive (E -> E ⟨+·T⟩, ⟨+·T⟩ -> ⟨+⟩ T). Productions
+that end in the same symbols share those nonterminals. ε stays a flag on the
+start symbol, ``accepts_empty``.
+
+``CYKRecognizer`` fills the usual O(n^3) chart, but stores it per
+nonterminal as bitsets over positions, packed into NumPy uint64 arrays:
+
+    ends[A, i]    bit j set iff A derives tokens[i:j]
+    starts[A, j]  bit i set iff A derives tokens[i:j]
+
+A rule A -> B C covers tokens[i:j] exactly when ends[B, i] & starts[C, j] is
+nonzero (the common bits are the split points), so all spans of one length
+are combined for a pair (B, C) by a single AND over a (spans x words) block
+and an ``any``: the innermost two loops, over split points and over the
+nonterminals in each cell, become word operations that test 64 split points
+at a time. Pairs whose B or C has not derived anything yet are skipped.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .grammar import compile_grammar, proper_form
+
+_BITS = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+
+CNF = namedtuple("CNF", ["names", "binary", "lexical", "accepts_empty"])
+CNF.__doc__ = """A grammar in Chomsky normal form.
+
+names: nonterminal names, the original ones first (the start symbol is 0);
+binary: sorted (A, B, C) rules A -> B C; lexical: {terminal: sorted heads A};
+accepts_empty: whether the start symbol derives ε.
+"""
+
+
+def _label(names):
+    return "⟨" + "·".join(names) + "⟩"
+
+
+@lru_cache(maxsize=64)
+def _cnf(grammar):
+    form = proper_form(grammar)
+    n = grammar.n_nonterminals
+    names = list(grammar.nonterminals)
+    taken = set(grammar.symbols)
+    binary = set()
+    lexical = {}
+    fresh = {}  # ("t", terminal) or ("s", suffix) -> nonterminal
+
+    def nonterminal(key, label):
+        if key in fresh:
+            return fresh[key], False
+        while label in taken:
+            label += "'"
+        taken.add(label)
+        fresh[key] = len(names)
+        names.append(label)
+        return fresh[key], True
+
+    def wrap(symbol):
+        """The symbol itself for a nonterminal, else the nonterminal deriving just that terminal."""
+        if symbol < n:
+            return symbol
+        name = grammar.symbols[symbol]
+        head, new = nonterminal(("t", symbol), _label([name]))
+        if new:
+            lexical.setdefault(name, set()).add(head)
+        return head
+
+    for lhs, rhs in form.productions:
+        if len(rhs) == 1:
+            # Unit-free, so a single symbol is a terminal.
+            lexical.setdefault(grammar.symbols[rhs[0]], set()).add(lhs)
+            continue
+        head = lhs
+        while len(rhs) > 2:
+            suffix, new = nonterminal(("s", rhs[1:]), _label(grammar.names(rhs[1:])))
+            binary.add((head, wrap(rhs[0]), suffix))
+            if not new:
+                break
+            head, rhs = suffix, rhs[1:]
+        else:
+            binary.add((head, wrap(rhs[0]), wrap(rhs[1])))
+    return CNF(names, sorted(binary), {name: sorted(heads) for name, heads in lexical.items()}, form.has_empty)
+
+
+def to_cnf(rules, start=None):
+    """Cached Chomsky normal form of a grammar dict or Grammar."""
+    return _cnf(compile_grammar(rules, start))
+
+
+def cnf_rules(cnf):
+    """The CNF as a CFGVisualizer grammar dict, for display or for the other parsers."""
+    rules = {name: [] for name in cnf.names}
+    if cnf.accepts_empty:
+        rules[cnf.names[0]].append("")
+    for head, left, right in cnf.binary:
+        rules[cnf.names[head]].append(f"{cnf.names[left]} {cnf.names[right]}")
+    for terminal, heads in cnf.lexical.items():
+        for head in heads:
+            rules[cnf.names[head]].append(terminal)
+    # The start symbol stays first even without productions.
+    return {name: productions for name, productions in rules.items() if productions or name == cnf.names[0]}
+
+
+class CYKChart:
+    """Packed CYK chart of a token sequence: ends[A, i] and starts[A, j] position bitsets."""
+
+    def __init__(self, cnf, tokens, ends, starts):
+        self.cnf = cnf
+        self.tokens = tokens
+        self.ends = ends
+        self.starts = starts
+
+    def derives(self, symbol, i, j):
+        """Whether nonterminal ``symbol`` (id) derives the non-empty tokens[i:j]."""
+        if i >= j:
+            return False
+        return bool(self.ends[symbol, i, j >> 6] & _BITS[j & 63])
+
+    @property
+    def accepts(self):
+        if not self.tokens:
+            return self.cnf.accepts_empty
+        return self.derives(0, 0, len(self.tokens))
+
+    def cell(self, i, j):
+        """Names of the nonterminals deriving tokens[i:j]."""
+        return [name for symbol, name in enumerate(self.cnf.names) if self.derives(symbol, i, j)]
+
+
+class CYKRecognizer:
+    """Membership test in O(n^3 / 64) word operations for any CFGVisualizer grammar."""
+
+    def __init__(self, rules, start=None):
+        self.cnf = to_cnf(rules, start)
+        pairs = {}
+        for head, left, right in self.cnf.binary:
+            pairs.setdefault((left, right), []).append(head)
+        self.pairs = [(left, right, np.array(heads)) for (left, right), heads in sorted(pairs.items())]
+
+    def chart(self, tokens):
+        """The packed chart of a token list (or whitespace-separated string)."""
+        if isinstance(tokens, str):
+            tokens = tokens.split()
+        n = len(tokens)
+        words = n // 64 + 1
+        shape = (len(self.cnf.names), n + 1, words)
+        ends = np.zeros(shape, dtype=np.uint64)
+        starts = np.zeros(shape, dtype=np.uint64)
+        present = np.zeros(shape[0], dtype=bool)
+        for i, token in enumerate(tokens):
+            heads = self.cnf.lexical.get(token, ())
+            for head in heads:
+                ends[head, i, (i + 1) >> 6] |= _BITS[(i + 1) & 63]
+                starts[head, i + 1, i >> 6] |= _BITS[i & 63]
+                present[head] = True
+        for length in range(2, n + 1):
+            count = n - length + 1
+            for left, right, heads in self.pairs:
+                if not (present[left] and present[right]):
+                    continue
+                # Spans (i, i + length) for every i at once; bit k of the AND is a split point.
+                hit = np.flatnonzero((ends[left, :count] & starts[right, length:]).any(axis=1))
+                if not hit.size:
+                    continue
+                end = hit + length
+                for head in heads:
+                    ends[head, hit, end >> 6] |= _BITS[end & 63]
+                    starts[head, end, hit >> 6] |= _BITS[hit & 63]
+                present[heads] = True
+        return CYKChart(self.cnf, tokens, ends, starts)
+
+    def recognize(self, tokens):
+        """Whether the grammar derives the token list (or whitespace-separated string)."""
+        return self.chart(tokens).accepts
+
+
+@lru_cache(maxsize=64)
+def _recognizer(grammar):
+    return CYKRecognizer(grammar)
+
+
+def recognize(rules, tokens, start=None):
+    """Whether a grammar dict derives ``tokens``, with a cached CYKRecognizer."""
+    return _recognizer(compile_grammar(rules, start)).recognize(tokens)
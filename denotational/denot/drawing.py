@@ -0,0 +1,166 @@
+"""
+Tidy drawings of SyntaxTreeBuilder dict ASTs.
+
+``tidy_layout`` places a tree with the Reingold–Tilford algorithm: nodes on
+one level are at least ``SEPARATION`` apart, a parent is centred over its
+children, and a subtree is drawn the same wherever it occurs. It runs in
+O(n). Nodes are numbered in preorder, so a reversed sweep visits children
+before their parents. At each BinaryOp the right contour of the left subtree
+and the left contour of the right subtree are walked together, one level at
+a time, to find how far apart the two subtrees must be. The walk stops at
+the shorter subtree, and a thread from that subtree's deepest extreme node
+to the next node of the taller one's contour lets later walks continue
+across, so every node is visited by contour walks O(1) times overall.
+Offsets are relative to the parent and are summed in one forward sweep.
+
+``draw_tree`` draws every node with one EllipseCollection and every edge
+with one LineCollection, sets the axes limits from the layout, and only
+adds text labels to trees small enough to read (``label_limit``). A
+10^5-node tree is drawn in a few seconds, where one patch, one text and two
+``plot`` calls per node took minutes.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+SEPARATION = 1.0
+RADIUS = 0.3
+COLORS = {"BinaryOp": "lightblue", "Number": "lightgreen", "Variable": "lightcoral"}
+
+TreeLayout = namedtuple("TreeLayout", ["x", "y", "parent", "labels", "kinds"])
+TreeLayout.__doc__ = "Preorder node arrays: positions (y = -depth), parent index (-1 at the root), label and type."
+
+
+def _label(node):
+    if node["type"] == "BinaryOp":
+        return node["op"]
+    if node["type"] == "Number":
+        return str(node["value"])
+    return node["name"]
+
+
+def tidy_layout(tree, separation=SEPARATION):
+    """Reingold–Tilford positions of a dict AST, as a TreeLayout."""
+    labels, kinds, parents, lefts, rights, depths = [], [], [], [], [], []
+    stack = [(tree, -1, 0, None)]
+    while stack:
+        node, parent, depth, side = stack.pop()
+        index = len(labels)
+        labels.append(_label(node))
+        kinds.append(node["type"])
+        parents.append(parent)
+        lefts.append(-1)
+        rights.append(-1)
+        depths.append(depth)
+        if side is not None:
+            (lefts if side == 0 else rights)[parent] = index
+        if node["type"] == "BinaryOp":
+            stack.append((node["right"], index, depth + 1, 1))
+            stack.append((node["left"], index, depth + 1, 0))
+    n = len(labels)
+    offset = [0.0] * n  # x relative to the parent
+    thread = [-1] * n  # next contour node when a node has no children
+    thread_offset = [0.0] * n
+    # Per subtree: height, and its leftmost / rightmost deepest nodes with their x relative to the root.
+    height = [0] * n
+    leftmost = list(range(n))
+    rightmost = list(range(n))
+    leftmost_x = [0.0] * n
+    rightmost_x = [0.0] * n
+    for v in range(n - 1, -1, -1):
+        a, b = lefts[v], rights[v]
+        if a < 0:
+            continue
+        # Right contour of a against left contour of b; lx, rx are relative to a and b.
+        l, r = a, b
+        lx = rx = 0.0
+        gap = separation
+        while True:
+            gap = max(gap, lx - rx + separation)
+            if lefts[l] >= 0 or rights[l] >= 0:
+                next_l = rights[l] if rights[l] >= 0 else lefts[l]
+                step_l = offset[next_l]
+            else:
+                next_l, step_l = thread[l], thread_offset[l]
+            if lefts[r] >= 0 or rights[r] >= 0:
+                next_r = lefts[r] if lefts[r] >= 0 else rights[r]
+                step_r = offset[next_r]
+            else:
+                next_r, step_r = thread[r], thread_offset[r]
+            if next_l < 0 or next_r < 0:
+                break
+            l, r = next_l, next_r
+            lx += step_l
+            rx += step_r
+        offset[a] = -gap / 2
+        offset[b] = gap / 2
+        height[v] = max(height[a], height[b]) + 1
+        if height[a] < height[b]:
+            # The left contour continues from a's deepest leftmost node into b.
+            source = leftmost[a]
+            thread[source] = next_r
+            thread_offset[source] = (offset[b] + rx + step_r) - (offset[a] + leftmost_x[a])
+            leftmost[v], leftmost_x[v] = leftmost[b], offset[b] + leftmost_x[b]
+            rightmost[v], rightmost_x[v] = rightmost[b], offset[b] + rightmost_x[b]
+        elif height[a] > height[b]:
+            source = rightmost[b]
+            thread[source] = next_l
+            thread_offset[source] = (offset[a] + lx + step_l) - (offset[b] + rightmost_x[b])
+            leftmost[v], leftmost_x[v] = leftmost[a], offset[a] + leftmost_x[a]
+            rightmost[v], rightmost_x[v] = rightmost[a], offset[a] + rightmost_x[a]
+        else:
+            leftmost[v], leftmost_x[v] = leftmost[a], offset[a] + leftmost_x[a]
+            rightmost[v], rightmost_x[v] = rightmost[b], offset[b] + rightmost_x[b]
+    x = [0.0] * n
+    for v in range(1, n):
+        x[v] = x[parents[v]] + offset[v]
+    return TreeLayout(np.array(x), -np.array(depths, dtype=float), np.array(parents), labels, kinds)
+
+
+def edge_segments(layout, radius=RADIUS):
+    """(edges, 2, 2) array of parent-to-child segments between the node circles."""
+    x, y, parent = layout.x, layout.y, layout.parent
+    child = np.flatnonzero(parent >= 0)
+    segments = np.empty((len(child), 2, 2))
+    segments[:, 0, 0] = x[parent[child]]
+    segments[:, 0, 1] = y[parent[child]] - radius
+    segments[:, 1, 0] = x[child]
+    segments[:, 1, 1] = y[child] + radius
+    return segments
+
+
+def node_colors(layout):
+    return [COLORS.get(kind, "white") for kind in layout.kinds]
+
+
+def draw_tree(tree, ax, radius=RADIUS, label_limit=500, fontsize=12):
+    """Draw a dict AST (or its TreeLayout) on ``ax`` with two collections; returns the layout."""
+    from matplotlib.collections import EllipseCollection, LineCollection
+
+    layout = tree if isinstance(tree, TreeLayout) else tidy_layout(tree)
+    x, y = layout.x, layout.y
+    n = len(x)
+    small = n <= label_limit
+    ax.add_collection(LineCollection(edge_segments(layout, radius), colors="black", linewidths=2 if small else 0.5, zorder=1))
+    diameters = np.full(n, 2 * radius)
+    nodes = EllipseCollection(
+        diameters,
+        diameters,
+        np.zeros(n),
+        units="xy",
+        offsets=np.column_stack([x, y]),
+        offset_transform=ax.transData,
+        facecolors=node_colors(layout),
+        edgecolors="black",
+        linewidths=2 if small else 0.5,
+        zorder=2,
+    )
+    ax.add_collection(nodes)
+    if small:
+        for xi, yi, text in zip(x, y, layout.labels):
+            ax.text(xi, yi, text, ha="center", va="center", fontsize=fontsize, fontweight="bold", zorder=3)
+    pad = 2 * radius
+    ax.set_xlim(x.min() - pad, x.max() + pad)
+    ax.set_ylim(y.min() - pad, y.max() + pad)
+    return layout
@@ -0,0 +1,378 @@
+"""
+Earley parsing of CFGVisualizer grammars into shared packed parse forests.
+
+``parse_forest(rules, tokens)`` parses a token sequence (a string is split
+on whitespace) with any context-free grammar, including the left-recursive,
+ambiguous and ε-producing grammars in CFGVisualizer, and returns a
+``ParseForest``. The forest is built during recognition as in Scott's
+"SPPF-style parsing from Earley recognisers" (2008): nodes are labelled
+(symbol, i, j) or, for partial right-hand sides, ((production, dot), i, j);
+each node holds its alternatives ("families") as binarised (left, right)
+pairs, and nodes are shared between all parses that use them, so the forest
+stays O(n^3) even when the number of trees is exponential.
+
+With ``leo=True`` completions along deterministic right-recursive chains
+use Leo's (1991) transitive items: completing D from E_h jumps straight to
+the topmost item of the chain, which makes right-recursive grammars linear
+instead of quadratic. The skipped chain nodes are recorded as a link on the
+topmost node and materialized only if the forest is inspected below it.
+"""
+
+import gc
+import math
+from contextlib import contextmanager
+
+from .grammar import compile_grammar
+from .parser import ParseError
+
+# Inputs at least this long parse with the cyclic garbage collector paused.
+GC_PAUSE_TOKENS = 512
+
+
+@contextmanager
+def _gc_paused():
+    """Pause the cyclic collector and restore its previous state, even on errors.
+
+    Everything the chart allocates stays live, so the collector's full
+    passes over it would only make long inputs quadratic. Shorter inputs
+    never touch the collector.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ForestNode:
+    """SPPF node; ``label`` is a symbol id or a (production, dot) pair."""
+
+    __slots__ = ("label", "start", "end", "families", "_keys")
+
+    def __init__(self, label, start, end):
+        self.label = label
+        self.start = start
+        self.end = end
+        self.families = []
+        self._keys = set()
+
+    def add_family(self, production, pivot, left, right):
+        key = (production, pivot)
+        if key not in self._keys:
+            self._keys.add(key)
+            self.families.append((production, left, right))
+
+    def __repr__(self):
+        return f"ForestNode({self.label!r}, {self.start}, {self.end})"
+
+
+class _LeoLink:
+    # One step of a deterministic completion chain: production A -> τ D with
+    # τ at (origin, pivot) given by ``left``; ``up`` is the next step.
+    __slots__ = ("production", "origin", "left", "pivot", "up")
+
+    def __init__(self, production, origin, left, pivot, up):
+        self.production = production
+        self.origin = origin
+        self.left = left
+        self.pivot = pivot
+        self.up = up
+
+
+class EarleyParser:
+    """Earley recognizer for one Grammar that builds a ParseForest."""
+
+    def __init__(self, grammar, leo=True):
+        self.grammar = grammar
+        self.leo = leo
+        productions = grammar.productions
+        self.rhs = [production.rhs for production in productions]
+        self.lhs = [production.lhs for production in productions]
+
+    def parse(self, tokens):
+        """Parse a token list (or whitespace-separated string); raises ParseError."""
+        if isinstance(tokens, str):
+            tokens = tokens.split()
+        if len(tokens) < GC_PAUSE_TOKENS:
+            return self._parse(tokens)
+        with _gc_paused():
+            return self._parse(tokens)
+
+    def _parse(self, tokens):
+        grammar = self.grammar
+        n_nonterminals = grammar.n_nonterminals
+        rhs, lhs, by_lhs = self.rhs, self.lhs, grammar.by_lhs
+        ids = grammar.ids
+        # Terminal ids of the input; None never matches (unknown words and nonterminal names).
+        symbols = [ids.get(token) for token in tokens]
+        symbols = [symbol if symbol is not None and symbol >= n_nonterminals else None for symbol in symbols]
+        n = len(tokens)
+        nodes = {}
+        waiting = [None] * (n + 1)  # waiting[i][C]: items of E_i with the dot before nonterminal C
+        leo_memo = [None] * (n + 1)
+        leo = self.leo
+
+        def node_for(label, start, end):
+            key = (label, start, end)
+            node = nodes.get(key)
+            if node is None:
+                node = nodes[key] = ForestNode(label, start, end)
+            return node
+
+        def make_node(production, dot, origin, end, left, right):
+            length = len(rhs[production])
+            if dot == 1 and length > 1:
+                return right
+            node = node_for(lhs[production] if dot == length else (production, dot), origin, end)
+            node.add_family(production, right.start, left, right)
+            return node
+
+        def leo_top(h, symbol):
+            """Memoized transitive item for completing ``symbol`` from E_h: (link, production, origin) or None."""
+            path = []
+            while True:
+                memo = leo_memo[h]
+                if symbol in memo:
+                    base = memo[symbol]
+                    break
+                items = waiting[h].get(symbol)
+                if items is None or len(items) != 1 or items[0][1] + 1 != len(rhs[items[0][0]]):
+                    memo[symbol] = base = None
+                    break
+                item = items[0]
+                path.append((h, symbol, item))
+                # Stop below a same-set item, and at the start symbol so that (start, 0, i) stays in the chart.
+                if item[2] == h or (item[2] == 0 and lhs[item[0]] == grammar.start):
+                    base = None
+                    break
+                h, symbol = item[2], lhs[item[0]]
+            for h, symbol, (production, _, origin, left) in reversed(path):
+                if base is None:
+                    base = (_LeoLink(production, origin, left, h, None), production, origin)
+                else:
+                    base = (_LeoLink(production, origin, left, h, base[0]), base[1], base[2])
+                leo_memo[h][symbol] = base
+            return base
+
+        def add(item):
+            """Put an item into E_i, or into the scan queue if it expects the next token."""
+            production, dot, origin, _ = item
+            body = rhs[production]
+            if dot < len(body) and body[dot] >= n_nonterminals:
+                if body[dot] == current:
+                    queue.setdefault(item[:3], item)
+                return
+            key = item[:3]
+            if key not in chart:
+                chart[key] = item
+                work.append(item)
+
+        chart = {}
+        queue = {}
+        work = []
+        current = symbols[0] if n else None
+        for production in by_lhs[grammar.start]:
+            add((production, 0, 0, None))
+        for i in range(n + 1):
+            waiting_i = waiting[i] = {}
+            leo_memo[i] = {}
+            nullable_done = {}  # Scott's H: nonterminals completed as ε at i -> their node
+            predicted = set()
+            while work:
+                item = work.pop()
+                production, dot, origin, node = item
+                body = rhs[production]
+                if dot < len(body):
+                    symbol = body[dot]
+                    waiting_i.setdefault(symbol, []).append(item)
+                    if symbol not in predicted:
+                        predicted.add(symbol)
+                        for child in by_lhs[symbol]:
+                            add((child, 0, i, None))
+                    done = nullable_done.get(symbol)
+                    if done is not None:
+                        add((production, dot + 1, origin, make_node(production, dot + 1, origin, i, node, done)))
+                    continue
+                # A completed item D -> α. started in E_origin.
+                symbol = lhs[production]
+                if node is None:
+                    node = node_for(symbol, i, i)
+                    node.add_family(production, i, None, None)
+                if origin == i:
+                    nullable_done[symbol] = node
+                    waiters = list(waiting_i.get(symbol, ()))
+                else:
+                    top = leo_top(origin, symbol) if leo else None
+                    if top is not None:
+                        link, top_production, top_origin = top
+                        top_node = node_for(lhs[top_production], top_origin, i)
+                        key = ("leo", id(link))
+                        if key not in top_node._keys:
+                            top_node._keys.add(key)
+                            top_node.families.append((link, node))
+                        add((top_production, len(rhs[top_production]), top_origin, top_node))
+                        continue
+                    waiters = waiting[origin].get(symbol, ())
+                for waiter in waiters:
+                    add((waiter[0], waiter[1] + 1, waiter[2], make_node(waiter[0], waiter[1] + 1, waiter[2], i, waiter[3], node)))
+            if i == n:
+                break
+            if not queue:
+                raise ParseError(f"Unexpected token {tokens[i]!r}", i)
+            # Scan tokens[i] into E_{i+1}.
+            leaf = node_for(symbols[i], i, i + 1)
+            scanned = queue.values()
+            chart = {}
+            queue = {}
+            current = symbols[i + 1] if i + 1 < n else None
+            for production, dot, origin, node in scanned:
+                add((production, dot + 1, origin, make_node(production, dot + 1, origin, i + 1, node, leaf)))
+
+        root = nodes.get((grammar.start, 0, n))
+        accepted = root is not None and any(
+            item[1] == len(rhs[item[0]]) and item[2] == 0 and lhs[item[0]] == grammar.start for item in chart.values()
+        )
+        if not accepted:
+            raise ParseError("Unexpected end of input", n)
+        return ParseForest(grammar, tokens, root, nodes)
+
+
+class ParseForest:
+    """Shared packed parse forest; ``root`` is the (start, 0, n) node."""
+
+    def __init__(self, grammar, tokens, root, nodes):
+        self.grammar = grammar
+        self.tokens = tokens
+        self.root = root
+        self._nodes = nodes
+
+    def families(self, node):
+        """Alternatives of a node as (production, left, right), materializing Leo chains."""
+        if any(type(family[0]) is _LeoLink for family in node.families):
+            leo = [family for family in node.families if type(family[0]) is _LeoLink]
+            node.families = [family for family in node.families if type(family[0]) is not _LeoLink]
+            for link, below in leo:
+                self._materialize(link, below, node.end)
+        return node.families
+
+    def _materialize(self, link, below, end):
+        nodes = self._nodes
+        productions = self.grammar.productions
+        while link is not None:
+            key = (productions[link.production].lhs, link.origin, end)
+            node = nodes.get(key)
+            if node is None:
+                node = nodes[key] = ForestNode(key[0], link.origin, end)
+            node.add_family(link.production, link.pivot, link.left, below)
+            below = node
+            link = link.up
+
+    def is_terminal(self, node):
+        return type(node.label) is int and node.label >= self.grammar.n_nonterminals
+
+    def name(self, node):
+        """Symbol name, or the dotted production for an intermediate node."""
+        if type(node.label) is int:
+            return self.grammar.symbols[node.label]
+        production, dot = node.label
+        rule = self.grammar.productions[production]
+        body = self.grammar.names(rule.rhs)
+        return f"{self.grammar.symbols[rule.lhs]} → {' '.join(body[:dot])} • {' '.join(body[dot:])}"
+
+    def _walk(self, node=None):
+        """Every node reachable from ``node`` (default: the root), each once."""
+        node = node or self.root
+        seen = {id(node)}
+        work = [node]
+        while work:
+            current = work.pop()
+            yield current
+            for _, left, right in self.families(current):
+                for child in (left, right):
+                    if child is not None and id(child) not in seen:
+                        seen.add(id(child))
+                        work.append(child)
+
+    def node_count(self):
+        return sum(1 for _ in self._walk())
+
+    def is_ambiguous(self):
+        return any(len(node.families) > 1 for node in self._walk())
+
+    def count_trees(self, node=None):
+        """Number of parse trees below ``node`` (math.inf if the forest has a cycle)."""
+        node = node or self.root
+        counts = {}
+        active = set()
+        work = [(node, False)]
+        while work:
+            current, ready = work.pop()
+            key = id(current)
+            if ready:
+                total = 0 if current.families else 1  # a token leaf is one tree
+                for _, left, right in current.families:
+                    total += (counts[id(left)] if left is not None else 1) * (counts[id(right)] if right is not None else 1)
+                counts[key] = total
+                continue
+            if key in counts:
+                continue
+            if key in active:
+                return math.inf  # reached again inside its own subtree
+            active.add(key)
+            work.append((current, True))
+            for _, left, right in self.families(current):
+                for child in (left, right):
+                    if child is not None and id(child) not in counts:
+                        work.append((child, False))
+        return counts[id(node)]
+
+    def trees(self, node=None, limit=None):
+        """Yield up to ``limit`` parse trees as (symbol, [children]) with tokens as leaves.
+
+        A cyclic forest has infinitely many trees; only those that do not
+        repeat a node along a path are produced.
+        """
+        node = node or self.root
+        count = 0
+        for tree in self._trees(node, frozenset()):
+            yield tree
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def _trees(self, node, path):
+        if self.is_terminal(node):
+            yield self.tokens[node.start]
+            return
+        if id(node) in path:
+            return
+        path = path | {id(node)}
+        name = self.grammar.symbols[node.label]
+        for production, left, right in self.families(node):
+            for children in self._sequences(left, right, path):
+                yield (name, children)
+
+    def _sequences(self, left, right, path):
+        """Child trees for one family; an intermediate left node expands to the leading children."""
+        if right is None:
+            yield []
+            return
+        if left is None:
+            prefixes = [[]]
+        elif type(left.label) is tuple:
+            if id(left) in path:
+                return
+            inner = path | {id(left)}
+            prefixes = (prefix for _, l, r in self.families(left) for prefix in self._sequences(l, r, inner))
+        else:
+            prefixes = ([tree] for tree in self._trees(left, path))
+        for prefix in prefixes:
+            for tree in self._trees(right, path):
+                yield prefix + [tree]
+
+
+def parse_forest(rules, tokens, start=None, leo=True):
+    """Parse ``tokens`` with a grammar dict (or Grammar) and return its ParseForest."""
+    return EarleyParser(compile_grammar(rules, start), leo).parse(tokens)
@@ -0,0 +1,202 @@
+"""
+Persistent environments for DenotationalSemantics.
+
+``Environment`` is an immutable mapping stored as a hash array mapped trie
+(HAMT): each level consumes 5 bits of the key's hash and keeps a 32-bit
+bitmap of occupied slots plus a dense tuple of children. ``env.set(k, v)``
+copies only the O(log m) nodes on the path to ``k`` and shares everything
+else with ``env``, so a program of n assignments over m variables costs
+O(n log m) time and memory instead of the O(n m) of ``{**env, k: v}``.
+Every earlier version stays valid and unchanged.
+
+Iteration follows insertion order, as for a dict: each leaf carries the
+insertion number of its key (rebinding a key keeps its number), and
+``__iter__`` sorts the leaves by it, so key order does not depend on the
+hash seed.
+
+Environments are ``collections.abc.Mapping`` objects, so the notebook's
+plotting code (``env.keys()``, ``env.values()``) works on them unchanged.
+"""
+
+from collections.abc import Mapping
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 64
+_HASH_MASK = (1 << _HASH_BITS) - 1
+_MISSING = object()
+
+
+class _BitmapNode:
+    # Children are (hash, key, value, order) leaves or nodes of the next level, in slot order.
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap, children):
+        self.bitmap = bitmap
+        self.children = children
+
+
+class _CollisionNode:
+    # Leaves whose 64-bit hashes are all equal, below the last bitmap level.
+    __slots__ = ("children",)
+
+    def __init__(self, children):
+        self.children = children
+
+
+_EMPTY = _BitmapNode(0, ())
+
+
+def _pair(shift, a, b):
+    """Smallest subtree holding two leaves with different keys."""
+    if shift >= _HASH_BITS:
+        return _CollisionNode((a, b))
+    slot_a = (a[0] >> shift) & _MASK
+    slot_b = (b[0] >> shift) & _MASK
+    if slot_a == slot_b:
+        return _BitmapNode(1 << slot_a, (_pair(shift + _BITS, a, b),))
+    if slot_a > slot_b:
+        a, b = b, a
+    return _BitmapNode((1 << slot_a) | (1 << slot_b), (a, b))
+
+
+def _assoc(node, shift, leaf):
+    """Return (new node, whether a key was added); ``node`` itself if nothing changed.
+
+    A rebound key keeps the insertion number of its existing leaf.
+    """
+    h, key, value, _ = leaf
+    children = node.children
+    if type(node) is _CollisionNode:
+        for index, (_, other, old, order) in enumerate(children):
+            if other is key or other == key:
+                if old is value:
+                    return node, False
+                return _CollisionNode(children[:index] + ((h, key, value, order),) + children[index + 1 :]), False
+        return _CollisionNode(children + (leaf,)), True
+
+    bit = 1 << ((h >> shift) & _MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    if not node.bitmap & bit:
+        return _BitmapNode(node.bitmap | bit, children[:index] + (leaf,) + children[index:]), True
+    child = children[index]
+    if type(child) is tuple:
+        if child[0] == h and (child[1] is key or child[1] == key):
+            if child[2] is value:
+                return node, False
+            replacement, added = (h, key, value, child[3]), False
+        else:
+            replacement, added = _pair(shift + _BITS, child, leaf), True
+    else:
+        replacement, added = _assoc(child, shift + _BITS, leaf)
+        if replacement is child:
+            return node, False
+    return _BitmapNode(node.bitmap, children[:index] + (replacement,) + children[index + 1 :]), added
+
+
+def _lookup(node, h, key):
+    shift = 0
+    while True:
+        if type(node) is _CollisionNode:
+            for _, other, value, _ in node.children:
+                if other is key or other == key:
+                    return value
+            return _MISSING
+        bit = 1 << ((h >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+        child = node.children[(node.bitmap & (bit - 1)).bit_count()]
+        if type(child) is tuple:
+            if child[0] == h and (child[1] is key or child[1] == key):
+                return child[2]
+            return _MISSING
+        node = child
+        shift += _BITS
+
+
+def _leaves(node):
+    """Every leaf, in insertion order."""
+    leaves = []
+    work = [node]
+    while work:
+        node = work.pop()
+        for child in node.children:
+            if type(child) is tuple:
+                leaves.append(child)
+            else:
+                work.append(child)
+    leaves.sort(key=lambda leaf: leaf[3])
+    return leaves
+
+
+class Environment(Mapping):
+    """Immutable variable -> value mapping with O(log m) ``set`` and lookup."""
+
+    __slots__ = ("_root", "_size", "_next")
+
+    def __init__(self, items=()):
+        self._root = _EMPTY
+        self._size = 0
+        self._next = 0  # insertion number of the next new key
+        if isinstance(items, Mapping):
+            items = items.items()
+        for key, value in items:
+            self._root, added = _assoc(self._root, 0, (hash(key) & _HASH_MASK, key, value, self._next))
+            self._size += added
+            self._next += added
+
+    @classmethod
+    def _make(cls, root, size, next_order):
+        env = cls.__new__(cls)
+        env._root = root
+        env._size = size
+        env._next = next_order
+        return env
+
+    def __getitem__(self, key):
+        value = _lookup(self._root, hash(key) & _HASH_MASK, key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def get(self, key, default=None):
+        value = _lookup(self._root, hash(key) & _HASH_MASK, key)
+        return default if value is _MISSING else value
+
+    def __contains__(self, key):
+        return _lookup(self._root, hash(key) & _HASH_MASK, key) is not _MISSING
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for leaf in _leaves(self._root):
+            yield leaf[1]
+
+    def __repr__(self):
+        return f"Environment({ {key: value for _, key, value, _ in _leaves(self._root)}!r})"
+
+    def set(self, key, value):
+        """Return a new Environment that also binds ``key`` to ``value``."""
+        root, added = _assoc(self._root, 0, (hash(key) & _HASH_MASK, key, value, self._next))
+        if root is self._root:
+            return self
+        return Environment._make(root, self._size + added, self._next + added)
+
+    def update(self, items):
+        """Return a new Environment with every binding of ``items`` applied in order."""
+        if isinstance(items, Mapping):
+            items = items.items()
+        root, size, next_order = self._root, self._size, self._next
+        for key, value in items:
+            root, added = _assoc(root, 0, (hash(key) & _HASH_MASK, key, value, next_order))
+            size += added
+            next_order += added
+        return self if root is self._root else Environment._make(root, size, next_order)
+
+
+def as_environment(env):
+    """``env`` as an Environment (copying a plain dict once)."""
+    if isinstance(env, Environment):
+        return env
+    return Environment(env if env is not None else ())
@@ -0,0 +1,68 @@
+"""
+Evaluation of SyntaxTreeBuilder dict ASTs.
+
+``evaluate_tree`` is the notebooks' recursive walker. ``iterative=True``
+runs the same semantics over an explicit stack, so trees that are hundreds
+of thousands of levels deep evaluate without touching the recursion limit.
+"""
+
+INF = float("inf")
+
+
+def apply_op(op, left_val, right_val):
+    """Apply a binary operator; division by zero denotes infinity."""
+    if op == "+":
+        return left_val + right_val
+    elif op == "-":
+        return left_val - right_val
+    elif op == "*":
+        return left_val * right_val
+    elif op == "/":
+        return left_val / right_val if right_val != 0 else INF
+    return 0
+
+
+def _evaluate_recursive(tree, variables):
+    if tree["type"] == "Number":
+        return tree["value"]
+    elif tree["type"] == "Variable":
+        return variables.get(tree["name"], 0)
+    elif tree["type"] == "BinaryOp":
+        left_val = _evaluate_recursive(tree["left"], variables)
+        right_val = _evaluate_recursive(tree["right"], variables)
+        return apply_op(tree["op"], left_val, right_val)
+    return 0
+
+
+def _evaluate_iterative(tree, variables):
+    # The work stack holds AST nodes still to visit and operator strings whose
+    # operands are already on the value stack.
+    values = []
+    work = [tree]
+    while work:
+        node = work.pop()
+        if type(node) is str:
+            right_val = values.pop()
+            values[-1] = apply_op(node, values[-1], right_val)
+            continue
+        node_type = node["type"]
+        if node_type == "Number":
+            values.append(node["value"])
+        elif node_type == "Variable":
+            values.append(variables.get(node["name"], 0))
+        elif node_type == "BinaryOp":
+            work.append(node["op"])
+            work.append(node["right"])
+            work.append(node["left"])
+        else:
+            values.append(0)
+    return values[0]
+
+
+def evaluate_tree(tree, variables=None, iterative=False):
+    """Evaluate a dict AST under ``variables`` (unbound names default to 0)."""
+    if variables is None:
+        variables = {}
+    if iterative:
+        return _evaluate_iterative(tree, variables)
+    return _evaluate_recursive(tree, variables)
@@ -0,0 +1,184 @@
+"""
+Least fixed points by Kleene iteration.
+
+A recursive definition ``f = F(f)`` denotes the least upper bound of the
+chain ⊥ ⊑ F(⊥) ⊑ F²(⊥) ⊑ ..., where ⊥ is the everywhere-undefined
+function and F^k(⊥)(x) is defined exactly when computing f(x) needs fewer
+than k nested unfoldings of the definition.
+
+Definitions are written as generator functions: ``yield y`` stands for the
+recursive call f(y) and the generator's return value is F(f)(x).
+
+    def factorial(n):
+        if n == 0:
+            return 1
+        return n * (yield n - 1)
+
+``least_fixed_point(factorial)`` is the limit of the chain. It unfolds
+calls on an explicit stack (no Python recursion), memoizes every value it
+computes, and raises ``Divergence`` once it has made more than ``budget``
+unfoldings, or immediately when f(x) turns out to depend on f(x) itself.
+``approximations(factorial)`` yields the iterates F^k(⊥) themselves; they
+share one memo, so each iterate reuses the values the earlier ones found
+(by monotonicity, a value defined in F^j(⊥) is the same in every later
+iterate).
+
+``while_loop`` is the denotation of ``while b do c``: the least fixed point
+of W ↦ λσ. if b(σ) then W(c(σ)) else σ. The recursion is a tail call, so its
+limit is computed by plain iteration, again under a step budget.
+"""
+
+DEFAULT_BUDGET = 10**7
+
+
+class _Bottom:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "⊥"
+
+    def __bool__(self):
+        return False
+
+
+BOTTOM = _Bottom()
+
+
+class Divergence(RuntimeError):
+    """The fixed-point computation ran out of budget or found a cyclic dependency."""
+
+    def __init__(self, message, argument, steps):
+        super().__init__(f"{message} (argument {argument!r}, {steps} steps)")
+        self.argument = argument
+        self.steps = steps
+
+
+def _unfold(body, argument, memo, budget, level=None, bottoms=None):
+    """Evaluate the fixed point (``level=None``) or F^level(⊥) at ``argument``.
+
+    ``memo`` maps arguments to (first defined level, value). For iterates,
+    ``bottoms`` maps arguments to the highest level known to be ⊥ there.
+    Returns (value or BOTTOM, unfoldings made).
+    """
+    known = memo.get(argument)
+    if known is not None and (level is None or known[0] <= level):
+        return known[1], 0
+    if level is not None and (known is not None or level == 0 or bottoms.get(argument, 0) >= level):
+        # Memoized levels are minimal, so a value first defined above ``level`` is ⊥ here.
+        return BOTTOM, 0
+    # Frames are [argument, generator, level, highest level among its calls].
+    stack = [[argument, body(argument), level, 0]]
+    push = stack.append
+    lookup = memo.get
+    active = {argument}
+    steps = 1
+    send = None
+    while stack:
+        frame = stack[-1]
+        try:
+            request = frame[1].send(send)
+        except StopIteration as stop:
+            stack.pop()
+            active.discard(frame[0])
+            send = stop.value
+            defined_at = frame[3] + 1
+            memo[frame[0]] = (defined_at, send)
+            if stack and stack[-1][3] < defined_at:
+                stack[-1][3] = defined_at
+            continue
+        sub_level = None if frame[2] is None else frame[2] - 1
+        known = lookup(request)
+        if known is not None and (sub_level is None or known[0] <= sub_level):
+            send = known[1]
+            if frame[3] < known[0]:
+                frame[3] = known[0]
+            continue
+        if sub_level is not None and (known is not None or sub_level == 0 or bottoms.get(request, 0) >= sub_level):
+            # Undefined at this level: so is every caller on the stack.
+            for caller in stack:
+                bottoms[caller[0]] = max(bottoms.get(caller[0], 0), caller[2])
+            return BOTTOM, steps
+        if sub_level is None and request in active:
+            raise Divergence("f(x) depends on itself", request, steps)
+        steps += 1
+        if steps > budget:
+            raise Divergence("step budget exhausted", argument, steps)
+        push([request, body(request), sub_level, 0])
+        active.add(request)
+        send = None
+    return send, steps
+
+
+class RecursiveFunction:
+    """The least fixed point of a generator-style recursive definition."""
+
+    def __init__(self, body, budget=DEFAULT_BUDGET):
+        self.body = body
+        self.budget = budget
+        self.memo = {}
+        self.steps = 0
+
+    def __call__(self, argument):
+        value, steps = _unfold(self.body, argument, self.memo, self.budget)
+        self.steps += steps
+        return value
+
+
+def least_fixed_point(body, budget=DEFAULT_BUDGET):
+    """Return the least fixed point of the definition ``body`` as a callable."""
+    return RecursiveFunction(body, budget)
+
+
+class Approximation:
+    """The iterate F^level(⊥); calling it returns BOTTOM where it is undefined."""
+
+    def __init__(self, body, level, memo, bottoms, budget):
+        self.body = body
+        self.level = level
+        self._memo = memo
+        self._bottoms = bottoms
+        self.budget = budget
+
+    def __call__(self, argument):
+        return _unfold(self.body, argument, self._memo, self.budget, self.level, self._bottoms)[0]
+
+    def __repr__(self):
+        return f"F^{self.level}(⊥)"
+
+
+def approximations(body, budget=DEFAULT_BUDGET):
+    """Yield the Kleene chain F^0(⊥), F^1(⊥), ... of ``body``, sharing one memo."""
+    memo = {}
+    bottoms = {}
+    level = 0
+    while True:
+        yield Approximation(body, level, memo, bottoms, budget)
+        level += 1
+
+
+def while_loop(condition, body, budget=DEFAULT_BUDGET):
+    """Denotation of ``while condition do body`` over states of any type."""
+
+    def loop(state):
+        steps = 0
+        while condition(state):
+            steps += 1
+            if steps > budget:
+                raise Divergence("step budget exhausted", state, steps)
+            state = body(state)
+        return state
+
+    return loop
+
+
+def while_approximation(condition, body, level):
+    """F^level(⊥) for the while functional: defined after fewer than ``level`` iterations."""
+
+    def approximation(state):
+        for _ in range(level):
+            if not condition(state):
+                return state
+            state = body(state)
+        return BOTTOM
+
+    return approximation
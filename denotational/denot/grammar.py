@@ -0,0 +1,406 @@
+"""
+Context-free grammars from CFGVisualizer and their static analysis.
+
+``compile_grammar`` turns a CFGVisualizer grammar dict
+
+    {'E': ['E + T', 'T'], 'T': ['( E )', 'id'], ...}
+
+into a ``Grammar``: every symbol gets an integer id (nonterminals first, in
+dict order, so the first key is the start symbol; then terminals in order
+of first use; then the end marker ``$``), and each production is split once
+into a tuple of ids. ``''`` is an ε-production.
+
+``analyze`` computes nullable, FIRST, FOLLOW, reachable and productive sets.
+Sets of terminals and of nonterminals are Python ints used as bitsets (bit
+i is terminal / nonterminal i). Nullable and productive use a worklist with
+the linear counting algorithm: each production counts the right-hand-side
+symbols not yet known to be nullable / productive, and a nonterminal is
+queued once, when one of its productions reaches zero. FIRST and FOLLOW
+are seeded from the productions and closed under their subset constraints
+(FIRST(A) ⊇ FIRST(B), FOLLOW(B) ⊇ FOLLOW(A)) one strongly connected
+component at a time, so each set is unioned once instead of being
+re-propagated around cycles. Both functions are cached per grammar, so
+views can call them freely.
+
+``proper_form`` rewrites a grammar without ε-productions (each production
+is expanded over its nullable symbols) or unit productions (A -> B is
+replaced by B's productions); only ε itself leaves the language, kept as a
+flag. Sentence counting and CNF conversion start from it.
+"""
+
+import hashlib
+from collections import namedtuple
+from functools import lru_cache
+
+END = "$"
+
+Production = namedtuple("Production", ["lhs", "rhs", "text"])
+ProperForm = namedtuple("ProperForm", ["grammar", "has_empty", "productions"])
+
+
+class Grammar:
+    """A grammar with integer symbol ids and pre-split productions."""
+
+    def __init__(self, rules, start=None):
+        nonterminals = list(rules)
+        if start is not None:
+            if start not in rules:
+                raise ValueError(f"Start symbol {start!r} has no productions")
+            nonterminals.remove(start)
+            nonterminals.insert(0, start)
+        if not nonterminals:
+            raise ValueError("Grammar has no productions")
+        ids = {name: index for index, name in enumerate(nonterminals)}
+        terminals = []
+        productions = []
+        by_lhs = [[] for _ in nonterminals]
+        for lhs in nonterminals:
+            for text in rules[lhs]:
+                rhs = []
+                for name in text.split():
+                    symbol = ids.get(name)
+                    if symbol is None:
+                        terminals.append(name)
+                        symbol = ids[name] = -len(terminals)  # renumbered below
+                    rhs.append(symbol)
+                by_lhs[ids[lhs]].append(len(productions))
+                productions.append(Production(ids[lhs], rhs, text))
+        if END in ids:
+            raise ValueError(f"{END!r} is reserved for the end marker")
+        terminals.append(END)
+        n = len(nonterminals)
+        # Terminal -k (k-th new terminal) becomes id n + k - 1.
+        for name in terminals[:-1]:
+            ids[name] = n - ids[name] - 1
+        ids[END] = n + len(terminals) - 1
+        self.productions = [
+            Production(p.lhs, tuple(s if s >= 0 else n - s - 1 for s in p.rhs), p.text) for p in productions
+        ]
+        self.nonterminals = nonterminals
+        self.terminals = terminals
+        self.symbols = nonterminals + terminals
+        self.ids = ids
+        self.by_lhs = [tuple(indices) for indices in by_lhs]
+        self.start = 0
+        self.end = ids[END]
+        self.key = _grammar_key(rules, nonterminals[0])
+
+    @property
+    def n_nonterminals(self):
+        return len(self.nonterminals)
+
+    def is_nonterminal(self, symbol):
+        return symbol < len(self.nonterminals)
+
+    def terminal_bit(self, symbol):
+        return 1 << (symbol - len(self.nonterminals))
+
+    def names(self, symbols):
+        return [self.symbols[symbol] for symbol in symbols]
+
+    def terminal_names(self, bits):
+        """Names of the terminals in a bitset."""
+        names = []
+        index = 0
+        while bits:
+            if bits & 1:
+                names.append(self.terminals[index])
+            bits >>= 1
+            index += 1
+        return names
+
+    def nonterminal_names(self, bits):
+        return [self.nonterminals[index] for index in range(len(self.nonterminals)) if bits >> index & 1]
+
+    @property
+    def digest(self):
+        """Stable content hash of the grammar, e.g. for on-disk caches."""
+        return hashlib.sha256(repr(self.key).encode("utf-8")).hexdigest()
+
+    def __repr__(self):
+        return f"Grammar({len(self.nonterminals)} nonterminals, {len(self.terminals) - 1} terminals, {len(self.productions)} productions)"
+
+
+def _grammar_key(rules, start):
+    return (start, tuple((lhs, tuple(productions)) for lhs, productions in rules.items()))
+
+
+@lru_cache(maxsize=64)
+def _compile(key):
+    start, items = key
+    return Grammar(dict(items), start)
+
+
+def compile_grammar(rules, start=None):
+    """Cached Grammar for a CFGVisualizer grammar dict (start: first key by default)."""
+    if isinstance(rules, Grammar):
+        return rules
+    if start is None:
+        start = next(iter(rules), None)
+    return _compile(_grammar_key(rules, start))
+
+
+class GrammarAnalysis:
+    """Nullable, FIRST, FOLLOW, reachable and productive sets of a Grammar as bitsets."""
+
+    def __init__(self, grammar):
+        self.grammar = grammar
+        self.nullable = _nullable(grammar)
+        self.productive = _productive(grammar)
+        self.reachable = _reachable(grammar)
+        self.first = _first(grammar, self.nullable)
+        self.follow = _follow(grammar, self.nullable, self.first)
+
+    def is_nullable(self, name):
+        return bool(self.nullable >> self.grammar.ids[name] & 1)
+
+    def first_of(self, name):
+        """FIRST set of a symbol by name (a terminal's FIRST set is itself)."""
+        symbol = self.grammar.ids[name]
+        if not self.grammar.is_nonterminal(symbol):
+            return {name}
+        return set(self.grammar.terminal_names(self.first[symbol]))
+
+    def follow_of(self, name):
+        return set(self.grammar.terminal_names(self.follow[self.grammar.ids[name]]))
+
+    def first_of_sequence(self, symbols):
+        """(FIRST bitset, nullable) of a sequence of symbol ids."""
+        grammar = self.grammar
+        bits = 0
+        for symbol in symbols:
+            if not grammar.is_nonterminal(symbol):
+                return bits | grammar.terminal_bit(symbol), False
+            bits |= self.first[symbol]
+            if not self.nullable >> symbol & 1:
+                return bits, False
+        return bits, True
+
+    def unreachable(self):
+        return self.grammar.nonterminal_names(~self.reachable & ((1 << self.grammar.n_nonterminals) - 1))
+
+    def unproductive(self):
+        return self.grammar.nonterminal_names(~self.productive & ((1 << self.grammar.n_nonterminals) - 1))
+
+    def table(self):
+        """Rows of (nonterminal, nullable, FIRST, FOLLOW) with sorted terminal names, for display."""
+        grammar = self.grammar
+        return [
+            (name, bool(self.nullable >> index & 1), sorted(grammar.terminal_names(self.first[index])), sorted(grammar.terminal_names(self.follow[index])))
+            for index, name in enumerate(grammar.nonterminals)
+        ]
+
+
+def _occurrences(grammar):
+    """For each nonterminal, the productions it occurs in (once per occurrence)."""
+    occurrences = [[] for _ in grammar.nonterminals]
+    n = grammar.n_nonterminals
+    for index, production in enumerate(grammar.productions):
+        for symbol in production.rhs:
+            if symbol < n:
+                occurrences[symbol].append(index)
+    return occurrences
+
+
+def _counting_closure(grammar, counts):
+    """Nonterminals derived by the counting algorithm from initial per-production counts (None = never)."""
+    occurrences = _occurrences(grammar)
+    productions = grammar.productions
+    found = 0
+    work = []
+    for index, count in enumerate(counts):
+        if count == 0:
+            lhs = productions[index].lhs
+            if not found >> lhs & 1:
+                found |= 1 << lhs
+                work.append(lhs)
+    while work:
+        symbol = work.pop()
+        for index in occurrences[symbol]:
+            if counts[index] is None:
+                continue
+            counts[index] -= 1
+            if counts[index] == 0:
+                lhs = productions[index].lhs
+                if not found >> lhs & 1:
+                    found |= 1 << lhs
+                    work.append(lhs)
+    return found
+
+
+def _nullable(grammar):
+    n = grammar.n_nonterminals
+    # A production with a terminal can never derive ε.
+    counts = [len(p.rhs) if all(symbol < n for symbol in p.rhs) else None for p in grammar.productions]
+    return _counting_closure(grammar, counts)
+
+
+def _productive(grammar):
+    n = grammar.n_nonterminals
+    counts = [sum(1 for symbol in p.rhs if symbol < n) for p in grammar.productions]
+    return _counting_closure(grammar, counts)
+
+
+def _reachable(grammar):
+    n = grammar.n_nonterminals
+    seen = 1 << grammar.start
+    work = [grammar.start]
+    while work:
+        symbol = work.pop()
+        for index in grammar.by_lhs[symbol]:
+            for child in grammar.productions[index].rhs:
+                if child < n and not seen >> child & 1:
+                    seen |= 1 << child
+                    work.append(child)
+    return seen
+
+
+def _propagate(sets, edges):
+    """Close ``sets`` under sets[b] ⊇ sets[a] for every edge a -> b.
+
+    This is DeRemer and Pennello's digraph algorithm: an iterative Tarjan
+    walk over the reversed edges finds the strongly connected components,
+    and each component's set is the union of its members' seeds and of the
+    already final sets it depends on, computed once.
+    """
+    count = len(sets)
+    sources = [[] for _ in range(count)]
+    for source, targets in enumerate(edges):
+        for target in targets:
+            sources[target].append(source)
+    index = [0] * count
+    low = [0] * count
+    on_stack = [False] * count
+    stack = []
+    counter = 1
+    for root in range(count):
+        if index[root]:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        calls = [[root, 0]]
+        while calls:
+            call = calls[-1]
+            node = call[0]
+            children = sources[node]
+            if call[1] < len(children):
+                child = children[call[1]]
+                call[1] += 1
+                if not index[child]:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    calls.append([child, 0])
+                elif on_stack[child] and index[child] < low[node]:
+                    low[node] = index[child]
+                continue
+            calls.pop()
+            if calls and low[node] < low[calls[-1][0]]:
+                low[calls[-1][0]] = low[node]
+            if low[node] != index[node]:
+                continue
+            # ``node`` roots a component; everything it depends on outside it is final.
+            members = []
+            bits = 0
+            while True:
+                member = stack.pop()
+                on_stack[member] = False
+                members.append(member)
+                bits |= sets[member]
+                for source in sources[member]:
+                    bits |= sets[source]
+                if member == node:
+                    break
+            for member in members:
+                sets[member] = bits
+    return sets
+
+
+def _first(grammar, nullable):
+    n = grammar.n_nonterminals
+    first = [0] * n
+    edges = [set() for _ in range(n)]
+    for production in grammar.productions:
+        for symbol in production.rhs:
+            if symbol >= n:
+                first[production.lhs] |= 1 << (symbol - n)
+                break
+            if symbol != production.lhs:
+                edges[symbol].add(production.lhs)
+            if not nullable >> symbol & 1:
+                break
+    return _propagate(first, edges)
+
+
+def _follow(grammar, nullable, first):
+    n = grammar.n_nonterminals
+    follow = [0] * n
+    follow[grammar.start] = grammar.terminal_bit(grammar.end)
+    edges = [set() for _ in range(n)]
+    for production in grammar.productions:
+        # Walk right to left, keeping FIRST of the suffix and whether it is nullable.
+        suffix_first = 0
+        suffix_nullable = True
+        for symbol in reversed(production.rhs):
+            if symbol >= n:
+                suffix_first = 1 << (symbol - n)
+                suffix_nullable = False
+                continue
+            follow[symbol] |= suffix_first
+            if suffix_nullable and symbol != production.lhs:
+                edges[production.lhs].add(symbol)
+            if nullable >> symbol & 1:
+                suffix_first |= first[symbol]
+            else:
+                suffix_first = first[symbol]
+                suffix_nullable = False
+    return _propagate(follow, edges)
+
+
+@lru_cache(maxsize=64)
+def _analyze(grammar):
+    return GrammarAnalysis(grammar)
+
+
+def analyze(rules, start=None):
+    """Cached GrammarAnalysis of a grammar dict or Grammar."""
+    return _analyze(compile_grammar(rules, start))
+
+
+@lru_cache(maxsize=64)
+def _proper(grammar):
+    n = grammar.n_nonterminals
+    nullable = _analyze(grammar).nullable
+    # ε-free productions: every way of dropping nullable symbols, except dropping all.
+    free = [set() for _ in range(n)]
+    for production in grammar.productions:
+        variants = [()]
+        for symbol in production.rhs:
+            keep = [variant + (symbol,) for variant in variants]
+            variants = keep + variants if symbol < n and nullable >> symbol & 1 else keep
+        free[production.lhs].update(variant for variant in variants if variant)
+    # Unit closure: A derives B through unit productions alone.
+    units = [{lhs} for lhs in range(n)]
+    for lhs in range(n):
+        work = [lhs]
+        while work:
+            symbol = work.pop()
+            for rhs in free[symbol]:
+                if len(rhs) == 1 and rhs[0] < n and rhs[0] not in units[lhs]:
+                    units[lhs].add(rhs[0])
+                    work.append(rhs[0])
+    productions = []
+    for lhs in range(n):
+        bodies = set()
+        for symbol in units[lhs]:
+            bodies.update(rhs for rhs in free[symbol] if not (len(rhs) == 1 and rhs[0] < n))
+        productions.extend((lhs, rhs) for rhs in sorted(bodies))
+    return ProperForm(grammar, bool(nullable & 1 << grammar.start), tuple(productions))
+
+
+def proper_form(rules, start=None):
+    """Cached ε-free, unit-free ProperForm of a grammar dict or Grammar: (grammar, has_empty, ((lhs, rhs), ...))."""
+    return _proper(compile_grammar(rules, start))
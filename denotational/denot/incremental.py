@@ -0,0 +1,320 @@
+"""
+Incremental reparsing for small edits to long expressions.
+
+``IncrementalParser`` keeps the token stream of the last successfully parsed
+text, the token that owns each AST node and each node's parent. When the
+text changes it finds the edited region and reparses the smallest enclosing
+region that can be parsed on its own:
+
+* an edit inside one Number/Variable token that still lexes to a single
+  operand replaces just that leaf;
+* an edit strictly inside a pair of parentheses reparses only the text
+  between them, since ``( E )`` is an operand whatever E is.
+
+Anything else (edits to top-level operators, unbalanced parentheses, parse
+errors) falls back to a full parse, which is always authoritative. Subtrees
+outside the reparsed region are kept by identity; the AST is updated in
+place, so ``parser.tree`` stays the root of the current expression.
+"""
+
+import numpy as np
+
+from .parser import BINDING_POWER, LPAREN, NAME, NUMBER, ParseError, _Failure, _Parser, _position, _TOKEN_RE, number_value, token_kind
+
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.")
+
+
+class _SpanParser(_Parser):
+    """_Parser that records which node owns each token and each node's parent."""
+
+    def __init__(self, texts):
+        super().__init__(texts)
+        self.owner = [None] * len(texts)
+        self.parents = {}
+
+    def binary_op(self, op, left, right):
+        node = {"type": "BinaryOp", "op": op, "left": left, "right": right}
+        self.parents[id(left)] = (node, "left")
+        self.parents[id(right)] = (node, "right")
+        return node
+
+    def expression(self, min_power):
+        left = self.operand()
+        while True:
+            power = BINDING_POWER.get(self.peek())
+            if power is None or power <= min_power:
+                return left
+            op_index = self.pos
+            self.pos += 1
+            right = self.expression(power)
+            left = self.binary_op(self.texts[op_index], left, right)
+            self.owner[op_index] = left
+
+    def operand(self):
+        start = self.pos
+        text = self.peek()
+        if text is None:
+            raise _Failure("Unexpected end of expression", self.pos)
+        kind = token_kind(text)
+        self.pos += 1
+        if kind == NUMBER:
+            node = {"type": "Number", "value": number_value(text, start)}
+        elif kind == NAME:
+            node = {"type": "Variable", "name": text}
+        elif kind == LPAREN:
+            node = self.expression(0)
+            if self.peek() != ")":
+                raise _Failure("Expected ')'", self.pos)
+            self.owner[self.pos] = node
+            self.pos += 1
+        elif text == "-":
+            operand = self.operand()
+            if operand["type"] == "Number":
+                node = {"type": "Number", "value": -operand["value"]}
+                # The folded literal owns every token of its operand, e.g. '-', '(', '3', ')'.
+                for index in range(start + 1, self.pos):
+                    self.owner[index] = node
+                self.parents.pop(id(operand), None)
+            else:
+                node = self.binary_op("-", {"type": "Number", "value": 0}, operand)
+        else:
+            raise _Failure(f"Unexpected {text!r}", self.pos - 1)
+        self.owner[start] = node
+        return node
+
+
+def _common_prefix(a, b):
+    """Length of the common prefix of two strings in O(log n) slice comparisons."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[:mid] == b[:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _common_suffix(a, b, limit):
+    low, high = 0, limit
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[len(a) - mid :] == b[len(b) - mid :]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _lex(text, offset):
+    """Tokenize ``text`` and return (token texts, absolute start offsets)."""
+    texts = []
+    starts = []
+    for match in _TOKEN_RE.finditer(text):
+        texts.append(match.group())
+        starts.append(match.start() + offset)
+    return texts, starts
+
+
+class IncrementalParser:
+    """Parse an expression and keep its AST up to date across small edits."""
+
+    def __init__(self, text=""):
+        self.text = ""
+        self.tree = None
+        self.last_mode = None
+        self.reparsed_tokens = 0
+        if text:
+            self.update(text)
+
+    def _full_parse(self, text):
+        self.text = text
+        self.tree = None
+        texts, starts = _lex(text, 0)
+        parser = _SpanParser(texts)
+        try:
+            tree = parser.parse()
+        except _Failure as failure:
+            raise ParseError(failure.message, _position(text, failure.index)) from None
+        self.texts = texts
+        self.starts = np.array(starts, dtype=np.int64)
+        self.owner = parser.owner
+        self.parents = parser.parents
+        self.parents[id(tree)] = (None, None)
+        self.tree = tree
+        self.last_mode = "full"
+        self.reparsed_tokens = len(texts)
+        return tree
+
+    def update(self, new_text):
+        """Bring the AST in line with ``new_text`` and return it; raises ParseError if invalid."""
+        old_text = self.text
+        if self.tree is None:
+            return self._full_parse(new_text)
+        if new_text == old_text:
+            self.last_mode = "unchanged"
+            self.reparsed_tokens = 0
+            return self.tree
+        prefix = _common_prefix(old_text, new_text)
+        suffix = _common_suffix(old_text, new_text, min(len(old_text), len(new_text)) - prefix)
+        return self._apply(new_text, prefix, len(old_text) - suffix, len(new_text) - suffix)
+
+    def edit(self, start, end, replacement):
+        """Replace ``text[start:end]`` with ``replacement`` and return the updated AST."""
+        new_text = self.text[:start] + replacement + self.text[end:]
+        if self.tree is None:
+            return self._full_parse(new_text)
+        return self._apply(new_text, start, end, start + len(replacement))
+
+    def _apply(self, new_text, start, old_end, new_end):
+        if self._reparse_leaf(new_text, start, old_end, new_end) or self._reparse_group(new_text, start, old_end, new_end):
+            self.text = new_text
+            return self.tree
+        return self._full_parse(new_text)
+
+    def _unary_minus_before(self, index):
+        """Whether the token before ``index`` is a prefix (unary) minus."""
+        if index == 0 or self.texts[index - 1] != "-":
+            return False
+        return index == 1 or self.texts[index - 2] == "(" or self.texts[index - 2] in BINDING_POWER
+
+    def _token_end(self, index):
+        return int(self.starts[index]) + len(self.texts[index])
+
+    def _reparse_leaf(self, new_text, start, old_end, new_end):
+        texts = self.texts
+        if not texts:
+            return False
+        index = int(np.searchsorted(self.starts, start, side="right")) - 1
+        if index < 0:
+            return False
+        token_start = int(self.starts[index])
+        token_end = self._token_end(index)
+        if old_end > token_end:
+            return False
+        node = self.owner[index]
+        if node["type"] not in ("Number", "Variable"):
+            return False
+        # A leaf folded with a unary minus or wrapped in parentheses owns other tokens too.
+        if (index > 0 and self.owner[index - 1] is node) or (index + 1 < len(texts) and self.owner[index + 1] is node):
+            return False
+        delta = new_end - old_end
+        region_end = token_end + delta
+        region = new_text[token_start:region_end]
+        if len(_TOKEN_RE.findall(region)) != 1 or region != region.strip():
+            return False
+        if token_start > 0 and new_text[token_start - 1] in _WORD_CHARS:
+            return False
+        if region_end < len(new_text) and new_text[region_end] in _WORD_CHARS:
+            return False
+        kind = token_kind(region)
+        if kind == NUMBER:
+            try:
+                replacement = {"type": "Number", "value": number_value(region, index)}
+            except _Failure:
+                return False  # the full parse reports it
+            if self._unary_minus_before(index):
+                # A literal after a unary minus would fold into a negative Number.
+                return False
+        elif kind == NAME:
+            replacement = {"type": "Variable", "name": region}
+        else:
+            return False
+        texts[index] = region
+        self.owner[index] = replacement
+        self._replace(node, replacement)
+        if delta:
+            self.starts[index + 1 :] += delta
+        self.last_mode = "leaf"
+        self.reparsed_tokens = 1
+        return True
+
+    def _reparse_group(self, new_text, start, old_end, new_end):
+        texts = self.texts
+        first = int(np.searchsorted(self.starts, start, side="right")) - 1
+        # Walk left to the innermost '(' that encloses the edit.
+        depth = 0
+        open_index = first
+        while open_index >= 0:
+            token = texts[open_index]
+            if token == ")" and (open_index < first or int(self.starts[open_index]) < start):
+                depth += 1
+            elif token == "(" and self._token_end(open_index) <= start:
+                if depth == 0:
+                    break
+                depth -= 1
+            open_index -= 1
+        if open_index < 0:
+            return False
+        # Walk right to its matching ')', which must lie after the edit.
+        depth = 0
+        close_index = open_index + 1
+        while close_index < len(texts):
+            token = texts[close_index]
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                if depth == 0:
+                    break
+                depth -= 1
+            close_index += 1
+        if close_index >= len(texts) or int(self.starts[close_index]) < old_end:
+            return False
+
+        delta = new_end - old_end
+        inner_start = self._token_end(open_index)
+        inner_end = int(self.starts[close_index]) + delta
+        inner_texts, inner_starts = _lex(new_text[inner_start:inner_end], inner_start)
+        parser = _SpanParser(inner_texts)
+        try:
+            replacement = parser.parse()
+        except _Failure:
+            return False
+
+        group = self.owner[open_index]
+        lo, hi = open_index, close_index
+        while lo > 0 and self.owner[lo - 1] is group and texts[lo - 1] == "(":
+            lo -= 1
+        while hi + 1 < len(texts) and self.owner[hi + 1] is group and texts[hi + 1] == ")":
+            hi += 1
+        if replacement["type"] == "Number" and self._unary_minus_before(lo):
+            # '-(...)' folds into a negative literal when the group is a Number.
+            return False
+        if group["type"] == "Number" and lo > 0 and self.owner[lo - 1] is group:
+            # The old group was itself folded into a unary minus.
+            return False
+
+        self._forget(group)
+        self.parents.update(parser.parents)
+        self._replace(group, replacement)
+        owner = self.owner
+        for index in list(range(lo, open_index + 1)) + list(range(close_index, hi + 1)):
+            owner[index] = replacement
+        texts[open_index + 1 : close_index] = inner_texts
+        owner[open_index + 1 : close_index] = parser.owner
+        starts = self.starts
+        self.starts = np.concatenate(
+            (starts[: open_index + 1], np.array(inner_starts, dtype=np.int64), starts[close_index:] + delta)
+        )
+        self.last_mode = "group"
+        self.reparsed_tokens = len(inner_texts)
+        return True
+
+    def _replace(self, old, new):
+        """Put ``new`` where ``old`` was in the tree, reusing every other node."""
+        parent, side = self.parents.pop(id(old))
+        self.parents[id(new)] = (parent, side)
+        if parent is None:
+            self.tree = new
+        else:
+            parent[side] = new
+
+    def _forget(self, node):
+        """Drop parent entries for the descendants of a node about to be replaced."""
+        work = [node]
+        while work:
+            current = work.pop()
+            if current["type"] == "BinaryOp":
+                for child in (current["left"], current["right"]):
+                    self.parents.pop(id(child), None)
+                    work.append(child)
@@ -0,0 +1,156 @@
+"""
+Interval abstract interpretation of SyntaxTreeBuilder dict ASTs.
+
+``evaluate_intervals`` evaluates an AST over interval environments: each
+variable is bound to a pair of arrays (lower, upper), one entry per
+environment, and the whole batch is analyzed with one NumPy operation per
+BinaryOp. The result is sound: for every environment i and every point
+assignment with each variable inside its interval, ``evaluate_tree`` gives
+a value v with
+
+    lower[i] <= v <= upper[i]      or      v is nan and maybe_nan[i]
+
+Intervals are closed intervals of the extended reals, so inf is a possible
+value. The division rule keeps the scalar semantics: if the divisor's
+interval contains 0 the result contains inf, and the divisor is split into
+its negative and positive parts, each of which can send the quotient to
+±inf. nan can only come from inf - inf, 0 * inf and inf / inf, and
+``maybe_nan`` marks the environments where that can happen.
+
+Python ints are exact while the bounds are float64, so results of
+magnitude at least 2**53 are widened by one ulp to stay sound.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+IntervalResult = namedtuple("IntervalResult", ["lower", "upper", "maybe_nan"])
+
+_EXACT = 2.0**53
+
+
+def _has_inf(lower, upper):
+    return np.isinf(lower) | np.isinf(upper)
+
+
+def _contains_zero(lower, upper):
+    return (lower <= 0) & (upper >= 0)
+
+
+def _add(a, b, c, d):
+    nan = ((b == np.inf) & (c == -np.inf)) | ((a == -np.inf) & (d == np.inf))
+    lower = a + c
+    upper = b + d
+    return np.where(np.isnan(lower), -np.inf, lower), np.where(np.isnan(upper), np.inf, upper), nan
+
+
+def _multiply(a, b, c, d):
+    nan = (_contains_zero(a, b) & _has_inf(c, d)) | (_has_inf(a, b) & _contains_zero(c, d))
+    # A 0 * inf corner bounds the products near it by 0; the other corners cover the rest.
+    corners = np.nan_to_num(np.stack([a * c, a * d, b * c, b * d]), nan=0.0, posinf=np.inf, neginf=-np.inf)
+    return corners.min(axis=0), corners.max(axis=0), nan
+
+
+def _quotient_corners(a, b, c, d):
+    """Bounds of x / y over x in [a, b] and y in [c, d], where [c, d] excludes 0 except as a signed-zero end."""
+    corners = np.stack([a / c, a / d, b / c, b / d])
+    numerators = np.stack([a, a, b, b])
+    undefined = np.isnan(corners)
+    # 0 / 0 is the limit 0 / y = 0; inf / inf could be anything.
+    zero = undefined & (numerators == 0)
+    lower = np.where(undefined & ~zero, -np.inf, np.where(zero, 0.0, corners)).min(axis=0)
+    upper = np.where(undefined & ~zero, np.inf, np.where(zero, 0.0, corners)).max(axis=0)
+    return lower, upper
+
+
+def _divide(a, b, c, d):
+    nan = _has_inf(a, b) & _has_inf(c, d)
+    lower = np.full(np.shape(a), np.inf)
+    upper = np.full(np.shape(a), -np.inf)
+    # y == 0 denotes inf.
+    zero = _contains_zero(c, d)
+    lower = np.where(zero, np.inf, lower)
+    upper = np.where(zero, np.inf, upper)
+    positive = d > 0
+    if positive.any():
+        part_lower, part_upper = _quotient_corners(a, b, np.where(c > 0, c, 0.0), d)
+        lower = np.where(positive, np.minimum(lower, part_lower), lower)
+        upper = np.where(positive, np.maximum(upper, part_upper), upper)
+    negative = c < 0
+    if negative.any():
+        part_lower, part_upper = _quotient_corners(a, b, c, np.where(d < 0, d, -0.0))
+        lower = np.where(negative, np.minimum(lower, part_lower), lower)
+        upper = np.where(negative, np.maximum(upper, part_upper), upper)
+    return lower, upper, nan
+
+
+def _subtract(a, b, c, d):
+    return _add(a, b, -d, -c)
+
+
+_INTERVAL_OPS = {"+": _add, "-": _subtract, "*": _multiply, "/": _divide}
+
+
+def _widen(lower, upper):
+    lower = np.where(np.abs(lower) >= _EXACT, np.nextafter(lower, -np.inf), lower)
+    upper = np.where(np.abs(upper) >= _EXACT, np.nextafter(upper, np.inf), upper)
+    return lower, upper
+
+
+def as_bounds(bounds):
+    """Normalise {name: (lower, upper)} to broadcast float arrays and check lower <= upper."""
+    result = {}
+    for name, (lower, upper) in bounds.items():
+        lower = np.asarray(lower, dtype=float)
+        upper = np.asarray(upper, dtype=float)
+        if np.any(lower > upper) or np.any(np.isnan(lower) | np.isnan(upper)):
+            raise ValueError(f"Invalid interval for {name!r}: need lower <= upper")
+        result[name] = (lower, upper)
+    return result
+
+
+def evaluate_intervals(tree, bounds):
+    """Bound a dict AST over every interval environment in ``bounds`` at once.
+
+    ``bounds`` maps variable names to (lower, upper) arrays of a common
+    (broadcastable) shape; unbound variables are [0, 0], as in
+    ``evaluate_tree``. Returns an IntervalResult of arrays of that shape.
+    """
+    bounds = as_bounds(bounds)
+    shape = np.broadcast_shapes(*(np.shape(part) for pair in bounds.values() for part in pair))
+    zero = np.zeros(shape)
+    values = []
+    work = [tree]
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        while work:
+            node = work.pop()
+            if type(node) is str:
+                c, d, right_nan = values.pop()
+                a, b, left_nan = values.pop()
+                operation = _INTERVAL_OPS.get(node)
+                if operation is None:
+                    values.append((zero, zero, np.zeros(shape, dtype=bool)))
+                    continue
+                lower, upper, nan = operation(a, b, c, d)
+                lower, upper = _widen(lower, upper)
+                values.append((lower, upper, nan | left_nan | right_nan))
+                continue
+            node_type = node["type"]
+            if node_type == "BinaryOp":
+                work.append(node["op"])
+                work.append(node["right"])
+                work.append(node["left"])
+            elif node_type == "Number":
+                value = np.full(shape, float(node["value"]))
+                values.append((*_widen(value, value), np.full(shape, node["value"] != node["value"])))
+            elif node_type == "Variable":
+                lower, upper = bounds.get(node["name"], (zero, zero))
+                values.append((np.broadcast_to(lower, shape), np.broadcast_to(upper, shape), np.zeros(shape, dtype=bool)))
+            else:
+                values.append((zero, zero, np.zeros(shape, dtype=bool)))
+    lower, upper, nan = values.pop()
+    # A nan-only result (e.g. a nan literal) leaves no finite bound: report the whole line.
+    lower = np.where(np.isnan(lower), -np.inf, lower)
+    upper = np.where(np.isnan(upper), np.inf, upper)
+    return IntervalResult(np.broadcast_to(lower, shape), np.broadcast_to(upper, shape), np.broadcast_to(nan, shape))
@@ -0,0 +1,412 @@
+"""
+LALR(1) parse tables for CFGVisualizer grammars, cached on disk.
+
+``build_table`` constructs the LR(0) automaton of a grammar and computes
+LALR(1) lookaheads with DeRemer and Pennello's relations: for every
+nonterminal transition (p, A), DR holds the terminals shifted right after
+it, Read closes DR under ``reads`` (transitions over nullable
+nonterminals), Follow closes Read under ``includes``, and a reduction's
+lookahead is the union of Follow over its ``lookback`` transitions. Both
+closures use the same strongly-connected-component propagation as FIRST
+and FOLLOW in grammar.py.
+
+Conflicts are resolved as yacc does (shift over reduce, then the earlier
+production) and recorded in ``ParseTable.conflicts``; ``report`` lists them
+by name. Tables are dense ``array('i')`` rows, one per state:
+
+* ``action`` -- n_states x n_terminals (``$`` last): ``s + 1`` shifts to
+  state s, ``-(p + 1)`` reduces production p, 0 is an error; reducing the
+  augmented production (index ``len(grammar.productions)``) accepts;
+* ``goto``   -- n_states x n_nonterminals: the successor state, or -1.
+
+``parse_table`` keeps the serialized tables in a cache directory keyed by
+the grammar's digest and memory-maps them on later runs, so a table-driven
+parser starts without rebuilding the automaton; ``LALRParser`` loads its
+table on first use.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import namedtuple
+
+from .grammar import _propagate, analyze, compile_grammar
+from .parser import ParseError
+
+MAGIC = b"DNLR"
+VERSION = 1
+# magic, version, grammar digest, then the number of states, terminals, nonterminals, productions and conflicts.
+_HEADER = struct.Struct("<4sI32sIIIII")
+
+CACHE_DIR = os.environ.get("DENOT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "denot"))
+
+Conflict = namedtuple("Conflict", ["state", "terminal", "kept", "rejected"])
+
+
+def _pad(length):
+    return -length % 8
+
+
+class ParseTable:
+    """LALR(1) action and goto tables of a Grammar."""
+
+    def __init__(self, grammar, n_states, action, goto, conflicts):
+        self.grammar = grammar
+        self.n_states = n_states
+        self.n_terminals = len(grammar.terminals)
+        self.action = action
+        self.goto = goto
+        self.conflicts = [Conflict(*conflicts[i : i + 4]) for i in range(0, len(conflicts), 4)]
+        self.lhs = [production.lhs for production in grammar.productions] + [-1]
+        self.lengths = [len(production.rhs) for production in grammar.productions] + [1]
+        self.accept = len(grammar.productions)
+
+    def describe(self, entry):
+        """Readable form of an action entry."""
+        if entry > 0:
+            return f"shift to state {entry - 1}"
+        if entry == 0:
+            return "error"
+        production = -entry - 1
+        if production == self.accept:
+            return "accept"
+        rule = self.grammar.productions[production]
+        return f"reduce {self.grammar.symbols[rule.lhs]} → {rule.text or 'ε'}"
+
+    def report(self):
+        """One line per conflict, naming the state, lookahead and both actions."""
+        grammar = self.grammar
+        lines = []
+        for conflict in self.conflicts:
+            kind = "shift/reduce" if conflict.kept > 0 else "reduce/reduce"
+            terminal = grammar.terminals[conflict.terminal]
+            lines.append(
+                f"state {conflict.state}, on {terminal!r}: {kind} conflict, "
+                f"{self.describe(conflict.kept)} (chosen) over {self.describe(conflict.rejected)}"
+            )
+        return lines
+
+    def parse(self, tokens, reduce=None, kind=None):
+        """Parse a token list (or whitespace-separated string) with the table.
+
+        ``kind`` maps a token to its terminal name (default: the token
+        itself). Each reduction calls ``reduce(production, children)`` with
+        the production index and the children's values (tokens for
+        terminals); the default builds (symbol, [children]) tuples as
+        ParseForest.trees does. Raises ParseError with the token index.
+        """
+        if isinstance(tokens, str):
+            tokens = tokens.split()
+        grammar = self.grammar
+        ids = grammar.ids
+        n_nonterminals = grammar.n_nonterminals
+        n_terminals = self.n_terminals
+        end = n_terminals - 1
+        action, goto, lhs, lengths, accept = self.action, self.goto, self.lhs, self.lengths, self.accept
+        if reduce is None:
+            symbols, productions = grammar.symbols, grammar.productions
+
+            def reduce(production, children):
+                return (symbols[productions[production].lhs], children)
+
+        states = [0]
+        values = []
+        state = 0
+        for index in range(len(tokens) + 1):
+            if index < len(tokens):
+                token = tokens[index]
+                terminal = ids.get(kind(token) if kind is not None else token, -1) - n_nonterminals
+                if terminal < 0 or terminal == end:
+                    raise ParseError(f"Unexpected token {token!r}", index)
+            else:
+                token = None
+                terminal = end
+            while True:
+                entry = action[state * n_terminals + terminal]
+                if entry > 0:
+                    state = entry - 1
+                    states.append(state)
+                    values.append(token)
+                    break
+                if entry == 0:
+                    raise ParseError(f"Unexpected token {token!r}" if token is not None else "Unexpected end of input", index)
+                production = -entry - 1
+                if production == accept:
+                    return values[-1]
+                length = lengths[production]
+                if length == 1:
+                    # Unit and leaf productions: replace the top entry in place.
+                    values[-1] = reduce(production, [values[-1]])
+                    state = goto[states[-2] * n_nonterminals + lhs[production]]
+                    states[-1] = state
+                    continue
+                if length:
+                    children = values[-length:]
+                    del values[-length:]
+                    del states[-length:]
+                else:
+                    children = []
+                values.append(reduce(production, children))
+                state = goto[states[-1] * n_nonterminals + lhs[production]]
+                states.append(state)
+        raise AssertionError("unreachable: the end marker is always accepted or rejected")
+
+    def to_bytes(self):
+        """Serialize to a little-endian, 8-byte aligned buffer."""
+        conflicts = array("i", [value for conflict in self.conflicts for value in conflict])
+        sections = []
+        for values in (self.action, self.goto, conflicts):
+            values = array("i", values)
+            if sys.byteorder == "big":
+                values.byteswap()
+            sections.append(values.tobytes())
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            bytes.fromhex(self.grammar.digest),
+            self.n_states,
+            self.n_terminals,
+            self.grammar.n_nonterminals,
+            len(self.grammar.productions),
+            len(self.conflicts),
+        )
+        parts = [header, bytes(_pad(len(header)))]
+        for section in sections:
+            parts.append(section)
+            parts.append(bytes(_pad(len(section))))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, buffer, grammar):
+        """Tables of ``grammar`` over ``buffer`` without copying; ValueError if they belong to another grammar."""
+        view = memoryview(buffer)
+        magic, version, digest, n_states, n_terminals, n_nonterminals, n_productions, n_conflicts = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not an LALR table (bad magic or version)")
+        if digest != bytes.fromhex(grammar.digest):
+            raise ValueError("LALR table was built for a different grammar")
+        offset = _HEADER.size + _pad(_HEADER.size)
+        arrays = []
+        for count in (n_states * n_terminals, n_states * n_nonterminals, n_conflicts * 4):
+            size = count * array("i").itemsize
+            if offset + size > len(view):
+                raise ValueError("LALR table file is truncated")
+            section = view[offset : offset + size]
+            if sys.byteorder == "big":
+                swapped = array("i", section.tobytes())
+                swapped.byteswap()
+                arrays.append(swapped)
+            else:
+                arrays.append(section.cast("i"))
+            offset += size + _pad(size)
+        return cls(grammar, n_states, arrays[0], arrays[1], list(arrays[2]))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def load(path, grammar):
+    """Memory-map saved tables of ``grammar``."""
+    with open(path, "rb") as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return ParseTable.from_bytes(mapping, grammar)
+
+
+def _lr0(grammar):
+    """LR(0) automaton: (item bases, item symbols, closures, transitions) with the augmented production last."""
+    rhs = [production.rhs for production in grammar.productions] + [(grammar.start,)]
+    n_nonterminals = grammar.n_nonterminals
+    base = []
+    following = []  # symbol after the dot of each item, or -1 if complete
+    production_of = []
+    for index, body in enumerate(rhs):
+        base.append(len(following))
+        following.extend(body)
+        following.append(-1)
+        production_of.extend([index] * (len(body) + 1))
+    predictions = [[base[index] for index in grammar.by_lhs[symbol]] for symbol in range(n_nonterminals)]
+    kernels = {(base[-1],): 0}
+    closures = []
+    transitions = []
+    # States are numbered in discovery order; ``order`` doubles as the work queue.
+    order = [(base[-1],)]
+    for kernel in order:
+        items = list(kernel)
+        predicted = set()
+        for item in items:
+            symbol = following[item]
+            if 0 <= symbol < n_nonterminals and symbol not in predicted:
+                predicted.add(symbol)
+                items.extend(predictions[symbol])
+        successors = {}
+        for item in items:
+            symbol = following[item]
+            if symbol >= 0:
+                successors.setdefault(symbol, []).append(item + 1)
+        moves = {}
+        for symbol, moved in successors.items():
+            moved = tuple(sorted(set(moved)))
+            state = kernels.get(moved)
+            if state is None:
+                state = kernels[moved] = len(order)
+                order.append(moved)
+            moves[symbol] = state
+        closures.append(items)
+        transitions.append(moves)
+    return rhs, following, production_of, closures, transitions
+
+
+def build_table(rules, start=None):
+    """Build the LALR(1) ParseTable of a grammar dict (or Grammar) without the disk cache."""
+    grammar = compile_grammar(rules, start)
+    nullable = analyze(grammar).nullable
+    n_nonterminals = grammar.n_nonterminals
+    n_terminals = len(grammar.terminals)
+    rhs, following, production_of, closures, transitions = _lr0(grammar)
+    n_states = len(closures)
+    accept = len(rhs) - 1
+
+    # Nonterminal transitions (p, A), numbered, with DR(p, A) as terminal bitsets.
+    index = {}
+    pairs = []
+    for state, moves in enumerate(transitions):
+        for symbol in moves:
+            if symbol < n_nonterminals:
+                index[state, symbol] = len(pairs)
+                pairs.append((state, symbol))
+    direct = []
+    reads = [[] for _ in pairs]
+    for x, (state, symbol) in enumerate(pairs):
+        target = transitions[state][symbol]
+        bits = 0
+        for successor in transitions[target]:
+            if successor >= n_nonterminals:
+                bits |= 1 << (successor - n_nonterminals)
+            elif nullable >> successor & 1:
+                reads[index[target, successor]].append(x)
+        direct.append(bits)
+    x = index.get((0, grammar.start))
+    if x is not None:
+        direct[x] |= 1 << (n_terminals - 1)
+    read = _propagate(direct, reads)
+
+    # includes and lookback, walking each production from every transition over its left-hand side.
+    includes = [[] for _ in pairs]
+    lookback = {}
+    nullable_suffix = []
+    for body in rhs[:-1]:
+        flags = [True] * (len(body) + 1)
+        for position in range(len(body) - 1, -1, -1):
+            symbol = body[position]
+            flags[position] = flags[position + 1] and symbol < n_nonterminals and bool(nullable >> symbol & 1)
+        nullable_suffix.append(flags)
+    for x, (state, symbol) in enumerate(pairs):
+        for production in grammar.by_lhs[symbol]:
+            body = rhs[production]
+            flags = nullable_suffix[production]
+            current = state
+            for position, part in enumerate(body):
+                if part < n_nonterminals and flags[position + 1]:
+                    includes[x].append(index[current, part])
+                current = transitions[current][part]
+            lookback.setdefault((current, production), []).append(x)
+    follow = _propagate(list(read), includes)
+
+    action = array("i", bytes(4 * n_states * n_terminals))
+    goto = array("i", [-1]) * (n_states * n_nonterminals)
+    conflicts = []
+    for state, moves in enumerate(transitions):
+        row = state * n_terminals
+        for symbol, target in moves.items():
+            if symbol >= n_nonterminals:
+                action[row + symbol - n_nonterminals] = target + 1
+            else:
+                goto[state * n_nonterminals + symbol] = target
+        # Accept first, so a reduction on $ can never shadow it.
+        complete = sorted((production_of[item] for item in closures[state] if following[item] < 0), key=lambda production: (production != accept, production))
+        for production in complete:
+            if production == accept:
+                lookahead = 1 << (n_terminals - 1)
+            else:
+                lookahead = 0
+                for x in lookback.get((state, production), ()):
+                    lookahead |= follow[x]
+            entry = -(production + 1)
+            terminal = 0
+            while lookahead:
+                if lookahead & 1:
+                    existing = action[row + terminal]
+                    if existing == 0:
+                        action[row + terminal] = entry
+                    else:
+                        # Shifts were entered first and reductions in production order, so the existing entry wins.
+                        conflicts.extend((state, terminal, existing, entry))
+                lookahead >>= 1
+                terminal += 1
+    return ParseTable(grammar, n_states, action, goto, conflicts)
+
+
+_tables = {}
+
+
+def parse_table(rules, start=None, cache_dir=CACHE_DIR):
+    """LALR(1) ParseTable of a grammar, from memory, the disk cache, or built and saved.
+
+    ``cache_dir=None`` skips the disk. An unreadable or stale cache file is
+    rebuilt, and a cache directory that cannot be written is ignored.
+    """
+    grammar = compile_grammar(rules, start)
+    digest = grammar.digest
+    table = _tables.get(digest)
+    if table is not None:
+        return table
+    path = os.path.join(cache_dir, f"{digest}.lalr") if cache_dir is not None else None
+    if path is not None and os.path.exists(path):
+        try:
+            table = load(path, grammar)
+        except (OSError, ValueError, TypeError, struct.error):
+            # TypeError: memoryview.cast of a section that is not a whole number of ints.
+            table = None
+    if table is None:
+        table = build_table(grammar)
+        if path is not None:
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Write to a temporary file and rename, so readers never see a partial table.
+                handle, temporary = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(handle, "wb") as f:
+                        f.write(table.to_bytes())
+                    os.replace(temporary, path)
+                finally:
+                    # Gone after a successful rename; after a failed write or rename it must not stay behind.
+                    try:
+                        os.unlink(temporary)
+                    except FileNotFoundError:
+                        pass
+            except OSError:
+                pass
+    _tables[digest] = table
+    return table
+
+
+class LALRParser:
+    """Table-driven parser for one grammar; the table is loaded on the first parse."""
+
+    def __init__(self, rules, start=None, cache_dir=CACHE_DIR):
+        self.grammar = compile_grammar(rules, start)
+        self.cache_dir = cache_dir
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = parse_table(self.grammar, cache_dir=self.cache_dir)
+        return self._table
+
+    def parse(self, tokens, reduce=None, kind=None):
+        return self.table.parse(tokens, reduce, kind)
@@ -0,0 +1,203 @@
+"""
+Deterministic layered (Sugiyama) layouts for CFGVisualizer graphs.
+
+``layered_layout`` places a directed graph in horizontal layers, top to
+bottom:
+
+1. each nonterminal's layer is its breadth-first depth from the roots (the
+   start symbol first), i.e. how many productions it is from the start;
+   sinks (the terminals) go one layer below their deepest parent;
+2. edges pointing back up are read in reverse, which breaks every cycle,
+   and edges within a layer (including self-loops) are ignored;
+3. a few barycenter sweeps reorder each layer to reduce crossings;
+4. x coordinates follow the neighbours' mean positions as closely as the
+   order and a minimum gap of 1 allow, which is an isotonic regression
+   solved exactly by pool-adjacent-violators.
+
+Edges are drawn as straight lines, so long edges are not split into chains
+of dummy nodes: barycenters use the far endpoint's centred position, which
+keeps every sweep O(V + E) however deep the grammar is. Everything iterates
+in a fixed order, so the same graph always gets the same positions.
+
+Given ``previous`` positions (e.g. the layout before a production was
+added), the layout is updated instead of redone. Old nodes keep their
+left-to-right order in their layer, and new nodes are slotted in under
+their parents. Each layer's x is then the least-squares closest fit to the
+old x (new nodes: their slot) that keeps the gap of 1, so old nodes are
+pushed aside only as far as the gap needs. That push is not local: in a
+layer packed at the minimum gap, the whole packed run around a new node
+shifts, each node by a fraction of a gap, so one added production can move
+dozens of nodes slightly. A production that changes a nonterminal's
+breadth-first depth also moves it, and what hangs below it, to another
+layer. Unchanged graphs keep exactly their previous positions.
+
+``LayoutCache`` is an LRU cache of layouts keyed by ``graph_key``, a hash of
+the nodes and edges, so switching back to a grammar costs a lookup.
+"""
+
+import hashlib
+from collections import OrderedDict
+
+SWEEPS = 4
+
+
+def graph_key(graph):
+    """Stable hash of a graph's nodes and edges (attributes are ignored)."""
+    nodes = sorted(repr(node) for node in graph.nodes)
+    edges = sorted((repr(u), repr(v)) for u, v in graph.edges)
+    return hashlib.sha256(repr((nodes, edges)).encode("utf-8")).hexdigest()
+
+
+def _layers(nodes, successors, roots):
+    """Breadth-first depth from the roots (then from any node not yet reached); sinks below their parents."""
+    layer = {}
+    deepest = -1
+    for root in list(roots) + nodes:
+        if root in layer:
+            continue
+        # Parts the roots do not reach start below everything placed so far.
+        layer[root] = deepest + 1
+        queue = [root]
+        for node in queue:  # grows while iterating
+            for child in successors[node]:
+                if child not in layer:
+                    layer[child] = layer[node] + 1
+                    queue.append(child)
+        deepest = max(deepest, layer[queue[-1]])
+    for node in nodes:
+        for child in successors[node]:
+            if not successors[child] and layer[child] <= layer[node]:
+                layer[child] = layer[node] + 1
+    return layer
+
+
+def _isotonic(desired):
+    """x minimizing the squared distance to ``desired`` subject to x[i + 1] >= x[i] + 1."""
+    # With y[i] = x[i] - i the constraint is y non-decreasing: pool adjacent violators.
+    blocks = []  # [sum, count]
+    for index, value in enumerate(desired):
+        blocks.append([value - index, 1])
+        while len(blocks) > 1 and blocks[-2][0] * blocks[-1][1] > blocks[-1][0] * blocks[-2][1]:
+            total, count = blocks.pop()
+            blocks[-1][0] += total
+            blocks[-1][1] += count
+    positions = []
+    for total, count in blocks:
+        level = total / count
+        for _ in range(count):
+            positions.append(level + len(positions))
+    return positions
+
+
+def layered_layout(graph, roots=(), previous=None, sweeps=SWEEPS):
+    """Positions {node: (x, y)} of a directed graph in layers, roots at the top (y = 0, -1, ...).
+
+    ``previous`` positions of (some of) the nodes turn this into an
+    incremental update that keeps those nodes in place where it can.
+    """
+    nodes = list(graph.nodes)
+    if not nodes:
+        return {}
+    successors = {node: [] for node in nodes}
+    for u, v in graph.edges:
+        successors[u].append(v)
+    roots = [root for root in roots if root in successors]
+    layer = _layers(nodes, successors, roots)
+
+    # Every edge is read top-down; edges within a layer do not constrain the order.
+    index = {node: position for position, node in enumerate(nodes)}
+    levels = [layer[node] for node in nodes]
+    up = [[] for _ in nodes]
+    down = [[] for _ in nodes]
+    edges = set()
+    for u, v in graph.edges:
+        a, b = index[u], index[v]
+        if levels[a] != levels[b]:
+            edges.add((a, b) if levels[a] < levels[b] else (b, a))
+    for a, b in sorted(edges):
+        down[a].append(b)
+        up[b].append(a)
+    rows = [[] for _ in range(max(levels) + 1)]
+    for i, level in enumerate(levels):
+        rows[level].append(i)
+    if previous:
+        # Old nodes stay where they were and new ones go under the mean of
+        # their parents; one isotonic pass per layer makes room for them.
+        key = [0.0] * len(nodes)
+        result = {}
+        for level, row in enumerate(rows):
+            for i in row:
+                if nodes[i] in previous:
+                    key[i] = previous[nodes[i]][0]
+                elif up[i]:
+                    key[i] = sum(key[j] for j in up[i]) / len(up[i])
+            row.sort(key=lambda i: (key[i], i))
+            for i, value in zip(row, _isotonic([key[i] for i in row])):
+                result[nodes[i]] = (value, -float(level))
+        return {node: result[node] for node in nodes}
+
+    # Centred slot of each node, so layers of different widths line up.
+    x = [0.0] * len(nodes)
+
+    def number(row):
+        offset = (len(row) - 1) / 2
+        for position, i in enumerate(row):
+            x[i] = position - offset
+
+    def reorder(row, neighbours):
+        keys = []
+        for i in row:
+            linked = neighbours[i]
+            keys.append(sum(x[j] for j in linked) / len(linked) if linked else x[i])
+        row[:] = [i for _, i in sorted(zip(keys, row), key=lambda pair: pair[0])]
+        number(row)
+
+    def place(row, neighbours):
+        desired = []
+        for i in row:
+            linked = neighbours[i]
+            desired.append(sum(x[j] for j in linked) / len(linked) if linked else x[i])
+        for i, value in zip(row, _isotonic(desired)):
+            x[i] = value
+
+    for row in rows:
+        number(row)
+    for _ in range(sweeps):
+        for row in rows[1:]:
+            reorder(row, up)
+        for row in reversed(rows[:-1]):
+            reorder(row, down)
+    for _ in range(2):
+        for row in rows[1:]:
+            place(row, up)
+        for row in reversed(rows[:-1]):
+            place(row, down)
+    return {node: (x[i], -float(levels[i])) for i, node in enumerate(nodes)}
+
+
+class LayoutCache:
+    """LRU cache of layered layouts keyed by graph_key, with hit and miss counters."""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def layout(self, graph, roots=(), previous=None):
+        """Cached positions for ``graph``; a miss lays it out, starting from ``previous`` if given."""
+        key = (graph_key(graph), tuple(roots))
+        positions = self._entries.get(key)
+        if positions is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return positions
+        self.misses += 1
+        positions = layered_layout(graph, roots, previous)
+        self._entries[key] = positions
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return positions
@@ -0,0 +1,359 @@
+"""
+Persistent, blitted figures for the notebook widgets.
+
+The first widget callbacks cleared the cell, built a new pyplot figure, ran
+tight_layout and let the inline backend encode a PNG on every change, so
+most of each interaction went into building and laying out a figure that
+differed from the last one in a few numbers.
+
+``LiveFigure`` keeps one figure per widget for the whole session. Views
+create their artists once, marked animated, and a callback only changes
+their data (``set_offsets``, ``set_segments``, ``set_height``,
+``set_text``). ``redraw`` then restores the cached background, which holds
+everything that is not animated (axes frames, ticks, fixed titles), and
+draws only the animated artists over it. This is blitting. The background
+is rendered again only after ``invalidate``. Views whose static parts come
+in a few states (a bar chart's categories and axis limits) report them with
+``stage``, and the figure keeps one background per combination of stages, so
+switching back to an earlier state blits as well. The frame is shown through an ``ipywidgets.Image`` as a PNG at
+compression level 1. Under the ipympl backend (``%matplotlib widget``),
+pass a pyplot figure instead: its canvas is itself the widget, and frames
+are blitted into it.
+
+Views: ``GraphView`` (CFG graphs drawn from positions), ``TreeView``
+(syntax trees from ``drawing.tidy_layout``), ``BarView`` (environment bar
+charts) and ``TextPool`` (reusable labels). ``LatencyLog`` times the widget
+callbacks, so the old and new paths can be compared in the notebook and in
+``benchmarks/live.py``.
+"""
+
+import io
+import statistics
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+import numpy as np
+
+from . import drawing
+
+
+class LatencyLog:
+    """Wall-clock samples (ms) per callback name."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append((time.perf_counter() - start) * 1e3)
+
+    def timed(self, name, status=None):
+        """Decorator recording each call of a callback; ``status.value`` (e.g. a Label) shows the latest."""
+
+        def decorate(function):
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.measure(name):
+                    result = function(*args, **kwargs)
+                if status is not None:
+                    status.value = self.describe(name)
+                return result
+
+            return wrapper
+
+        return decorate
+
+    def describe(self, name):
+        samples = self.samples[name]
+        if not samples:
+            return f"{name}: no calls"
+        return f"{name}: {samples[-1]:.0f} ms (median {statistics.median(samples):.0f} ms over {len(samples)} calls)"
+
+    def report(self):
+        """Rows of (name, calls, median ms, max ms)."""
+        return [(name, len(samples), statistics.median(samples), max(samples)) for name, samples in sorted(self.samples.items()) if samples]
+
+
+class LiveFigure:
+    """One figure kept for a widget's lifetime and redrawn by blitting its animated artists."""
+
+    def __init__(self, figsize=(12, 8), dpi=100, figure=None):
+        if figure is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            figure = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(figure)
+        self.figure = figure
+        try:
+            import ipywidgets as widgets
+        except ImportError:
+            self.canvas_is_widget = False
+        else:
+            self.canvas_is_widget = isinstance(figure.canvas, widgets.DOMWidget)
+        self.animated = []
+        self.png = None
+        self.full_draws = 0
+        self.blits = 0
+        self.max_backgrounds = 8
+        self._background = None
+        self._backgrounds = {}
+        self._stages = {}
+        self._image = None
+
+    @property
+    def widget(self):
+        """The canvas itself under ipympl, otherwise an ipywidgets.Image showing the latest frame."""
+        if self.canvas_is_widget:
+            return self.figure.canvas
+        if self._image is None:
+            import ipywidgets as widgets
+
+            self._image = widgets.Image(format="png")
+            if self.png is not None:
+                self._image.value = self.png
+        return self._image
+
+    def animate(self, *artists):
+        """Register artists that change between frames; they are left out of the background."""
+        for artist in artists:
+            artist.set_animated(True)
+            self.animated.append(artist)
+
+    def invalidate(self):
+        """Re-render the background on the next redraw (limits, ticks or layout changed)."""
+        self._background = None
+        self._backgrounds.clear()
+
+    def stage(self, owner, key):
+        """Record the static state of one view; the background is cached per combination of states."""
+        if self._stages.get(id(owner)) != key:
+            self._stages[id(owner)] = key
+            self._background = None
+
+    def redraw(self):
+        canvas = self.figure.canvas
+        if self._background is None:
+            scene = tuple(self._stages.items())
+            self._background = self._backgrounds.get(scene)
+        if self._background is None:
+            canvas.draw()  # animated artists are skipped
+            self._background = canvas.copy_from_bbox(self.figure.bbox)
+            if len(self._backgrounds) >= self.max_backgrounds:
+                del self._backgrounds[next(iter(self._backgrounds))]
+            self._backgrounds[scene] = self._background
+            self.full_draws += 1
+        else:
+            canvas.restore_region(self._background)
+            self.blits += 1
+        for artist in self.animated:
+            if artist.get_visible():
+                self.figure.draw_artist(artist)
+        self._show()
+
+    def show(self, png):
+        """Display a frame rendered earlier (e.g. from a cache) without drawing anything."""
+        self.png = png
+        if self._image is not None:
+            self._image.value = png
+
+    def _show(self):
+        canvas = self.figure.canvas
+        if self.canvas_is_widget:
+            canvas.blit(self.figure.bbox)
+            return
+        from PIL import Image
+
+        width, height = canvas.get_width_height(physical=True)
+        frame = Image.frombuffer("RGBA", (width, height), canvas.buffer_rgba(), "raw", "RGBA", 0, 1)
+        png = io.BytesIO()
+        frame.save(png, format="png", compress_level=1)
+        self.png = png.getvalue()
+        if self._image is not None:
+            self._image.value = self.png
+
+
+class TextPool:
+    """Text artists reused across frames: update() moves and relabels as many as needed and hides the rest."""
+
+    def __init__(self, live, ax, **style):
+        self.live = live
+        self.ax = ax
+        self.style = style
+        self.texts = []
+
+    def update(self, xs, ys, strings):
+        count = 0
+        for x, y, string in zip(xs, ys, strings):
+            if count == len(self.texts):
+                text = self.ax.text(0, 0, "", **self.style)
+                self.live.animate(text)
+                self.texts.append(text)
+            text = self.texts[count]
+            text.set_position((x, y))
+            text.set_text(string)
+            text.set_visible(True)
+            count += 1
+        for text in self.texts[count:]:
+            text.set_visible(False)
+
+
+def _fit(ax, xs, ys, pad, equal=False):
+    """Limits around the points; ``equal`` widens one range so both axes share a scale in the fixed axes box."""
+    x0, x1, y0, y1 = min(xs) - pad, max(xs) + pad, min(ys) - pad, max(ys) + pad
+    if equal:
+        box = ax.get_position()
+        width, height = ax.figure.get_size_inches()
+        ratio = (box.height * height) / (box.width * width)
+        if (y1 - y0) < (x1 - x0) * ratio:
+            grow = ((x1 - x0) * ratio - (y1 - y0)) / 2
+            y0, y1 = y0 - grow, y1 + grow
+        else:
+            grow = ((y1 - y0) / ratio - (x1 - x0)) / 2
+            x0, x1 = x0 - grow, x1 + grow
+    ax.set_xlim(x0, x1)
+    ax.set_ylim(y0, y1)
+
+
+class GraphView:
+    """CFGVisualizer graph panel: nonterminal squares, terminal circles, edges and labels, all reused."""
+
+    def __init__(self, live, ax, label_limit=200):
+        from matplotlib.collections import LineCollection
+
+        self.live = live
+        self.ax = ax
+        self.label_limit = label_limit
+        ax.axis("off")
+        empty = np.empty((0, 2))
+        self.edges = LineCollection([], colors="gray", alpha=0.6, zorder=1)
+        ax.add_collection(self.edges)
+        self.nonterminals = ax.scatter(empty[:, 0], empty[:, 1], s=2000, marker="s", c="lightblue", alpha=0.8, zorder=2)
+        self.terminals = ax.scatter(empty[:, 0], empty[:, 1], s=1500, marker="o", c="lightcoral", alpha=0.8, zorder=2)
+        self.title = ax.set_title("", fontsize=16, fontweight="bold")
+        live.animate(self.edges, self.nonterminals, self.terminals, self.title)
+        self.node_labels = TextPool(live, ax, ha="center", va="center", fontsize=12, fontweight="bold", zorder=3)
+        self.edge_labels = TextPool(live, ax, ha="center", va="center", fontsize=8, zorder=3, bbox=dict(boxstyle="round", fc="white", ec="none", alpha=0.8))
+
+    def update(self, graph, pos, title):
+        kinds = dict(graph.nodes(data="node_type"))
+        nodes = list(graph.nodes)
+        self.nonterminals.set_offsets(np.array([pos[node] for node in nodes if kinds[node] == "non_terminal"]).reshape(-1, 2))
+        self.terminals.set_offsets(np.array([pos[node] for node in nodes if kinds[node] != "non_terminal"]).reshape(-1, 2))
+        edges = [(u, v, label) for u, v, label in graph.edges(data="label") if u != v]
+        self.edges.set_segments([(pos[u], pos[v]) for u, v, _ in edges])
+        show = len(nodes) <= self.label_limit
+        self.node_labels.update([pos[node][0] for node in nodes], [pos[node][1] for node in nodes], [str(node) for node in nodes] if show else [])
+        middles = [((pos[u][0] + pos[v][0]) / 2, (pos[u][1] + pos[v][1]) / 2) for u, v, _ in edges]
+        self.edge_labels.update([x for x, _ in middles], [y for _, y in middles], [label or "" for _, _, label in edges] if show else [])
+        self.title.set_text(title)
+        if nodes:
+            _fit(self.ax, [pos[node][0] for node in nodes], [pos[node][1] for node in nodes], 0.6)
+        self.live.redraw()
+
+
+class TreeView:
+    """Syntax-tree panel: the node and edge collections of drawing.draw_tree, updated in place."""
+
+    def __init__(self, live, ax, title="Syntax Tree Structure", label_limit=500):
+        from matplotlib.collections import EllipseCollection, LineCollection
+
+        self.live = live
+        self.ax = ax
+        self.label_limit = label_limit
+        ax.axis("off")
+        ax.set_title(title, fontsize=14, fontweight="bold")
+        self.edges = LineCollection([], colors="black", linewidths=2, zorder=1)
+        self.nodes = EllipseCollection([], [], [], units="xy", offsets=np.empty((0, 2)), offset_transform=ax.transData, edgecolors="black", linewidths=2, zorder=2)
+        ax.add_collection(self.edges)
+        ax.add_collection(self.nodes)
+        live.animate(self.edges, self.nodes)
+        self.labels = TextPool(live, ax, ha="center", va="center", fontsize=12, fontweight="bold", zorder=3)
+
+    def update(self, tree, redraw=True):
+        layout = drawing.tidy_layout(tree)
+        n = len(layout.x)
+        small = n <= self.label_limit
+        diameters = np.full(n, 2 * drawing.RADIUS)
+        self.nodes.set_widths(diameters)
+        self.nodes.set_heights(diameters)
+        self.nodes.set_angles(np.zeros(n))
+        self.nodes.set_offsets(np.column_stack([layout.x, layout.y]))
+        self.nodes.set_facecolors(drawing.node_colors(layout))
+        self.nodes.set_linewidths(2 if small else 0.5)
+        self.edges.set_segments(drawing.edge_segments(layout))
+        self.edges.set_linewidths(2 if small else 0.5)
+        self.labels.update(layout.x, layout.y, layout.labels if small else [])
+        # Equal scales by widening the limits, so the axes box (and the title in the background) stays put.
+        _fit(self.ax, layout.x, layout.y, 2 * drawing.RADIUS, equal=True)
+        if redraw:
+            self.live.redraw()
+        return layout
+
+
+def _nice(value):
+    """Smallest 1, 2 or 5 x 10^k at least 1.1 * value (0 for value <= 0)."""
+    if value <= 0:
+        return 0
+    value *= 1.1
+    scale = 10 ** np.floor(np.log10(value))
+    return next(step * scale for step in (1, 2, 5, 10) if step * scale >= value)
+
+
+class BarView:
+    """Bar-chart panel whose bars are reused; axes are re-rendered only when the limits or categories change.
+
+    ``capacity`` bars are made up front; the pool grows when more values arrive.
+    """
+
+    def __init__(self, live, ax, ylabel="Values", capacity=8):
+        self.live = live
+        self.ax = ax
+        ax.set_ylabel(ylabel)
+        self.bars = list(ax.bar(range(capacity), [0] * capacity, alpha=0.7))
+        self.title = ax.set_title("", fontweight="bold")
+        live.animate(*self.bars, self.title)
+        self.key = None
+
+    def update(self, labels, values, color, title, redraw=True):
+        labels = [str(label) for label in labels]
+        if max(len(labels), len(values)) > len(self.bars):
+            self._grow(max(len(labels), len(values)))
+        for index, bar in enumerate(self.bars):
+            if index < len(values):
+                bar.set_height(values[index] if np.isfinite(values[index]) else 0)
+                bar.set_color(color)
+                bar.set_visible(True)
+            else:
+                bar.set_visible(False)
+        self.title.set_text(title)
+        finite = [value for value in values if np.isfinite(value)]
+        # Static parts: tick labels and limits, rounded up to 1, 2 or 5 x 10^k so nearby values keep the background.
+        top = _nice(max(finite, default=0))
+        bottom = -_nice(-min(finite, default=0))
+        key = (tuple(labels), bottom, top)
+        if key != self.key:
+            self.key = key
+            self.ax.set_xticks(range(len(labels)), labels, rotation=45)
+            self.ax.set_xlim(-0.6, max(len(labels), 1) - 0.4)
+            self.ax.set_ylim(bottom, top)
+            self.live.stage(self, key)
+        if redraw:
+            self.live.redraw()
+
+    def _grow(self, count):
+        """Add bars for at least ``count`` values, doubling the pool as TextPool adds texts as needed."""
+        start = len(self.bars)
+        count = max(count, 2 * start)
+        bars = list(self.ax.bar(range(start, count), [0] * (count - start), alpha=0.7))
+        self.live.animate(*bars)
+        self.bars.extend(bars)
+        # ax.bar may autoscale the axes, so the limits are set again and cached backgrounds dropped.
+        self.key = None
+        self.live.invalidate()
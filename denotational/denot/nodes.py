@@ -0,0 +1,177 @@
+"""
+Hash-consed expression nodes.
+
+``NodeStore`` interns Number, Variable and BinaryOp nodes so structurally
+identical subtrees are the same object. Converting a batch of dict ASTs into
+one store turns them into a DAG in which every distinct subexpression exists
+once. Nodes use ``__slots__`` and carry a store-wide integer ``id``, which
+``evaluate`` uses to memoize each node's value within one environment.
+
+``from_dict`` / ``to_dict`` convert to and from the notebooks' dict format,
+so the existing visualizers keep working.
+"""
+
+from .evaluator import apply_op
+
+
+class Node:
+    __slots__ = ("id",)
+
+
+class Number(Node):
+    __slots__ = ("value",)
+    type = "Number"
+
+    def __init__(self, node_id, value):
+        self.id = node_id
+        self.value = value
+
+    def __repr__(self):
+        return f"Number({self.value!r})"
+
+
+class Variable(Node):
+    __slots__ = ("name",)
+    type = "Variable"
+
+    def __init__(self, node_id, name):
+        self.id = node_id
+        self.name = name
+
+    def __repr__(self):
+        return f"Variable({self.name!r})"
+
+
+class BinaryOp(Node):
+    __slots__ = ("op", "left", "right")
+    type = "BinaryOp"
+
+    def __init__(self, node_id, op, left, right):
+        self.id = node_id
+        self.op = op
+        self.left = left
+        self.right = right
+
+    def __repr__(self):
+        return f"BinaryOp({self.op!r}, #{self.left.id}, #{self.right.id})"
+
+
+def _number_key(value):
+    # repr keeps 1 / 1.0 / True, 0.0 / -0.0 and nan apart.
+    return ("Number", type(value), value if type(value) is int else repr(value))
+
+
+class NodeStore:
+    """Intern table that hands out one shared node per distinct subexpression."""
+
+    def __init__(self):
+        self._table = {}
+        self.nodes = []
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _intern(self, key, factory, *fields):
+        node = self._table.get(key)
+        if node is None:
+            node = factory(len(self.nodes), *fields)
+            self._table[key] = node
+            self.nodes.append(node)
+        return node
+
+    def number(self, value):
+        return self._intern(_number_key(value), Number, value)
+
+    def variable(self, name):
+        return self._intern(("Variable", name), Variable, name)
+
+    def binary_op(self, op, left, right):
+        # Children are already interned, so identity is structural equality.
+        return self._intern((op, left.id, right.id), BinaryOp, op, left, right)
+
+    def from_dict(self, tree):
+        """Intern a dict AST, returning its root node."""
+        built = []
+        work = [tree]
+        while work:
+            node = work.pop()
+            if type(node) is str:
+                right = built.pop()
+                built[-1] = self.binary_op(node, built[-1], right)
+            elif node["type"] == "BinaryOp":
+                work.append(node["op"])
+                work.append(node["right"])
+                work.append(node["left"])
+            elif node["type"] == "Number":
+                built.append(self.number(node["value"]))
+            elif node["type"] == "Variable":
+                built.append(self.variable(node["name"]))
+            else:
+                # Unknown node types evaluate to 0 in evaluate_tree.
+                built.append(self.number(0))
+        return built[0]
+
+
+def to_dict(node, memo=None):
+    """Convert a node back to the dict format; shared subtrees share one dict."""
+    if memo is None:
+        memo = {}
+    work = [node]
+    while work:
+        current = work[-1]
+        if current.id in memo:
+            work.pop()
+            continue
+        if type(current) is BinaryOp:
+            missing = [child for child in (current.right, current.left) if child.id not in memo]
+            if missing:
+                work.extend(missing)
+                continue
+            memo[current.id] = {"type": "BinaryOp", "op": current.op, "left": memo[current.left.id], "right": memo[current.right.id]}
+        elif type(current) is Number:
+            memo[current.id] = {"type": "Number", "value": current.value}
+        else:
+            memo[current.id] = {"type": "Variable", "name": current.name}
+        work.pop()
+    return memo[node.id]
+
+
+def evaluate(node, variables=None, memo=None):
+    """Evaluate a node, computing every shared subexpression once.
+
+    ``memo`` maps node ids to values for one environment; pass the same dict
+    when evaluating several roots of a batch under the same ``variables``.
+    """
+    if variables is None:
+        variables = {}
+    if memo is None:
+        memo = {}
+    work = [node]
+    while work:
+        current = work[-1]
+        key = current.id
+        if key in memo:
+            work.pop()
+            continue
+        cls = type(current)
+        if cls is BinaryOp:
+            left, right = current.left, current.right
+            if left.id not in memo or right.id not in memo:
+                if right.id not in memo:
+                    work.append(right)
+                if left.id not in memo:
+                    work.append(left)
+                continue
+            memo[key] = apply_op(current.op, memo[left.id], memo[right.id])
+        elif cls is Number:
+            memo[key] = current.value
+        else:
+            memo[key] = variables.get(current.name, 0)
+        work.pop()
+    return memo[node.id]
+
+
+def evaluate_all(roots, variables=None):
+    """Evaluate a batch of roots under one environment with a shared memo."""
+    memo = {}
+    return [evaluate(root, variables, memo) for root in roots]
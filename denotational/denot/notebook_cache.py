@@ -0,0 +1,346 @@
+"""
+Content-hash execution cache for the book's notebooks.
+
+``_config.yml`` sets ``execute_notebooks: force``, so a plain build
+re-executes every notebook. ``python -m denot.notebook_cache --build`` is
+the cached build mode instead. It keys each notebook's executed outputs on
+a hash of everything that can change them:
+
+    its code cells and kernel name;
+    the kernel environment (the requirements.txt files);
+    every local module it imports, followed transitively through the
+    modules' own imports (``from denot import live`` pulls in live.py,
+    drawing.py, ...);
+    the environment variables that change what the notebooks draw
+    (``DENOT_STATIC_WIDGETS``).
+
+Notebooks whose key is in the cache are not executed; the others are run
+with nbclient and stored. The assets a notebook's page refers to (the
+precomputed widget frames) are stored with it and restored on a hit. They
+are recorded by ``AssetStore.put`` through ``DENOT_ASSET_LOG`` (see
+precompute.py), including frames another notebook already wrote in the same
+run, and are not copied from the source tree, so every cached execution
+carries all of its own. The sources are never modified: the book is copied to
+``_build/.staged`` with the executed notebooks and ``execute_notebooks:
+off``, and Jupyter Book builds that copy into the usual ``_build/html``.
+The report lists every notebook as a hit or a miss with its execution time,
+and the seconds saved by the hits. A notebook that fails to execute makes
+the run exit with status 1, before building, unless ``--allow-errors`` is
+given.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .precompute import ASSET_DIR, ASSET_LOG
+
+ENV_VARS = ("DENOT_STATIC_WIDGETS",)
+SKIP_DIRS = {"_build", ".ipynb_checkpoints", "__pycache__", ".git"}
+KEY_VERSION = "1"
+
+
+def _code(source):
+    """Cell source without IPython magics and shell escapes, which ast cannot parse."""
+    return "\n".join("" if line.lstrip().startswith(("%", "!")) else line for line in source.splitlines())
+
+
+def _module_file(root, name):
+    """The .py file of a dotted module name under ``root``, or None if it is not local."""
+    path = os.path.join(root, *name.split("."))
+    for candidate in (path + ".py", os.path.join(path, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _imported_names(tree, package):
+    """Dotted names a module may import: every prefix, and ``from x import y`` as x.y too."""
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package.split(".") if package else []
+                base = base[: len(base) - node.level + 1]
+                module = ".".join(base + ([node.module] if node.module else []))
+            else:
+                module = node.module or ""
+            if module:
+                names.append(module)
+            names.extend(f"{module}.{alias.name}" if module else alias.name for alias in node.names)
+    prefixes = []
+    for name in names:
+        parts = name.split(".")
+        prefixes.extend(".".join(parts[: i + 1]) for i in range(len(parts)))
+    return prefixes
+
+
+def local_modules(sources, root):
+    """Sorted paths of the modules under ``root`` that the code cells import, directly or not."""
+    found = {}
+    stack = []
+    for source in sources:
+        try:
+            stack.extend(_imported_names(ast.parse(_code(source)), ""))
+        except SyntaxError:
+            continue
+    while stack:
+        name = stack.pop()
+        if name in found:
+            continue
+        path = _module_file(root, name)
+        found[name] = path
+        if path is None:
+            continue
+        package = name if path.endswith("__init__.py") else name.rpartition(".")[0]
+        with open(path, encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        stack.extend(_imported_names(tree, package))
+    return sorted(path for path in found.values() if path)
+
+
+def notebook_key(notebook, root, requirements=()):
+    """SHA-256 over a notebook's code cells, kernel, requirements, imported local modules and ENV_VARS."""
+    sources = ["".join(cell["source"]) for cell in notebook["cells"] if cell["cell_type"] == "code"]
+    digest = hashlib.sha256()
+
+    def add(label, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest.update(f"{label}\0{len(data)}\0".encode("utf-8"))
+        digest.update(data)
+
+    add("version", KEY_VERSION)
+    add("kernel", notebook.get("metadata", {}).get("kernelspec", {}).get("name", ""))
+    for source in sources:
+        add("cell", source)
+    for path in requirements:
+        with open(path, "rb") as f:
+            add("requirements", f.read())
+    for path in local_modules(sources, root):
+        with open(path, "rb") as f:
+            add(os.path.relpath(path, root), f.read())
+    for name in ENV_VARS:
+        add(name, os.environ.get(name, ""))
+    return digest.hexdigest()
+
+
+def _recorded_assets(log, static):
+    """Paths under ``static``, relative to it, of the assets listed in an ASSET_LOG file."""
+    try:
+        with open(log, encoding="utf-8") as f:
+            paths = f.read().split("\n")
+    except OSError:
+        return []
+    names = {os.path.relpath(path, static) for path in paths if path}
+    return sorted(name for name in names if not name.startswith(os.pardir + os.sep))
+
+
+class NotebookCache:
+    """Executed notebooks in ``directory`` as <key>.ipynb, with their side files and an index.json."""
+
+    def __init__(self, directory, keep=3):
+        self.directory = directory
+        self.keep = keep
+        self.index_path = os.path.join(directory, "index.json")
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def get(self, key):
+        """The index entry of ``key`` (notebook, seconds, files), or None if it was never stored."""
+        entry = self.index.get(key)
+        if entry is None or not os.path.exists(os.path.join(self.directory, key + ".ipynb")):
+            return None
+        entry["used"] = time.time()
+        return entry
+
+    def load(self, key):
+        with open(os.path.join(self.directory, key + ".ipynb"), encoding="utf-8") as f:
+            return f.read()
+
+    def restore_files(self, key, target):
+        """Copy the side files stored with ``key`` back under ``target``."""
+        for name in self.index[key]["files"]:
+            destination = os.path.join(target, name)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(os.path.join(self.directory, key + ".files", name), destination)
+
+    def put(self, key, notebook_name, text, seconds, files=(), source_dir=None):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, key + ".ipynb"), "w", encoding="utf-8") as f:
+            f.write(text)
+        for name in files:
+            destination = os.path.join(self.directory, key + ".files", name)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            shutil.copy2(os.path.join(source_dir, name), destination)
+        self.index[key] = {"notebook": notebook_name, "seconds": seconds, "files": sorted(files), "used": time.time()}
+
+    def save(self):
+        """Drop all but the ``keep`` most recently used entries of each notebook, then write the index."""
+        by_notebook = {}
+        for key, entry in self.index.items():
+            by_notebook.setdefault(entry["notebook"], []).append(key)
+        for keys in by_notebook.values():
+            keys.sort(key=lambda key: self.index[key]["used"], reverse=True)
+            for key in keys[self.keep :]:
+                del self.index[key]
+                for path in (os.path.join(self.directory, key + ".ipynb"), os.path.join(self.directory, key + ".files")):
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    elif os.path.exists(path):
+                        os.remove(path)
+        os.makedirs(self.directory, exist_ok=True)
+        partial = self.index_path + ".tmp"
+        with open(partial, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(partial, self.index_path)
+
+
+def execute(path, timeout, kernel_name=None):
+    """Run a notebook in its own directory with nbclient; returns the executed notebook as JSON text."""
+    import nbformat
+    from nbclient import NotebookClient
+
+    notebook = nbformat.read(path, as_version=4)
+    kernel_name = kernel_name or notebook.metadata.get("kernelspec", {}).get("name", "python3")
+    NotebookClient(notebook, timeout=timeout, kernel_name=kernel_name, resources={"metadata": {"path": os.path.dirname(path) or "."}}).execute()
+    return nbformat.writes(notebook)
+
+
+def book_notebooks(book):
+    """Relative paths of the .ipynb files of a book, outside _build and checkpoints."""
+    found = []
+    for parent, dirs, names in os.walk(book):
+        dirs[:] = sorted(name for name in dirs if name not in SKIP_DIRS)
+        found.extend(os.path.relpath(os.path.join(parent, name), book) for name in sorted(names) if name.endswith(".ipynb"))
+    return found
+
+
+def book_config(book):
+    import yaml
+
+    with open(os.path.join(book, "_config.yml"), encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def stage(book, staged, cache, requirements=(), timeout=None, kernel_name=None, log=print):
+    """Copy ``book`` to ``staged`` with every notebook executed or taken from ``cache``; returns report rows.
+
+    Rows are (notebook, status, seconds): "hit" with the stored execution
+    time (saved), "miss" with the time just spent, or "error" when the
+    notebook failed (it is staged unexecuted and not cached).
+    """
+    config = book_config(book)
+    execute_config = config.setdefault("execute", {})
+    if timeout is None:
+        timeout = execute_config.get("timeout", 300)
+    if os.path.exists(staged):
+        shutil.rmtree(staged)
+    # Generated assets come from executions or the cache only, so each cached notebook stores all of its own.
+    generated = os.path.join(book, ASSET_DIR)
+    shutil.copytree(book, staged, ignore=lambda parent, names: [name for name in names if name in SKIP_DIRS or os.path.join(parent, name) == generated])
+    static = os.path.join(staged, "_static")
+    rows = []
+    for name in book_notebooks(staged):
+        path = os.path.join(staged, name)
+        with open(path, encoding="utf-8") as f:
+            notebook = json.load(f)
+        key = notebook_key(notebook, os.path.dirname(path), requirements)
+        entry = cache.get(key)
+        if entry is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(cache.load(key))
+            cache.restore_files(key, static)
+            rows.append((name, "hit", entry["seconds"]))
+            log(f"hit   {name} (saved {entry['seconds']:.1f}s)")
+            continue
+        # The kernel inherits the environment, so the notebook's AssetStore lists its assets here.
+        descriptor, asset_log = tempfile.mkstemp(suffix=".assets")
+        os.close(descriptor)
+        previous = os.environ.get(ASSET_LOG)
+        os.environ[ASSET_LOG] = asset_log
+        start = time.perf_counter()
+        try:
+            text = execute(path, timeout, kernel_name)
+        except Exception as error:  # a failing notebook is reported and built as it is, like jupyter-book does
+            rows.append((name, "error", time.perf_counter() - start))
+            log(f"error {name}: {type(error).__name__}: {str(error).strip().splitlines()[-1] if str(error).strip() else ''}")
+            continue
+        finally:
+            if previous is None:
+                del os.environ[ASSET_LOG]
+            else:
+                os.environ[ASSET_LOG] = previous
+            files = _recorded_assets(asset_log, static)
+            os.remove(asset_log)
+        seconds = time.perf_counter() - start
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        cache.put(key, name, text, seconds, files, static)
+        rows.append((name, "miss", seconds))
+        log(f"miss  {name} ({seconds:.1f}s)")
+    cache.save()
+    execute_config["execute_notebooks"] = "off"
+    import yaml
+
+    with open(os.path.join(staged, "_config.yml"), "w", encoding="utf-8") as f:
+        yaml.safe_dump(config, f, sort_keys=False, allow_unicode=True)
+    return rows
+
+
+def report(rows):
+    """Report lines: one per notebook, then hits, misses and seconds saved."""
+    lines = [f"{'notebook':<32} {'status':>6} {'seconds':>8}"]
+    lines.extend(f"{name:<32} {status:>6} {seconds:>8.1f}" for name, status, seconds in rows)
+    hits = [seconds for _, status, seconds in rows if status == "hit"]
+    misses = [seconds for _, status, seconds in rows if status != "hit"]
+    lines.append(f"{len(rows)} notebooks: {len(hits)} hits, {len(misses)} misses, {sum(hits):.1f}s saved, {sum(misses):.1f}s executing")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m denot.notebook_cache", description="Execute the book's notebooks through a content-hash cache, then optionally build it.")
+    parser.add_argument("book", nargs="?", default=".", help="book directory (with _config.yml)")
+    parser.add_argument("--cache-dir", default=None, help="cache directory (default: BOOK/_build/.notebook_cache)")
+    parser.add_argument("--staged", default=None, help="where the executed copy of the book goes (default: BOOK/_build/.staged)")
+    parser.add_argument("--requirements", nargs="*", default=None, help="requirements files in the key (default: requirements.txt in BOOK and its parent)")
+    parser.add_argument("--timeout", type=int, default=None, help="per-cell timeout in seconds (default: execute.timeout in _config.yml)")
+    parser.add_argument("--keep", type=int, default=3, help="cached executions kept per notebook")
+    parser.add_argument("--build", action="store_true", help="run jupyter-book on the staged copy, into BOOK/_build")
+    parser.add_argument("--allow-errors", action="store_true", help="stage and build notebooks that fail to execute instead of exiting with status 1")
+    args = parser.parse_args(argv)
+
+    book = os.path.abspath(args.book)
+    cache_dir = args.cache_dir or os.path.join(book, "_build", ".notebook_cache")
+    staged = args.staged or os.path.join(book, "_build", ".staged")
+    requirements = args.requirements
+    if requirements is None:
+        candidates = [os.path.join(book, "requirements.txt"), os.path.join(os.path.dirname(book), "requirements.txt")]
+        requirements = [path for path in candidates if os.path.isfile(path)]
+    rows = stage(book, staged, NotebookCache(cache_dir, args.keep), requirements, args.timeout)
+    for line in report(rows):
+        print(line)
+    failed = [name for name, status, _ in rows if status == "error"]
+    if failed and not args.allow_errors:
+        # A failed notebook would be published without outputs; stop before building it.
+        print(f"{len(failed)} notebooks failed to execute: {', '.join(failed)} (pass --allow-errors to build anyway)", file=sys.stderr)
+        return 1
+    if args.build:
+        return subprocess.call(["jupyter-book", "build", staged, "--path-output", book])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Constant folding and partial evaluation of SyntaxTreeBuilder dict ASTs.
+
+``fold_constants`` evaluates every BinaryOp whose operands are both Numbers
+(with the usual division-by-zero -> inf rule, so ``1/0`` folds to
+``Number(inf)``) and applies the identities
+
+    x * 1 = 1 * x = x      x + 0 = 0 + x = x      x - 0 = x
+
+for integer 0 and 1 constants (``x + 0`` keeps a float ``-0.0`` where
+evaluation would give ``0.0``; the two compare equal). ``x * 0`` and
+``0 * x`` fold to 0 only with ``assume_finite=True`` and when x contains no
+division, because an infinite x makes the product nan. ``x / 1`` is never rewritten: for an integer x it
+would turn a float result into an int.
+
+``specialize`` substitutes a partial environment and folds the result,
+giving a residual AST over the remaining free variables. For any ``rest``
+environment that does not rebind those names,
+
+    evaluate_tree(specialize(tree, env), rest) == evaluate_tree(tree, {**env, **rest})
+
+Both passes return new trees and never modify their input; untouched
+subtrees are shared with it.
+"""
+
+from .evaluator import apply_op
+
+
+def _is_number(node, value=None):
+    if node["type"] != "Number":
+        return False
+    return value is None or (type(node["value"]) is int and node["value"] == value)
+
+
+def _has_division(tree):
+    work = [tree]
+    while work:
+        node = work.pop()
+        if node["type"] == "BinaryOp":
+            if node["op"] == "/":
+                return True
+            work.append(node["left"])
+            work.append(node["right"])
+    return False
+
+
+def _simplify(op, left, right, assume_finite):
+    """Fold one BinaryOp whose children are already folded, or return None."""
+    if _is_number(left) and _is_number(right):
+        return {"type": "Number", "value": apply_op(op, left["value"], right["value"])}
+    if op == "*":
+        if _is_number(right, 1):
+            return left
+        if _is_number(left, 1):
+            return right
+        if assume_finite and _is_number(right, 0) and not _has_division(left):
+            return right
+        if assume_finite and _is_number(left, 0) and not _has_division(right):
+            return left
+    elif op == "+":
+        if _is_number(right, 0):
+            return left
+        if _is_number(left, 0):
+            return right
+    elif op == "-":
+        if _is_number(right, 0):
+            return left
+    return None
+
+
+def _rewrite(tree, leaf, assume_finite):
+    """Rebuild ``tree`` bottom-up, mapping leaves through ``leaf`` and folding BinaryOps."""
+    built = []
+    work = [tree]
+    while work:
+        node = work.pop()
+        if type(node) is tuple:
+            original = node[0]
+            right = built.pop()
+            left = built.pop()
+            if left is original["left"] and right is original["right"]:
+                rebuilt = original
+            else:
+                rebuilt = {"type": "BinaryOp", "op": original["op"], "left": left, "right": right}
+            folded = _simplify(original["op"], left, right, assume_finite)
+            built.append(folded if folded is not None else rebuilt)
+        elif node["type"] == "BinaryOp":
+            work.append((node,))
+            work.append(node["right"])
+            work.append(node["left"])
+        else:
+            built.append(leaf(node))
+    return built[0]
+
+
+def fold_constants(tree, assume_finite=False):
+    """Return an equivalent tree with constant subexpressions folded."""
+    return _rewrite(tree, lambda node: node, assume_finite)
+
+
+def specialize(tree, env, assume_finite=False):
+    """Partially evaluate ``tree`` for the variables bound in ``env``."""
+
+    def leaf(node):
+        if node["type"] == "Variable" and node["name"] in env:
+            return {"type": "Number", "value": env[node["name"]]}
+        return node
+
+    return _rewrite(tree, leaf, assume_finite)
+
+
+def count_nodes(tree):
+    """Number of nodes in a dict AST."""
+    count = 0
+    work = [tree]
+    while work:
+        node = work.pop()
+        count += 1
+        if node["type"] == "BinaryOp":
+            work.append(node["left"])
+            work.append(node["right"])
+    return count
@@ -0,0 +1,253 @@
+"""
+Tokenizer and precedence-climbing (Pratt) parser for the arithmetic
+expression language used by SyntaxTreeBuilder.
+
+The parser produces the same dict AST as the notebooks:
+
+    {'type': 'BinaryOp', 'op': '+', 'left': ..., 'right': ...}
+    {'type': 'Number', 'value': 3}
+    {'type': 'Variable', 'name': 'x'}
+
+The input is scanned once and every token is consumed exactly once, so
+parsing is O(n) in the length of the expression. The recursive parser only
+recurses on parenthesis nesting; ``iterative=True`` selects a shunting-yard
+parser with explicit stacks that handles arbitrarily deep nesting.
+"""
+
+import re
+from collections import namedtuple
+
+NUMBER = "NUMBER"
+NAME = "NAME"
+OP = "OP"
+LPAREN = "LPAREN"
+RPAREN = "RPAREN"
+
+# Binding power of each binary operator; all operators are left-associative.
+BINDING_POWER = {"+": 10, "-": 10, "*": 20, "/": 20}
+
+Token = namedtuple("Token", ["kind", "text", "start", "end"])
+
+_TOKEN_RE = re.compile(r"[0-9]+(?:\.[0-9]+)?|[A-Za-z_][A-Za-z_0-9]*|\S")
+_PUNCTUATION = {"+": OP, "-": OP, "*": OP, "/": OP, "(": LPAREN, ")": RPAREN}
+
+
+class ParseError(ValueError):
+    """Raised when an expression cannot be tokenized or parsed."""
+
+    def __init__(self, message, position=None):
+        if position is not None:
+            message = f"{message} at position {position}"
+        super().__init__(message)
+        self.position = position
+
+
+class _Failure(Exception):
+    """Internal parse failure carrying a token index instead of a position."""
+
+    def __init__(self, message, index):
+        super().__init__(message)
+        self.message = message
+        self.index = index
+
+
+def token_kind(text):
+    """Classify a token's text, returning None for an invalid character."""
+    kind = _PUNCTUATION.get(text)
+    if kind is not None:
+        return kind
+    first = text[0]
+    if "0" <= first <= "9":
+        return NUMBER
+    if first == "_" or (first.isascii() and first.isalpha()):
+        return NAME
+    return None
+
+
+def number_value(text, index=None):
+    """Value of a NUMBER token.
+
+    int() refuses literals past Python's digit limit (4300 by default); that
+    is a ParseError, or a _Failure at token ``index`` inside the parsers.
+    """
+    try:
+        return float(text) if "." in text else int(text)
+    except ValueError:
+        message = f"Number literal of {len(text)} characters is too long"
+        if index is None:
+            raise ParseError(message) from None
+        raise _Failure(message, index) from None
+
+
+def tokenize(expr):
+    """Split an expression into a list of Tokens with source spans."""
+    tokens = []
+    for match in _TOKEN_RE.finditer(expr):
+        text = match.group()
+        kind = token_kind(text)
+        if kind is None:
+            raise ParseError(f"Unexpected character {text!r}", match.start())
+        tokens.append(Token(kind, text, match.start(), match.end()))
+    return tokens
+
+
+def token_texts(expr):
+    """Split an expression into token strings without recording spans."""
+    return _TOKEN_RE.findall(expr)
+
+
+class _Parser:
+    """Precedence-climbing parser over a list of token strings."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.pos = 0
+
+    def peek(self):
+        pos = self.pos
+        return self.texts[pos] if pos < len(self.texts) else None
+
+    def parse(self):
+        tree = self.expression(0)
+        text = self.peek()
+        if text is not None:
+            raise _Failure(f"Unexpected {text!r}", self.pos)
+        return tree
+
+    def expression(self, min_power):
+        left = self.operand()
+        while True:
+            power = BINDING_POWER.get(self.peek())
+            if power is None or power <= min_power:
+                return left
+            op = self.texts[self.pos]
+            self.pos += 1
+            right = self.expression(power)
+            left = {"type": "BinaryOp", "op": op, "left": left, "right": right}
+
+    def operand(self):
+        text = self.peek()
+        if text is None:
+            raise _Failure("Unexpected end of expression", self.pos)
+        kind = token_kind(text)
+        self.pos += 1
+        if kind == NUMBER:
+            return {"type": "Number", "value": number_value(text, self.pos - 1)}
+        if kind == NAME:
+            return {"type": "Variable", "name": text}
+        if kind == LPAREN:
+            tree = self.expression(0)
+            if self.peek() != ")":
+                raise _Failure("Expected ')'", self.pos)
+            self.pos += 1
+            return tree
+        if text == "-":
+            # Unary minus: fold into a negative literal, otherwise read as 0 - operand.
+            operand = self.operand()
+            if operand["type"] == "Number":
+                return {"type": "Number", "value": -operand["value"]}
+            return {"type": "BinaryOp", "op": "-", "left": {"type": "Number", "value": 0}, "right": operand}
+        raise _Failure(f"Unexpected {text!r}", self.pos - 1)
+
+
+_UNARY_MINUS = "u-"
+
+
+class _IterativeParser:
+    """Shunting-yard parser producing the same AST as _Parser without recursion."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.operands = []
+        # Pending operators: '(' markers, _UNARY_MINUS markers and binary operators.
+        self.operators = []
+        self.open_parens = 0
+
+    def reduce(self):
+        right = self.operands.pop()
+        left = self.operands.pop()
+        self.operands.append({"type": "BinaryOp", "op": self.operators.pop(), "left": left, "right": right})
+
+    def finish_operand(self, node):
+        """Push a completed primary and apply any unary minus waiting for it."""
+        operators = self.operators
+        while operators and operators[-1] == _UNARY_MINUS:
+            operators.pop()
+            if node["type"] == "Number":
+                node = {"type": "Number", "value": -node["value"]}
+            else:
+                node = {"type": "BinaryOp", "op": "-", "left": {"type": "Number", "value": 0}, "right": node}
+        self.operands.append(node)
+
+    def parse(self):
+        operators = self.operators
+        expect_operand = True
+        for index, text in enumerate(self.texts):
+            if expect_operand:
+                kind = token_kind(text)
+                if kind == NUMBER:
+                    self.finish_operand({"type": "Number", "value": number_value(text, index)})
+                    expect_operand = False
+                elif kind == NAME:
+                    self.finish_operand({"type": "Variable", "name": text})
+                    expect_operand = False
+                elif kind == LPAREN:
+                    operators.append("(")
+                    self.open_parens += 1
+                elif text == "-":
+                    operators.append(_UNARY_MINUS)
+                else:
+                    raise _Failure(f"Unexpected {text!r}", index)
+            else:
+                power = BINDING_POWER.get(text)
+                if power is not None:
+                    while operators and BINDING_POWER.get(operators[-1], 0) >= power:
+                        self.reduce()
+                    operators.append(text)
+                    expect_operand = True
+                elif text == ")" and self.open_parens:
+                    while operators[-1] != "(":
+                        self.reduce()
+                    operators.pop()
+                    self.open_parens -= 1
+                    self.finish_operand(self.operands.pop())
+                elif self.open_parens:
+                    raise _Failure("Expected ')'", index)
+                else:
+                    raise _Failure(f"Unexpected {text!r}", index)
+        if expect_operand:
+            raise _Failure("Unexpected end of expression", len(self.texts))
+        if self.open_parens:
+            raise _Failure("Expected ')'", len(self.texts))
+        while operators:
+            self.reduce()
+        return self.operands.pop()
+
+
+def _position(expr, index):
+    """Map a token index back to a character offset in ``expr``."""
+    for i, match in enumerate(_TOKEN_RE.finditer(expr)):
+        if i == index:
+            return match.start()
+    return len(expr)
+
+
+def _parser(texts, iterative):
+    return _IterativeParser(texts) if iterative else _Parser(texts)
+
+
+def parse_tokens(tokens, iterative=False):
+    """Parse a list of Tokens produced by tokenize() into a dict AST."""
+    try:
+        return _parser([token.text for token in tokens], iterative).parse()
+    except _Failure as failure:
+        position = tokens[failure.index].start if failure.index < len(tokens) else (tokens[-1].end if tokens else 0)
+        raise ParseError(failure.message, position) from None
+
+
+def parse_expression(expr, iterative=False):
+    """Parse an arithmetic expression string into a dict AST."""
+    try:
+        return _parser(token_texts(expr), iterative).parse()
+    except _Failure as failure:
+        raise ParseError(failure.message, _position(expr, failure.index)) from None
@@ -0,0 +1,155 @@
+"""
+Widget states rendered at build time, so the static book stays interactive.
+
+The published book has no kernel, so the Dropdown widgets in
+interactive-demos.ipynb do nothing there. Their option spaces are small and
+finite (4 grammars, 3 constructs), so the build renders every state instead:
+``precompute_states`` calls the widget's own render function once per
+option and keeps the frame (PNG) and the printed text.
+
+``AssetStore`` writes the frames into the book's ``_static`` directory,
+which Sphinx copies next to the pages with the same layout, and links them
+relative to the page's own directory, so pages in subdirectories find them
+too. Files are content-addressed: a file is named after the SHA-256 of its
+bytes, so identical frames (two options drawing the same figure, or the
+same state across rebuilds) are one file, written once, and can be cached
+by browsers forever. Texts are deduplicated the same way inside the page.
+``switcher_html`` returns a <select> with a small script that swaps the
+<img> and <pre> from an embedded manifest, with no server and no kernel.
+
+When ``DENOT_ASSET_LOG`` names a file, ``AssetStore.put`` appends the
+absolute path of every asset it returns to it, whether it wrote the file or
+found it already there; notebook_cache.py reads it to know exactly which
+assets an execution's page refers to.
+
+The notebooks only do this when ``DENOT_STATIC_WIDGETS=1`` is set, as the
+book build does (build.sh, the deploy workflow); a live session just shows
+the widgets. Free-text widgets (the expression box) have no finite option
+space and stay live-only.
+"""
+
+import hashlib
+import html
+import io
+import itertools
+import json
+import os
+from contextlib import redirect_stdout
+
+ASSET_DIR = os.path.join("_static", "widget-states")
+ASSET_LOG = "DENOT_ASSET_LOG"
+
+_ids = itertools.count()
+
+
+def enabled():
+    """Whether this run is a book build that should embed precomputed widget states."""
+    return os.environ.get("DENOT_STATIC_WIDGETS") == "1"
+
+
+def content_name(data, suffix=""):
+    """Content address of bytes or text: the first 16 hex digits of its SHA-256."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()[:16] + suffix
+
+
+def book_root(start):
+    """The nearest directory from ``start`` upwards holding _config.yml (``start`` itself if none does)."""
+    directory = os.path.abspath(start)
+    while not os.path.isfile(os.path.join(directory, "_config.yml")):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return os.path.abspath(start)
+        directory = parent
+    return directory
+
+
+class AssetStore:
+    """Content-addressed files in ``directory``, referenced from pages as ``url_prefix``/name.
+
+    By default the files go to ASSET_DIR under the book root, and
+    ``url_prefix`` is that directory relative to ``page_dir`` (the
+    notebook's directory, where it runs), so pages in subdirectories get
+    ``../_static/...``.
+    """
+
+    def __init__(self, directory=None, url_prefix=None, page_dir=None):
+        page_dir = os.path.abspath(os.getcwd() if page_dir is None else page_dir)
+        if directory is None:
+            directory = os.path.join(book_root(page_dir), ASSET_DIR)
+        self.directory = directory
+        if url_prefix is None:
+            url_prefix = os.path.relpath(os.path.abspath(directory), page_dir).replace(os.sep, "/")
+        self.url_prefix = url_prefix
+        self.written = 0
+        self.reused = 0
+
+    def put(self, data, suffix=""):
+        """Store ``data`` (bytes) unless a file with its hash exists; returns its URL."""
+        name = content_name(data, suffix)
+        path = os.path.join(self.directory, name)
+        if os.path.exists(path):
+            self.reused += 1
+        else:
+            os.makedirs(self.directory, exist_ok=True)
+            partial = f"{path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as f:
+                f.write(data)
+            os.replace(partial, path)  # readers never see half a file
+            self.written += 1
+        log = os.environ.get(ASSET_LOG)
+        if log:
+            # Every asset the page uses, new or already on disk, for notebook_cache to store with it.
+            with open(log, "a", encoding="utf-8") as f:
+                f.write(os.path.abspath(path) + "\n")
+        return f"{self.url_prefix}/{name}"
+
+
+def precompute_states(store, options, render):
+    """Manifest of every option: render(option) draws the state and returns its PNG; what it prints is the state's text.
+
+    Images go to ``store``; texts are kept once per distinct content in
+    ``texts`` and referenced by hash from ``states``.
+    """
+    states = {}
+    texts = {}
+    for option in options:
+        printed = io.StringIO()
+        with redirect_stdout(printed):
+            png = render(option)
+        text = printed.getvalue()
+        key = content_name(text)
+        texts.setdefault(key, text)
+        states[str(option)] = {"image": store.put(png, ".png"), "text": key}
+    return {"states": states, "texts": texts}
+
+
+def switcher_html(description, manifest, value=None):
+    """A kernel-free stand-in for a Dropdown: <select>, <img> and <pre> swapped by a few lines of JavaScript."""
+    states = manifest["states"]
+    value = str(value) if value is not None else next(iter(states))
+    element = f"denot-states-{next(_ids)}"
+    options = "".join(f'<option{" selected" if option == value else ""}>{html.escape(option)}</option>' for option in states)
+    first = states[value]
+    # "</" cannot appear inside <script>, so slashes in the JSON are escaped.
+    data = json.dumps(manifest, ensure_ascii=False).replace("</", "<\\/")
+    return f"""<div id="{element}" class="denot-states">
+<label>{html.escape(description)} <select>{options}</select></label>
+<div><img src="{html.escape(first["image"])}" style="max-width: 100%" alt="{html.escape(value)}"></div>
+<pre>{html.escape(manifest["texts"][first["text"]])}</pre>
+<script type="application/json">{data}</script>
+<script>
+(function () {{
+  var root = document.getElementById("{element}");
+  var manifest = JSON.parse(root.querySelector("script[type='application/json']").textContent);
+  var select = root.querySelector("select"), image = root.querySelector("img"), text = root.querySelector("pre");
+  select.addEventListener("change", function () {{
+    var state = manifest.states[select.value];
+    image.src = state.image;
+    image.alt = select.value;
+    text.textContent = manifest.texts[state.text];
+  }});
+}})();
+</script>
+</div>"""
@@ -0,0 +1,144 @@
+"""
+Semantic functions behind DenotationalSemantics.
+
+Statement denotations map environments to environments. Assignment and
+sequence composition work on persistent ``Environment`` values (see
+environment.py): a plain dict passed in is converted once, after which each
+assignment shares all but O(log m) of its input environment instead of
+copying it. ``while`` and ``recursion`` denote least fixed points (see
+fixpoint.py).
+
+Sequences are flat: ``sequence`` and ``block`` build a ``Block`` that runs a
+list of statements in one loop, splicing in the statements of nested blocks
+instead of nesting closures, so a 10^5-statement program needs no deeper
+Python stack than a single statement. Runs of adjacent assignments are fused
+into one ``Assignment`` that applies its final bindings in one pass, without
+building the intermediate environments.
+
+Building is linear in the program length. A Block keeps its raw statements
+as a prefix of a list it may share: ``sequence(block, s)`` appends to that
+list in place when nothing has been appended past ``block`` yet (the
+earlier Block still sees only its own prefix), and copies the prefix
+otherwise. Fusion happens once, on the first call, collecting each run of
+bindings into one dict.
+"""
+
+from .environment import as_environment
+from .evaluator import INF
+from .fixpoint import least_fixed_point, while_loop
+
+
+class Assignment:
+    """Denotation of one or more constant assignments, applied in order."""
+
+    __slots__ = ("bindings",)
+
+    def __init__(self, bindings):
+        self.bindings = bindings
+
+    def __call__(self, env):
+        return as_environment(env).update(self.bindings)
+
+    def __repr__(self):
+        return f"Assignment({self.bindings!r})"
+
+
+class Block:
+    """Denotation of a statement list, run as one flat loop."""
+
+    __slots__ = ("_items", "_count", "fuse", "_statements")
+
+    def __init__(self, statements, fuse=True):
+        items = None
+        for statement in statements:
+            if type(statement) is Block:
+                if items is None and statement._count == len(statement._items):
+                    # Nothing has been appended past this block yet, so its list is extended in place.
+                    items = statement._items
+                    count = statement._count
+                    continue
+                parts = statement._items[: statement._count]
+            else:
+                parts = (statement,)
+            if items is None:
+                items, count = [], 0
+            items.extend(parts)
+            count += len(parts)
+        self._items = [] if items is None else items
+        self._count = 0 if items is None else count
+        self.fuse = fuse
+        self._statements = None
+
+    @property
+    def statements(self):
+        """The flat statement list, with runs of assignments fused (computed on first use)."""
+        if self._statements is None:
+            items = self._items[: self._count]
+            self._statements = _fused(items) if self.fuse else items
+        return self._statements
+
+    def __call__(self, env):
+        env = as_environment(env)
+        for statement in self.statements:
+            env = statement(env)
+        return env
+
+    def __len__(self):
+        return len(self.statements)
+
+
+def _fused(items):
+    """Statements with each run of adjacent assignments merged into one, in one pass."""
+    flat = []
+    run = None  # bindings of the Assignment at flat[-1] while it is being built
+    for part in items:
+        if type(part) is not Assignment:
+            run = None
+            flat.append(part)
+        elif run is None:
+            run = dict(part.bindings)
+            flat.append(Assignment(run))
+        else:
+            # Later bindings win, exactly as running the two assignments in turn.
+            run.update(part.bindings)
+    return flat
+
+
+def semantic_function(construct_type, params):
+    """Denotation of one construct, as in DenotationalSemantics.semantic_function."""
+    if construct_type == "assignment":
+        var, expr_val = params
+        return Assignment({var: expr_val})
+
+    elif construct_type == "arithmetic":
+        op, left_val, right_val = params
+        if op == "+":
+            return lambda env: left_val + right_val
+        elif op == "-":
+            return lambda env: left_val - right_val
+        elif op == "*":
+            return lambda env: left_val * right_val
+        elif op == "/":
+            return lambda env: left_val / right_val if right_val != 0 else INF
+
+    elif construct_type == "conditional":
+        condition, then_val, else_val = params
+        return lambda env: then_val if condition else else_val
+
+    elif construct_type == "sequence":
+        stmt1, stmt2 = params
+        return Block((stmt1, stmt2))
+
+    elif construct_type == "block":
+        (statements,) = params
+        return Block(statements)
+
+    elif construct_type == "while":
+        condition, body = params
+        loop = while_loop(condition, body)
+        return lambda env: loop(as_environment(env))
+
+    elif construct_type == "recursion":
+        # A generator-style definition: ``yield x`` is the recursive call f(x).
+        (body,) = params
+        return least_fixed_point(body)
@@ -0,0 +1,333 @@
+"""
+Counting, enumerating and sampling the sentences of CFGVisualizer grammars.
+
+``Language(rules)`` works on the grammar's proper form
+(``grammar.proper_form``: no ε-productions or unit productions), so every
+symbol derives at least one token and ε is a separate flag. Counts
+and samples refer to derivations in this form; for an unambiguous grammar
+each sentence has exactly one, so they count and sample sentences.
+
+``derivations(n)`` is a dynamic program over lengths with Python ints. Each
+production X1 ... Xk is binarized into prefixes, and
+
+    prefix_j[n] = sum over m of prefix_{j-1}[m] * count(X_j)[n - m]
+
+so the table up to length N costs O(N^2) multiplications per right-hand
+side symbol. Tables grow on demand and are kept between calls.
+
+``sample(n)`` draws a derivation of length n uniformly: it picks a
+production with weight equal to its count, then the length of each symbol
+from right to left with weight prefix_{j-1}[n - l] * count(X_j)[l].
+
+``sentences()`` yields the distinct sentences lazily, by length and then in
+lexicographic order of the terminal names, without building the language:
+it walks a trie of prefixes depth first, keeping the Earley sets of the
+current prefix. For every item it knows the exact set of lengths that can
+still complete the sentence (as a bitset), so it only extends a prefix by a
+terminal that leads to a sentence of the target length, every branch ends in
+a new sentence, and ambiguous sentences are produced once.
+"""
+
+import random
+from functools import lru_cache
+
+from .grammar import compile_grammar, proper_form
+
+
+def _sumset(a, b):
+    """Bitset of x + y for x in a, y in b."""
+    total = 0
+    while a:
+        low = a & -a
+        total |= b << low.bit_length() - 1
+        a ^= low
+    return total
+
+
+class Language:
+    """Derivation counts, uniform samples and sentence enumeration of a grammar."""
+
+    def __init__(self, rules, start=None):
+        form = proper_form(rules, start)
+        grammar = self.grammar = form.grammar
+        n = grammar.n_nonterminals
+        self.has_empty = form.has_empty
+        self.productions = form.productions  # (lhs, rhs) of the proper grammar, in a fixed order
+        self.by_lhs = [[] for _ in range(n)]
+        for index, (lhs, _) in enumerate(self.productions):
+            self.by_lhs[lhs].append(index)
+        # counts[symbol][length] and prefixes[production][j][length] for j = 1 .. k - 1.
+        self.counts = [[0] for _ in grammar.symbols]
+        self.prefixes = [[[0] for _ in rhs[:-1]] for _, rhs in self.productions]
+        self.size = 0
+
+    def _grow(self, limit):
+        """Extend the count tables to every length up to ``limit``."""
+        n_nonterminals = self.grammar.n_nonterminals
+        counts, prefixes = self.counts, self.prefixes
+        for length in range(self.size + 1, limit + 1):
+            for index, (_, rhs) in enumerate(self.productions):
+                tables = prefixes[index]
+                for j in range(1, len(tables)):
+                    previous, right = tables[j - 1], counts[rhs[j]]
+                    # prefix_{j-1} spans m >= j tokens and X_j at least one.
+                    tables[j].append(sum(previous[m] * right[length - m] for m in range(j, length) if previous[m]))
+            for symbol in range(n_nonterminals, len(counts)):
+                counts[symbol].append(1 if length == 1 else 0)
+            for symbol in range(n_nonterminals):
+                total = 0
+                for index in self.by_lhs[symbol]:
+                    total += self._production_count(index, length)
+                counts[symbol].append(total)
+            for index, (_, rhs) in enumerate(self.productions):
+                if prefixes[index]:
+                    prefixes[index][0].append(counts[rhs[0]][length])
+            self.size = length
+
+    def _production_count(self, index, length):
+        rhs = self.productions[index][1]
+        if len(rhs) == 1:
+            return self.counts[rhs[0]][length]
+        previous, right = self.prefixes[index][-1], self.counts[rhs[-1]]
+        k = len(rhs)
+        return sum(previous[m] * right[length - m] for m in range(k - 1, length) if previous[m])
+
+    def derivations(self, length):
+        """Number of derivations of sentences of ``length`` tokens (ε counts once)."""
+        if length == 0:
+            return int(self.has_empty)
+        self._grow(length)
+        return self.counts[self.grammar.start][length]
+
+    def sample(self, length, rng=random):
+        """A uniformly random derivation's sentence of ``length`` tokens; ValueError if there is none."""
+        total = self.derivations(length)
+        if total == 0:
+            raise ValueError(f"No sentence of length {length}")
+        if length == 0:
+            return []
+        n_nonterminals = self.grammar.n_nonterminals
+        names = self.grammar.symbols
+        sentence = []
+        work = [(self.grammar.start, length)]
+        while work:
+            symbol, size = work.pop()
+            if symbol >= n_nonterminals:
+                sentence.append(names[symbol])
+                continue
+            choice = rng.randrange(self.counts[symbol][size])
+            for index in self.by_lhs[symbol]:
+                weight = self._production_count(index, size)
+                if choice < weight:
+                    break
+                choice -= weight
+            rhs = self.productions[index][1]
+            parts = []
+            for j in range(len(rhs) - 1, 0, -1):
+                previous, right = self.prefixes[index][j - 1], self.counts[rhs[j]]
+                choice = rng.randrange(sum(previous[size - l] * right[l] for l in range(1, size - j + 1)))
+                for l in range(1, size - j + 1):
+                    weight = previous[size - l] * right[l]
+                    if choice < weight:
+                        break
+                    choice -= weight
+                parts.append((rhs[j], l))
+                size -= l
+            parts.append((rhs[0], size))
+            # Parts were chosen right to left; the work stack pops the leftmost first.
+            work.extend(parts)
+        return sentence
+
+    def lengths(self, symbols, limit):
+        """Bitset of the lengths up to ``limit`` that a sequence of symbols derives."""
+        self._grow(limit)
+        bits = 1
+        mask = (1 << (limit + 1)) - 1
+        for symbol in symbols:
+            table = self.counts[symbol]
+            bits = _sumset(sum(1 << l for l in range(1, limit + 1) if table[l]), bits) & mask
+        return bits
+
+    def sentences(self, length=None, max_length=None):
+        """Distinct sentences (lists of terminal names) of one length, or of every length in order."""
+        if length is not None:
+            yield from self._sentences(length)
+            return
+        longest = self.longest()
+        length = 0
+        while (max_length is None or length <= max_length) and (longest is None or length <= longest):
+            yield from self._sentences(length)
+            length += 1
+
+    def longest(self):
+        """Length of the longest sentence (-1 if there is none), or None if the language is infinite."""
+        n = self.grammar.n_nonterminals
+        productive = set()
+        changed = True
+        while changed:
+            changed = False
+            for lhs, rhs in self.productions:
+                if lhs not in productive and all(part >= n or part in productive for part in rhs):
+                    productive.add(lhs)
+                    changed = True
+        start = self.grammar.start
+        if start not in productive:
+            return 0 if self.has_empty else -1
+        bodies = {lhs: [] for lhs in productive}
+        for lhs, rhs in self.productions:
+            if lhs in productive and all(part >= n or part in productive for part in rhs):
+                bodies[lhs].append(rhs)
+        # Depth-first from the start: with no ε or unit productions, a cycle pumps the length.
+        longest = {}
+        stack = [(start, iter({part for rhs in bodies[start] for part in rhs if part < n}))]
+        active = {start}
+        while stack:
+            symbol, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                active.discard(symbol)
+                longest[symbol] = max(sum(longest.get(part, 1) for part in rhs) for rhs in bodies[symbol])
+            elif child in active:
+                return None
+            elif child not in longest:
+                active.add(child)
+                stack.append((child, iter({part for rhs in bodies[child] for part in rhs if part < n})))
+        return longest[start]
+
+    def _sentences(self, length):
+        if length == 0:
+            if self.has_empty:
+                yield []
+            return
+        if self.derivations(length) == 0:
+            return
+        grammar = self.grammar
+        n_nonterminals = grammar.n_nonterminals
+        names = grammar.symbols
+        productions = self.productions
+        mask = (1 << (length + 1)) - 1
+        # Length bitsets of every production suffix: tails[p][d] for the symbols from position d on.
+        tails = []
+        for _, rhs in productions:
+            bits = [1] * (len(rhs) + 1)
+            for d in range(len(rhs) - 1, -1, -1):
+                bits[d] = _sumset(self.lengths((rhs[d],), length), bits[d + 1]) & mask
+            tails.append(bits)
+        sums = {}
+
+        def plus(a, b):
+            """Memoized _sumset truncated to the sentence length: the same pairs recur along the prefix."""
+            key = (a, b)
+            bits = sums.get(key)
+            if bits is None:
+                bits = sums[key] = _sumset(a, b) & mask
+            return bits
+
+        terminal_order = sorted(range(n_nonterminals, len(names)), key=lambda symbol: names[symbol])
+        rank = {symbol: position for position, symbol in enumerate(terminal_order)}
+
+        def close(items, position, sets):
+            """Earley closure of ``items`` (production, dot, origin) at ``position``, with each item's continuation lengths."""
+            chart = dict.fromkeys(items)
+            work = list(items)
+            waiting = {}
+            predicted = set()
+            while work:
+                item = work.pop()
+                index, dot, origin = item
+                rhs = productions[index][1]
+                if dot < len(rhs):
+                    symbol = rhs[dot]
+                    if symbol < n_nonterminals:
+                        waiting.setdefault(symbol, []).append(item)
+                        if symbol not in predicted:
+                            predicted.add(symbol)
+                            for child in self.by_lhs[symbol]:
+                                new = (child, 0, position)
+                                if new not in chart:
+                                    chart[new] = None
+                                    work.append(new)
+                    continue
+                # Completed: advance the items of E_origin waiting on the left-hand side.
+                lhs = productions[index][0]
+                for parent in (sets[origin][1].get(lhs, ()) if origin < position else ()):
+                    new = (parent[0], parent[1] + 1, parent[2])
+                    if new not in chart:
+                        chart[new] = None
+                        work.append(new)
+            # after[A]: lengths that can follow a completed A started here, up to the end of the sentence.
+            after = dict.fromkeys(range(n_nonterminals), 0)
+            if position == 0:
+                after[grammar.start] = 1
+            same = []
+            for symbol, items_waiting in waiting.items():
+                for index, dot, origin in items_waiting:
+                    lhs = productions[index][0]
+                    tail = tails[index][dot + 1]
+                    if origin < position:
+                        after[symbol] |= plus(tail, sets[origin][2][lhs])
+                    else:
+                        same.append((lhs, tail, symbol))
+            # Predictions chain within this set (e.g. left recursion): iterate to the least fixed point.
+            changed = True
+            while changed:
+                changed = False
+                for lhs, tail, symbol in same:
+                    bits = plus(tail, after[lhs])
+                    if bits & ~after[symbol]:
+                        after[symbol] |= bits
+                        changed = True
+            return chart, waiting, after
+
+        sets = [close([(index, 0, 0) for index in self.by_lhs[grammar.start]], 0, [])]
+
+        def options(position):
+            """Terminals that extend the prefix towards a sentence of ``length`` tokens, in name order."""
+            chart, _, after = sets[position]
+            remaining = length - position - 1
+            found = set()
+            for index, dot, origin in chart:
+                rhs = productions[index][1]
+                if dot < len(rhs) and rhs[dot] >= n_nonterminals and rhs[dot] not in found:
+                    lhs = productions[index][0]
+                    continuation = after[lhs] if origin == position else sets[origin][2][lhs]
+                    if plus(tails[index][dot + 1], continuation) >> remaining & 1:
+                        found.add(rhs[dot])
+            return sorted(found, key=rank.get)
+
+        prefix = []
+        stack = [iter(options(0))]
+        while stack:
+            terminal = next(stack[-1], None)
+            if terminal is None:
+                stack.pop()
+                sets.pop()
+                if prefix:
+                    prefix.pop()
+                continue
+            position = len(prefix)
+            chart = sets[position][0]
+            scanned = [(index, dot + 1, origin) for index, dot, origin in chart if dot < len(productions[index][1]) and productions[index][1][dot] == terminal]
+            prefix.append(names[terminal])
+            sets.append(close(scanned, position + 1, sets))
+            if position + 1 == length:
+                yield list(prefix)
+                sets.pop()
+                prefix.pop()
+                continue
+            stack.append(iter(options(position + 1)))
+
+    def count_sentences(self, length):
+        """Number of distinct sentences of ``length`` tokens, by enumeration."""
+        return sum(1 for _ in self._sentences(length))
+
+
+@lru_cache(maxsize=64)
+def _language(grammar):
+    return Language(grammar)
+
+
+def language(rules, start=None):
+    """Cached Language of a grammar dict or Grammar; its count tables persist between calls."""
+    return _language(compile_grammar(rules, start))
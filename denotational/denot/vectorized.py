@@ -0,0 +1,123 @@
+"""
+NumPy batch evaluation of SyntaxTreeBuilder dict ASTs.
+
+Instead of calling ``evaluate_tree`` once per environment, every variable is
+bound to a column of values and each BinaryOp runs as one whole-array
+operation. Columns can be given as a dict of arrays or as a structured array
+whose field names are the variables:
+
+    xs, ys = np.meshgrid(np.linspace(-1, 1, 1000), np.linspace(-1, 1, 1000))
+    zs = evaluate_batch(tree, {'x': xs, 'y': ys})
+
+Division keeps the scalar rule: wherever the divisor is 0 the result is
+``inf``. Integer columns use NumPy's fixed-width integers for + - *, so very
+large intermediate values wrap instead of growing like Python ints.
+
+For bindings that do not fit in memory (e.g. ``np.memmap`` columns or a
+generator of chunks), ``evaluate_chunks`` and ``evaluate_batch_chunked``
+stream the work in fixed-size slices.
+"""
+
+import numpy as np
+
+
+def _divide(left, right):
+    left, right = np.broadcast_arrays(np.asarray(left, dtype=float), np.asarray(right, dtype=float))
+    out = np.full(left.shape, np.inf)
+    np.divide(left, right, out=out, where=right != 0)
+    return out
+
+
+_ARRAY_OPS = {"+": np.add, "-": np.subtract, "*": np.multiply, "/": _divide}
+
+
+def as_columns(bindings):
+    """Normalise a dict of arrays or a structured array to a dict of arrays."""
+    if isinstance(bindings, np.ndarray) and bindings.dtype.names:
+        return {name: bindings[name] for name in bindings.dtype.names}
+    return {name: np.asarray(values) for name, values in bindings.items()}
+
+
+def batch_shape(columns):
+    """Common broadcast shape of all columns (``()`` when there are none)."""
+    return np.broadcast_shapes(*(np.shape(values) for values in columns.values()))
+
+
+def evaluate_batch(tree, bindings, out=None):
+    """Evaluate a dict AST over every environment in ``bindings`` at once.
+
+    Unbound variables are 0, as in ``evaluate_tree``. The result has the
+    broadcast shape of the columns; pass ``out`` to write into an existing
+    array instead of allocating one.
+    """
+    columns = as_columns(bindings)
+    shape = batch_shape(columns)
+    zero = np.zeros((), dtype=int)
+    values = []
+    work = [tree]
+    # inf * 0 and inf - inf are nan, as for Python floats; silence NumPy's warnings about them.
+    with np.errstate(invalid="ignore", over="ignore"):
+        while work:
+            node = work.pop()
+            if type(node) is str:
+                right = values.pop()
+                operation = _ARRAY_OPS.get(node)
+                values[-1] = operation(values[-1], right) if operation is not None else zero
+                continue
+            node_type = node["type"]
+            if node_type == "Number":
+                values.append(np.asarray(node["value"]))
+            elif node_type == "Variable":
+                values.append(columns.get(node["name"], zero))
+            elif node_type == "BinaryOp":
+                work.append(node["op"])
+                work.append(node["right"])
+                work.append(node["left"])
+            else:
+                values.append(zero)
+
+    result = values[0]
+    if out is not None:
+        out[...] = result
+        return out
+    if isinstance(result, np.ndarray) and result.shape == shape and not any(result is column for column in columns.values()):
+        return result
+    return np.array(np.broadcast_to(result, shape))
+
+
+def _row_columns(bindings):
+    """Columns of a 1-D batch and their common length."""
+    columns = as_columns(bindings) if isinstance(bindings, np.ndarray) else dict(bindings)
+    shape = batch_shape(columns)
+    if len(shape) != 1:
+        raise ValueError(f"Chunked evaluation needs 1-D columns, got shape {shape}")
+    return columns, shape[0]
+
+
+def iter_chunks(bindings, chunk_size):
+    """Yield consecutive slices of 1-D columns, ``chunk_size`` rows at a time."""
+    columns, length = _row_columns(bindings)
+    for start in range(0, length, chunk_size):
+        yield {name: np.asarray(values[start : start + chunk_size]) for name, values in columns.items()}
+
+
+def evaluate_chunks(tree, chunks):
+    """Evaluate a dict AST over a stream of column chunks, yielding one result array per chunk."""
+    for chunk in chunks:
+        yield evaluate_batch(tree, chunk)
+
+
+def evaluate_batch_chunked(tree, bindings, chunk_size=1 << 16, out=None):
+    """Evaluate 1-D columns slice by slice, keeping temporaries bounded by ``chunk_size``.
+
+    ``bindings`` may be memory-mapped; pass a memory-mapped ``out`` to keep
+    the result on disk as well.
+    """
+    columns, length = _row_columns(bindings)
+    start = 0
+    for result in evaluate_chunks(tree, iter_chunks(columns, chunk_size)):
+        if out is None:
+            out = np.empty(length, dtype=result.dtype)
+        out[start : start + len(result)] = result
+        start += len(result)
+    return out if out is not None else np.empty(0)
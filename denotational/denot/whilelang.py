@@ -0,0 +1,339 @@
+"""
+The While language: parser and denotational semantics compiled to closures.
+
+Statements build on the SyntaxTreeBuilder expression AST:
+
+    S ::= x := e | skip | S ; S | if b then S else S | while b do S | ( S )
+    b ::= true | false | e < e | e <= e | e = e | e != e | e > e | e >= e
+        | not b | b and b | b or b | ( b )
+
+``;`` binds loosest, so ``while b do S1; S2`` runs S2 once after the loop;
+parenthesize a compound body. ``parse_program`` returns a dict AST:
+
+    {'type': 'Assign', 'name': 'x', 'expr': <expression AST>}
+    {'type': 'Skip'}
+    {'type': 'Seq', 'statements': [...]}
+    {'type': 'If', 'cond': <bexp>, 'then': S, 'else': S}
+    {'type': 'While', 'cond': <bexp>, 'body': S}
+
+with boolean expressions {'type': 'Boolean', 'value'}, {'type': 'Compare',
+'op', 'left', 'right'}, {'type': 'Not', 'operand'} and {'type': 'BoolOp',
+'op': 'and' | 'or', 'left', 'right'}.
+
+``denote`` gives the program's meaning over separate domains: the
+environment maps each variable to a location, fixed at compile time, and
+the store maps locations to values. Every statement is compiled once into a
+closure Store -> Store, so running a program never looks at the syntax
+again. Chains such as ``a + b + ... + z`` and ``b and b and ... and b``
+compile into one loop over their operands rather than nested closures, so a
+long sum needs no deeper Python stack than a short one. Stores are lists
+used linearly, so updates happen in place. ``while`` is the least fixed
+point from fixpoint.py, so a runaway loop raises Divergence after
+``budget`` iterations. Expressions follow evaluate_tree: unassigned
+variables are 0 and division by zero is inf.
+"""
+
+import operator
+import re
+
+from .evaluator import INF
+from .fixpoint import DEFAULT_BUDGET, while_loop
+from .parser import BINDING_POWER, ParseError, _Failure, _Parser
+
+KEYWORDS = frozenset(["if", "then", "else", "while", "do", "skip", "true", "false", "not", "and", "or"])
+COMPARISONS = {"<": operator.lt, "<=": operator.le, "=": operator.eq, "!=": operator.ne, ">": operator.gt, ">=": operator.ge}
+
+_TOKEN_RE = re.compile(r"[0-9]+(?:\.[0-9]+)?|[A-Za-z_][A-Za-z_0-9]*|:=|<=|>=|!=|\S")
+_CONTINUES_EXPRESSION = frozenset(COMPARISONS) | frozenset(BINDING_POWER)
+
+
+class _WhileParser(_Parser):
+    """Statement and boolean parser; expressions go through _Parser."""
+
+    def __init__(self, texts):
+        super().__init__(texts)
+        self.closing = None  # index of each '(' -> index of its ')', built on first use
+
+    def expect(self, text):
+        if self.peek() != text:
+            found = self.peek()
+            raise _Failure(f"Expected {text!r}" + (f", found {found!r}" if found is not None else ""), self.pos)
+        self.pos += 1
+
+    def operand(self):
+        if self.peek() in KEYWORDS:
+            raise _Failure(f"Unexpected keyword {self.peek()!r}", self.pos)
+        return super().operand()
+
+    def parse(self):
+        program = self.sequence()
+        if self.peek() is not None:
+            raise _Failure(f"Unexpected {self.peek()!r}", self.pos)
+        return program
+
+    def sequence(self):
+        statements = [self.statement()]
+        while self.peek() == ";":
+            self.pos += 1
+            statements.append(self.statement())
+        if len(statements) == 1:
+            return statements[0]
+        # Keep sequences flat: splice in parenthesized sequences.
+        flat = []
+        for statement in statements:
+            flat.extend(statement["statements"] if statement["type"] == "Seq" else (statement,))
+        return {"type": "Seq", "statements": flat}
+
+    def statement(self):
+        text = self.peek()
+        if text == "skip":
+            self.pos += 1
+            return {"type": "Skip"}
+        if text == "if":
+            self.pos += 1
+            cond = self.boolean()
+            self.expect("then")
+            then = self.statement()
+            self.expect("else")
+            return {"type": "If", "cond": cond, "then": then, "else": self.statement()}
+        if text == "while":
+            self.pos += 1
+            cond = self.boolean()
+            self.expect("do")
+            return {"type": "While", "cond": cond, "body": self.statement()}
+        if text == "(":
+            self.pos += 1
+            body = self.sequence()
+            self.expect(")")
+            return body
+        if text is None:
+            raise _Failure("Unexpected end of program", self.pos)
+        if text in KEYWORDS or not (text[0] == "_" or (text[0].isascii() and text[0].isalpha())):
+            raise _Failure(f"Unexpected {text!r}", self.pos)
+        self.pos += 1
+        self.expect(":=")
+        return {"type": "Assign", "name": text, "expr": self.expression(0)}
+
+    def boolean(self):
+        left = self.conjunction()
+        while self.peek() == "or":
+            self.pos += 1
+            left = {"type": "BoolOp", "op": "or", "left": left, "right": self.conjunction()}
+        return left
+
+    def conjunction(self):
+        left = self.negation()
+        while self.peek() == "and":
+            self.pos += 1
+            left = {"type": "BoolOp", "op": "and", "left": left, "right": self.negation()}
+        return left
+
+    def negation(self):
+        text = self.peek()
+        if text == "not":
+            self.pos += 1
+            return {"type": "Not", "operand": self.negation()}
+        if text in ("true", "false"):
+            self.pos += 1
+            return {"type": "Boolean", "value": text == "true"}
+        if text == "(" and self.after_group(self.pos) not in _CONTINUES_EXPRESSION:
+            # Nothing after the ')' extends an expression, so the group is a
+            # parenthesized boolean, e.g. '(x < 1 or y < 1)', not '(x + 1) < y'.
+            self.pos += 1
+            cond = self.boolean()
+            self.expect(")")
+            return cond
+        return self.comparison()
+
+    def after_group(self, start):
+        """The token after the ')' matching the '(' at ``start`` (None past the end or if unmatched)."""
+        if self.closing is None:
+            # One pass over the tokens, so deciding every group costs O(1).
+            self.closing = {}
+            opened = []
+            for index, text in enumerate(self.texts):
+                if text == "(":
+                    opened.append(index)
+                elif text == ")" and opened:
+                    self.closing[opened.pop()] = index
+        end = self.closing.get(start)
+        return self.texts[end + 1] if end is not None and end + 1 < len(self.texts) else None
+
+    def comparison(self):
+        left = self.expression(0)
+        op = self.peek()
+        if op not in COMPARISONS:
+            raise _Failure("Expected a comparison", self.pos)
+        self.pos += 1
+        return {"type": "Compare", "op": op, "left": left, "right": self.expression(0)}
+
+
+def parse_program(source):
+    """Parse a While program into a statement dict AST."""
+    texts = _TOKEN_RE.findall(source)
+    try:
+        return _WhileParser(texts).parse()
+    except _Failure as failure:
+        starts = [match.start() for match in _TOKEN_RE.finditer(source)]
+        raise ParseError(failure.message, starts[failure.index] if failure.index < len(starts) else len(source)) from None
+
+
+def _divide(a, b):
+    return a / b if b != 0 else INF
+
+
+_ARITHMETIC = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": _divide}
+
+
+class _Compiler:
+    """Compile statement ASTs to closures, allocating a location per variable."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.environment = {}
+
+    def location(self, name):
+        location = self.environment.get(name)
+        if location is None:
+            location = self.environment[name] = len(self.environment)
+        return location
+
+    def expression(self, tree):
+        node_type = tree["type"]
+        if node_type == "Number":
+            value = tree["value"]
+            return lambda store: value
+        if node_type == "Variable":
+            location = self.location(tree["name"])
+            return lambda store: store[location]
+        if node_type != "BinaryOp" or tree["op"] not in _ARITHMETIC:
+            return lambda store: 0
+        left, right = tree["left"], tree["right"]
+        if left["type"] == "BinaryOp" and left["op"] in _ARITHMETIC:
+            return self.chain(tree)
+        apply = _ARITHMETIC[tree["op"]]
+        # Specialize the common leaf shapes to save a closure call per operand.
+        if left["type"] == "Variable" and right["type"] == "Number":
+            location, value = self.location(left["name"]), right["value"]
+            return lambda store: apply(store[location], value)
+        if left["type"] == "Variable" and right["type"] == "Variable":
+            a, b = self.location(left["name"]), self.location(right["name"])
+            return lambda store: apply(store[a], store[b])
+        left_fn, right_fn = self.expression(left), self.expression(right)
+        return lambda store: apply(left_fn(store), right_fn(store))
+
+    def chain(self, tree):
+        """A left-deep chain ``e op e op ... op e`` as one loop, so long sums need no deep Python stack."""
+        rights = []
+        while tree["type"] == "BinaryOp" and tree["op"] in _ARITHMETIC:
+            rights.append((tree["op"], tree["right"]))
+            tree = tree["left"]
+        first = self.expression(tree)
+        steps = tuple((_ARITHMETIC[op], self.expression(right)) for op, right in reversed(rights))
+
+        def chain(store):
+            value = first(store)
+            for apply, operand in steps:
+                value = apply(value, operand(store))
+            return value
+
+        return chain
+
+    def boolean(self, tree):
+        node_type = tree["type"]
+        if node_type == "Boolean":
+            value = tree["value"]
+            return lambda store: value
+        if node_type == "Not":
+            negated = False
+            while tree["type"] == "Not":
+                negated = not negated
+                tree = tree["operand"]
+            operand = self.boolean(tree)
+            return (lambda store: not operand(store)) if negated else operand
+        if node_type == "BoolOp":
+            # Flatten 'b and b and ...' (or 'or') into one short-circuiting loop, as chain does.
+            op = tree["op"]
+            rights = []
+            while tree["type"] == "BoolOp" and tree["op"] == op:
+                rights.append(tree["right"])
+                tree = tree["left"]
+            operands = (self.boolean(tree),) + tuple(self.boolean(right) for right in reversed(rights))
+            if len(operands) == 2:
+                left, right = operands
+                if op == "and":
+                    return lambda store: left(store) and right(store)
+                return lambda store: left(store) or right(store)
+            if op == "and":
+                return lambda store: all(operand(store) for operand in operands)
+            return lambda store: any(operand(store) for operand in operands)
+        compare = COMPARISONS[tree["op"]]
+        left, right = tree["left"], tree["right"]
+        if left["type"] == "Variable" and right["type"] == "Number":
+            location, value = self.location(left["name"]), right["value"]
+            return lambda store: compare(store[location], value)
+        left_fn, right_fn = self.expression(left), self.expression(right)
+        return lambda store: compare(left_fn(store), right_fn(store))
+
+    def statement(self, tree):
+        node_type = tree["type"]
+        if node_type == "Assign":
+            location = self.location(tree["name"])
+            value = self.expression(tree["expr"])
+
+            def assign(store):
+                store[location] = value(store)
+                return store
+
+            return assign
+        if node_type == "Skip":
+            return lambda store: store
+        if node_type == "Seq":
+            statements = tuple(self.statement(statement) for statement in tree["statements"])
+
+            def sequence(store):
+                for statement in statements:
+                    store = statement(store)
+                return store
+
+            return sequence
+        if node_type == "If":
+            cond, then, otherwise = self.boolean(tree["cond"]), self.statement(tree["then"]), self.statement(tree["else"])
+            return lambda store: then(store) if cond(store) else otherwise(store)
+        if node_type == "While":
+            return while_loop(self.boolean(tree["cond"]), self.statement(tree["body"]), self.budget)
+        raise ValueError(f"Unknown statement type {node_type!r}")
+
+
+class Denotation:
+    """A compiled While program: a Store -> Store function plus its environment."""
+
+    def __init__(self, program, budget=DEFAULT_BUDGET):
+        compiler = _Compiler(budget)
+        self.function = compiler.statement(program)
+        self.environment = compiler.environment
+
+    def __call__(self, store):
+        return self.function(store)
+
+    def run(self, inputs=None):
+        """Run from a store holding ``inputs`` (others 0) and return the final variables."""
+        store = [0] * len(self.environment)
+        for name, value in (inputs or {}).items():
+            location = self.environment.get(name)
+            if location is not None:
+                store[location] = value
+        store = self.function(store)
+        return {name: store[location] for name, location in self.environment.items()}
+
+
+def denote(program, budget=DEFAULT_BUDGET):
+    """Compile a statement AST (or program source) into its Denotation."""
+    if isinstance(program, str):
+        program = parse_program(program)
+    return Denotation(program, budget)
+
+
+def run_program(source, inputs=None, budget=DEFAULT_BUDGET):
+    """Parse, compile and run a While program, returning the final variables."""
+    return denote(source, budget).run(inputs)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The notebooks import denot from the book directory; the tests do the same from any working directory.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
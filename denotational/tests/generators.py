@@ -0,0 +1,110 @@
+"""
+Deterministic inputs shared by the tests: random expressions and the CFGVisualizer grammars.
+"""
+
+import random
+
+from denot.parser import NAME, NUMBER, number_value, token_kind
+
+OPERATORS = "+-*/"
+VARIABLES = ("x", "y", "z")
+
+ARITHMETIC = {
+    "E": ["E + T", "E - T", "T"],
+    "T": ["T * F", "T / F", "F"],
+    "F": ["( E )", "id", "num"],
+}
+SIMPLE = {
+    "S": ["A B", "C"],
+    "A": ["a A", "a"],
+    "B": ["b B", "b"],
+    "C": ["c C", "c"],
+}
+BALANCED = {"S": ["( S )", "S S", ""]}
+IF_THEN_ELSE = {
+    "S": ["if E then S", "if E then S else S", "id = E", "print E"],
+    "E": ["E + E", "E * E", "id", "num", "E < E", "E = E"],
+}
+GRAMMARS = {
+    "Arithmetic Expressions": ARITHMETIC,
+    "Simple Language": SIMPLE,
+    "Balanced Parentheses": BALANCED,
+    "If-Then-Else": IF_THEN_ELSE,
+}
+
+
+def random_expression(n_tokens, seed=0, variables=VARIABLES, max_depth=8):
+    """A random expression of roughly ``n_tokens`` tokens with nested parentheses."""
+    rng = random.Random(seed)
+    parts = []
+    depth = 0
+    open_operands = []
+    count = 0
+    while count < n_tokens:
+        if parts:
+            parts.append(rng.choice(OPERATORS))
+            count += 1
+        if depth < max_depth and rng.random() < 0.15:
+            parts.append("(")
+            depth += 1
+            open_operands.append(0)
+            count += 1
+        if variables and rng.random() < 0.3:
+            parts.append(rng.choice(variables))
+        else:
+            parts.append(str(rng.randint(1, 9)))
+        count += 1
+        if open_operands:
+            open_operands[-1] += 1
+            if open_operands[-1] >= 2 and rng.random() < 0.3:
+                parts.append(")")
+                depth -= 1
+                open_operands.pop()
+                count += 1
+    parts.extend(")" * depth)
+    return " ".join(parts)
+
+
+def terminal(text):
+    """Arithmetic Expressions terminal of a SyntaxTreeBuilder token."""
+    kind = token_kind(text)
+    return "num" if kind == NUMBER else "id" if kind == NAME else text
+
+
+def arithmetic_tokens(n_tokens, seed=0):
+    """A random expression over the Arithmetic Expressions terminals."""
+    return [terminal(text) for text in random_expression(n_tokens, seed).split()]
+
+
+def ast_reducer(grammar):
+    """LALR reduction callback building SyntaxTreeBuilder dict ASTs for ARITHMETIC."""
+    actions = []
+    for production in grammar.productions:
+        parts = production.text.split()
+        if len(parts) == 3 and parts[1] in OPERATORS:
+            actions.append(lambda children, op=parts[1]: {"type": "BinaryOp", "op": op, "left": children[0], "right": children[2]})
+        elif parts == ["(", "E", ")"]:
+            actions.append(lambda children: children[1])
+        elif parts == ["id"]:
+            actions.append(lambda children: {"type": "Variable", "name": children[0]})
+        elif parts == ["num"]:
+            actions.append(lambda children: {"type": "Number", "value": number_value(children[0])})
+        else:
+            actions.append(lambda children: children[0])
+    return lambda production, children: actions[production](children)
+
+
+def random_grammar(n_nonterminals, n_terminals, n_productions, seed=0, max_length=4, epsilon_rate=0.1):
+    """Random CFGVisualizer-style grammar dict; every nonterminal gets at least one production."""
+    rng = random.Random(seed)
+    nonterminals = [f"N{i}" for i in range(n_nonterminals)]
+    terminals = [f"t{i}" for i in range(n_terminals)]
+    rules = {name: [] for name in nonterminals}
+    for index in range(n_productions):
+        lhs = nonterminals[index] if index < n_nonterminals else rng.choice(nonterminals)
+        if rng.random() < epsilon_rate:
+            rules[lhs].append("")
+            continue
+        length = rng.randint(1, max_length)
+        rules[lhs].append(" ".join(rng.choice(nonterminals if rng.random() < 0.4 else terminals) for _ in range(length)))
+    return rules
@@ -0,0 +1,64 @@
+import pytest
+
+from denot.cache import RenderCache, normalize_expression
+
+
+def render(key):
+    return {"expr": key}, len(key), key.encode()
+
+
+def test_spacing_does_not_matter():
+    assert normalize_expression("2+3*4") == normalize_expression(" 2 +  3 * 4 ") == "2 + 3 * 4"
+    cache = RenderCache()
+    cache.put("2+3*4", "tree", 14, b"png")
+    assert "2 + 3 * 4" in cache
+    assert cache.get("2 +3*4").result == 14
+
+
+def test_get_or_create_renders_once():
+    cache = RenderCache()
+    calls = []
+
+    def counting(key):
+        calls.append(key)
+        return render(key)
+
+    first = cache.get_or_create("x+1", counting)
+    assert cache.get_or_create("x + 1", counting) is first
+    assert calls == ["x + 1"]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_failed_render_is_not_cached():
+    cache = RenderCache()
+
+    def failing(key):
+        raise ValueError("cannot draw")
+
+    with pytest.raises(ValueError):
+        cache.get_or_create("1 +", failing)
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = RenderCache(max_entries=2)
+    cache.put("a", None, 0, b"")
+    cache.put("b", None, 0, b"")
+    cache.get("a")
+    cache.put("c", None, 0, b"")
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.evictions == 1
+
+
+def test_byte_budget():
+    cache = RenderCache(max_bytes=10)
+    cache.put("a", None, 0, b"x" * 6)
+    cache.put("b", None, 0, b"x" * 6)
+    assert len(cache) == 1 and cache.total_bytes == 6
+    # The newest entry stays even when it alone is over the budget.
+    cache.put("c", None, 0, b"x" * 20)
+    assert "c" in cache and cache.total_bytes == 20
+    cache.put("c", None, 0, b"x")
+    assert cache.total_bytes == 1
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["bytes"] == 0
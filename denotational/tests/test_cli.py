@@ -0,0 +1,60 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+from denot import cli
+
+LINES = ["1 + 2", "x * y", "1 / 0", "2 +", "", "9" * 5000, "(" * 20000 + "1" + ")" * 20000]
+EXPECTED = ["3", "1.5", "inf", "error: Unexpected end of expression at position 3", "error: Unexpected end of expression at position 0"]
+
+
+def outputs(text):
+    return text.splitlines()
+
+
+def test_each_line_gets_one_output_line():
+    out = cli.evaluate_chunk(LINES, {"x": 3, "y": 0.5})
+    lines = outputs(out)
+    assert len(lines) == len(LINES)
+    assert lines[:5] == EXPECTED
+    assert lines[5].startswith("error: ")
+    assert lines[6] == "1"
+
+
+def test_overflows_are_reported_per_line():
+    # An int too large for a float, and a product too long for repr.
+    assert cli.evaluate_line("9" * 400 + " / 2", {}).startswith("error: ")
+    assert cli.evaluate_line("x * x", {"x": 10**3000}).startswith("error: ")
+    assert cli.evaluate_line("x * x", {"x": 10**200}).isdigit()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_pool_keeps_input_order(workers):
+    lines = [f"{i} * 2" if i % 7 else "oops +" for i in range(3000)]
+    out = io.StringIO()
+    count = cli.run(io.StringIO("\n".join(lines) + "\n"), out, workers=workers, chunk_size=37)
+    assert count == 3000
+    assert outputs(out.getvalue()) == [cli.evaluate_line(line, {}) for line in lines]
+
+
+def test_bindings():
+    assert cli.parse_binding("x=3") == ("x", 3)
+    assert cli.parse_binding("y=0.5") == ("y", 0.5)
+    for text in ["x", "=3", "x=three"]:
+        with pytest.raises(Exception):
+            cli.parse_binding(text)
+
+
+def test_command_line(tmp_path):
+    source = tmp_path / "in.txt"
+    source.write_text("x + 1\r\n2 / y\n")
+    result = tmp_path / "out.txt"
+    cli.main([str(source), "-o", str(result), "--var", "x=3", "--var", "y=0", "-j", "1", "-q"])
+    assert result.read_text() == "4\ninf\n"
+    book = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "-m", "denot", "-j", "2", "--chunk-size", "1", "-q"]
+    completed = subprocess.run(command, input="1 + 1\n3 *\n", capture_output=True, text=True, check=True, cwd=book)
+    assert outputs(completed.stdout) == ["2", "error: Unexpected end of expression at position 3"]
@@ -0,0 +1,54 @@
+import math
+
+from denot.compiler import compile_tree, generate_source
+from denot.evaluator import INF, evaluate_tree
+from denot.parser import parse_expression
+
+
+def test_source_is_straight_line():
+    source, constants = generate_source(parse_expression("2 + x * 3"))
+    assert source == (
+        "def compiled(variables=None):\n"
+        "    if variables is None:\n"
+        "        variables = {}\n"
+        "    get = variables.get\n"
+        "    v0 = get('x', 0)\n"
+        "    t0 = v0 * 3\n"
+        "    t1 = 2 + t0\n"
+        "    return t1\n"
+    )
+    assert constants == []
+
+
+def test_each_variable_is_looked_up_once():
+    source, _ = generate_source(parse_expression("x * x + x - y"))
+    assert source.count("get('x', 0)") == 1 and source.count("get('y', 0)") == 1
+
+
+def test_compiled_function_is_reusable():
+    function = compile_tree(parse_expression("(x + y) / z"))
+    assert function({"x": 1, "y": 2, "z": 3}) == 1.0
+    assert function({"x": 1, "y": 2, "z": 0}) == INF
+    assert function({}) == INF
+    assert function() == INF
+    assert function.source.startswith("def compiled(")
+
+
+def test_negative_and_non_finite_constants():
+    tree = {"type": "BinaryOp", "op": "-", "left": {"type": "Number", "value": -2}, "right": {"type": "Number", "value": INF}}
+    source, constants = generate_source(tree)
+    assert "(-2)" in source and constants == [INF]
+    assert compile_tree(tree)() == -INF
+    nan = {"type": "Number", "value": float("nan")}
+    assert math.isnan(compile_tree(nan)())
+
+
+def test_unknown_nodes_and_operators_are_zero():
+    tree = {"type": "BinaryOp", "op": "%", "left": {"type": "Variable", "name": "x"}, "right": {"type": "Other"}}
+    assert compile_tree(tree)({"x": 5}) == evaluate_tree(tree, {"x": 5}) == 0
+
+
+def test_division_by_zero_matches_evaluate_tree():
+    for expr in ["1 / 0", "x / (y - y)", "0 / 0", "-1 / 0"]:
+        tree = parse_expression(expr)
+        assert compile_tree(tree)({"x": 1, "y": 2}) == evaluate_tree(tree, {"x": 1, "y": 2})
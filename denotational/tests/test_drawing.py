@@ -0,0 +1,100 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from denot.drawing import SEPARATION, TreeLayout, draw_tree, edge_segments, tidy_layout
+from denot.parser import parse_expression
+from generators import random_expression
+
+
+def naive_layout(node):
+    """Reference Reingold–Tilford: whole contours (per-level min and max x) merged recursively."""
+    if node["type"] != "BinaryOp":
+        return [0.0], [(0.0, 0.0)]
+    left_x, left_contour = naive_layout(node["left"])
+    right_x, right_contour = naive_layout(node["right"])
+    gap = SEPARATION
+    for (_, right_edge), (left_edge, _) in zip(left_contour, right_contour):
+        gap = max(gap, right_edge - left_edge + SEPARATION)
+    xs = [0.0] + [x - gap / 2 for x in left_x] + [x + gap / 2 for x in right_x]
+    contour = [(0.0, 0.0)]
+    for depth in range(max(len(left_contour), len(right_contour))):
+        edges = []
+        if depth < len(left_contour):
+            edges += [left_contour[depth][0] - gap / 2, left_contour[depth][1] - gap / 2]
+        if depth < len(right_contour):
+            edges += [right_contour[depth][0] + gap / 2, right_contour[depth][1] + gap / 2]
+        contour.append((min(edges), max(edges)))
+    return xs, contour
+
+
+def children(layout):
+    result = [[] for _ in layout.x]
+    for v, parent in enumerate(layout.parent):
+        if parent >= 0:
+            result[parent].append(v)
+    return result
+
+
+def test_matches_the_reference_layout():
+    for seed in range(60):
+        tree = parse_expression(random_expression(3 + seed, seed=seed))
+        layout = tidy_layout(tree)
+        assert np.allclose(layout.x, naive_layout(tree)[0]), seed
+
+
+def test_tidy_drawing_rules():
+    layout = tidy_layout(parse_expression(random_expression(201, seed=7)))
+    for parent, kids in enumerate(children(layout)):
+        if kids:
+            left, right = kids
+            assert layout.x[parent] == pytest.approx((layout.x[left] + layout.x[right]) / 2)
+            assert layout.y[left] == layout.y[right] == layout.y[parent] - 1
+    # Preorder is left to right on every level, and neighbours are at least SEPARATION apart.
+    for depth in np.unique(layout.y):
+        row = layout.x[layout.y == depth]
+        assert np.all(np.diff(row) >= SEPARATION - 1e-9)
+
+
+def test_equal_subtrees_are_drawn_alike():
+    shape = parse_expression("(a + b * c) - d / (e - f)")
+    layout = tidy_layout({"type": "BinaryOp", "op": "+", "left": shape, "right": {"type": "BinaryOp", "op": "*", "left": shape, "right": shape}})
+    size = len(tidy_layout(shape).x)
+    first = layout.x[1 : 1 + size] - layout.x[1]
+    for start in (size + 2, 2 * size + 2):
+        assert np.allclose(layout.x[start : start + size] - layout.x[start], first)
+
+
+def test_deep_trees_do_not_recurse():
+    expr = " + ".join(["x"] * 20000)
+    layout = tidy_layout(parse_expression(expr))
+    assert len(layout.x) == 39999
+    assert layout.y.min() == -19999
+    assert layout.labels[0] == "+" and layout.kinds[-1] == "Variable"
+
+
+def test_edge_segments_join_the_circles():
+    layout = tidy_layout(parse_expression("1 + x"))
+    segments = edge_segments(layout, radius=0.25)
+    assert segments.shape == (2, 2, 2)
+    assert np.allclose(segments[0], [[0.0, -0.25], [-SEPARATION / 2, -0.75]])
+
+
+def test_draw_tree_uses_two_collections():
+    figure, ax = plt.subplots()
+    try:
+        layout = draw_tree(parse_expression("a * (b + 2)"), ax)
+        assert isinstance(layout, TreeLayout)
+        assert len(ax.collections) == 2 and not ax.patches and not ax.lines
+        assert sorted(text.get_text() for text in ax.texts) == sorted(["*", "a", "+", "b", "2"])
+        big = tidy_layout(parse_expression(random_expression(1001, seed=1)))
+        ax.clear()
+        assert draw_tree(big, ax, label_limit=500) is big
+        assert not ax.texts
+        assert ax.get_xlim()[0] < big.x.min() and ax.get_ylim()[0] < big.y.min()
+    finally:
+        plt.close(figure)
@@ -0,0 +1,65 @@
+import gc
+
+import pytest
+
+from denot import earley
+from denot.earley import parse_forest
+from denot.parser import ParseError
+from generators import ARITHMETIC, BALANCED, IF_THEN_ELSE, SIMPLE, arithmetic_tokens
+
+
+def test_left_recursive_grammar_has_one_tree():
+    forest = parse_forest(ARITHMETIC, "id + id * id")
+    assert not forest.is_ambiguous()
+    assert list(forest.trees()) == [
+        ("E", [("E", [("T", [("F", ["id"])])]), "+", ("T", [("T", [("F", ["id"])]), "*", ("F", ["id"])])])
+    ]
+
+
+def test_ambiguous_grammar_shares_nodes():
+    forest = parse_forest(IF_THEN_ELSE, "if id then if id then print id else print num")
+    # The dangling else attaches to either if.
+    assert forest.is_ambiguous() and forest.count_trees() == 2
+    assert len(list(forest.trees())) == 2
+    sums = parse_forest(IF_THEN_ELSE, ["id", "="] + " + ".join(["id"] * 12).split())
+    assert sums.count_trees() == 58786  # Catalan(11)
+    assert sums.node_count() < 1000
+
+
+def test_epsilon_cycles_have_infinitely_many_trees():
+    forest = parse_forest(BALANCED, "( ) ( )")
+    assert forest.count_trees() == float("inf")
+    assert ("S", [("S", ["(", ("S", []), ")"]), ("S", ["(", ("S", []), ")"])]) in forest.trees(limit=5)
+    assert parse_forest(BALANCED, []).root is not None
+
+
+@pytest.mark.parametrize("tokens", [["a"] * 200 + ["b"] * 100, ["c"] * 300])
+def test_leo_items_give_the_same_forest(tokens):
+    with_leo = parse_forest(SIMPLE, tokens)
+    without = parse_forest(SIMPLE, tokens, leo=False)
+    assert with_leo.count_trees() == without.count_trees() == 1
+    assert list(with_leo.trees()) == list(without.trees())
+    assert with_leo.name(with_leo.root) == "S"
+
+
+@pytest.mark.parametrize("tokens, position", [("id + * id", 2), ("id +", 2), ("", 0), ("id id", 1)])
+def test_errors_report_the_token(tokens, position):
+    with pytest.raises(ParseError) as error:
+        parse_forest(ARITHMETIC, tokens)
+    assert error.value.position == position
+
+
+def test_collector_is_restored_after_long_inputs():
+    tokens = arithmetic_tokens(2 * earley.GC_PAUSE_TOKENS, seed=1)
+    assert gc.isenabled()
+    assert parse_forest(ARITHMETIC, tokens).count_trees() == 1
+    assert gc.isenabled()
+    with pytest.raises(ParseError):
+        parse_forest(ARITHMETIC, tokens + ["+"])
+    assert gc.isenabled()
+    gc.disable()
+    try:
+        parse_forest(ARITHMETIC, tokens)
+        assert not gc.isenabled()
+    finally:
+        gc.enable()
@@ -0,0 +1,37 @@
+from denot.environment import Environment
+
+
+def test_iterates_in_insertion_order():
+    env = Environment([("b", 1), ("a", 2)])
+    env = env.set("z", 3).set("c", 4).set("b", 5)
+    assert list(env) == ["b", "a", "z", "c"]
+    assert dict(env) == {"b": 5, "a": 2, "z": 3, "c": 4}
+    assert list(env.update({"y": 0, "a": 9})) == ["b", "a", "z", "c", "y"]
+
+
+def test_collisions_keep_order_and_values():
+    class Key:
+        def __init__(self, name):
+            self.name = name
+
+        def __hash__(self):
+            return 7
+
+        def __eq__(self, other):
+            return isinstance(other, Key) and other.name == self.name
+
+    keys = [Key(name) for name in "pqrs"]
+    env = Environment()
+    for value, key in enumerate(keys):
+        env = env.set(key, value)
+    env = env.set(Key("q"), 10)
+    assert [key.name for key in env] == ["p", "q", "r", "s"]
+    assert [env[key] for key in keys] == [0, 10, 2, 3]
+
+
+def test_many_keys():
+    env = Environment()
+    for i in range(2000):
+        env = env.set(f"k{(i * 7919) % 2000}", i)
+    assert list(env) == [f"k{(i * 7919) % 2000}" for i in range(2000)]
+    assert len(env) == 2000 and env["k0"] == 0
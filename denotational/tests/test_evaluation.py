@@ -0,0 +1,70 @@
+import math
+import random
+
+import pytest
+
+from denot.bytecode import Program, compile_program, load
+from denot.compiler import compile_tree
+from denot.evaluator import INF, evaluate_tree
+from denot.parser import parse_expression
+from generators import random_expression
+
+
+def same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b and type(a) is type(b)
+
+
+def environments(rng, count=5):
+    names = ["x", "y", "z", "a", "b", "c"]
+    yield {}
+    for _ in range(count):
+        yield {name: rng.choice([0, 1, -2, 3, 0.5, 7]) for name in names if rng.random() < 0.8}
+
+
+@pytest.mark.parametrize(
+    "expr, variables, expected",
+    [
+        ("2 + 3 * 4", {}, 14),
+        ("(x + y) * z", {"x": 1, "y": 2, "z": 3}, 9),
+        ("7 / 2", {}, 3.5),
+        ("1 / 0", {}, INF),
+        ("1 / x", {}, INF),
+        ("unknown + 1", {}, 1),
+    ],
+)
+def test_evaluate_tree(expr, variables, expected):
+    tree = parse_expression(expr)
+    assert evaluate_tree(tree, variables) == expected
+    assert evaluate_tree(tree, variables, iterative=True) == expected
+
+
+def test_backends_agree_on_random_expressions():
+    rng = random.Random(0)
+    for seed in range(60):
+        tree = parse_expression(random_expression(rng.choice([5, 40, 200]), seed=seed))
+        compiled = compile_tree(tree)
+        program = compile_program(tree)
+        for variables in environments(rng):
+            expected = evaluate_tree(tree, variables)
+            assert same(evaluate_tree(tree, variables, iterative=True), expected)
+            assert same(compiled(variables), expected)
+            assert same(program.evaluate(variables), expected)
+
+
+def test_deep_trees_compile_without_recursion():
+    depth = 20000
+    tree = parse_expression(" + ".join(["x"] * depth), iterative=True)
+    assert compile_tree(tree)({"x": 2}) == 2 * depth
+    assert compile_program(tree).evaluate({"x": 2}) == 2 * depth
+
+
+def test_bytecode_round_trip(tmp_path):
+    tree = parse_expression("x * 2.5 + 3 - y / 4")
+    program = compile_program(tree)
+    variables = {"x": 2, "y": 8}
+    assert Program.from_bytes(program.to_bytes()).evaluate(variables) == program.evaluate(variables) == 6.0
+    path = tmp_path / "program.bin"
+    program.save(path)
+    assert load(path).evaluate(variables) == program.evaluate(variables)
@@ -0,0 +1,55 @@
+import pytest
+
+from denot.evaluator import INF, apply_op, evaluate_tree
+from denot.parser import parse_expression, parse_tokens, tokenize
+from generators import random_expression
+
+DEPTH = 200000
+
+
+@pytest.mark.parametrize(
+    "op, left, right, expected",
+    [("+", 2, 3, 5), ("-", 2, 3, -1), ("*", 2, 3, 6), ("/", 3, 2, 1.5), ("/", 1, 0, INF), ("%", 1, 2, 0)],
+)
+def test_apply_op(op, left, right, expected):
+    assert apply_op(op, left, right) == expected
+
+
+def test_unknown_nodes_evaluate_to_zero():
+    tree = {"type": "BinaryOp", "op": "+", "left": {"type": "Unknown"}, "right": {"type": "Number", "value": 2}}
+    assert evaluate_tree(tree) == evaluate_tree(tree, iterative=True) == 2
+
+
+def test_left_deep_chain():
+    tree = parse_expression(" - ".join(["1"] * DEPTH), iterative=True)
+    assert evaluate_tree(tree, iterative=True) == 1 - (DEPTH - 1)
+
+
+def test_right_deep_nesting():
+    # 1 - (1 - (1 - ...)) alternates between 0 and 1.
+    expr = "1 - (" * DEPTH + "1" + ")" * DEPTH
+    tree = parse_expression(expr, iterative=True)
+    assert evaluate_tree(tree, {}, iterative=True) == (DEPTH + 1) % 2
+
+
+def test_deep_unary_minus():
+    tree = parse_expression("-" * 1001 + "x", iterative=True)
+    assert evaluate_tree(tree, {"x": 2}, iterative=True) == -2
+    assert parse_expression("-" * 1001 + "3", iterative=True) == {"type": "Number", "value": -3}
+
+
+def test_recursive_mode_still_hits_the_recursion_limit():
+    tree = parse_expression("(" * 5000 + "x" + " + 1)" * 5000, iterative=True)
+    with pytest.raises(RecursionError):
+        evaluate_tree(tree)
+    assert evaluate_tree(tree, {"x": 1}, iterative=True) == 5001
+
+
+def test_iterative_parser_matches_on_random_expressions():
+    for seed in range(50):
+        expr = random_expression(100, seed=seed)
+        tree = parse_expression(expr)
+        assert parse_expression(expr, iterative=True) == tree
+        assert parse_tokens(tokenize(expr), iterative=True) == tree
+        # repr, so that nan (inf - inf) compares equal to itself.
+        assert repr(evaluate_tree(tree, {"x": 2, "y": -1}, iterative=True)) == repr(evaluate_tree(tree, {"x": 2, "y": -1}))
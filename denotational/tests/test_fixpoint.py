@@ -0,0 +1,84 @@
+import pytest
+
+from denot.fixpoint import BOTTOM, Divergence, approximations, least_fixed_point, while_approximation, while_loop
+from denot.semantics import semantic_function
+
+
+def factorial(n):
+    if n == 0:
+        return 1
+    return n * (yield n - 1)
+
+
+def fibonacci(n):
+    if n < 2:
+        return n
+    return (yield n - 1) + (yield n - 2)
+
+
+def test_least_fixed_point():
+    f = least_fixed_point(factorial)
+    assert [f(n) for n in range(6)] == [1, 1, 2, 6, 24, 120]
+    assert least_fixed_point(fibonacci)(90) == 2880067194370816120
+
+
+def test_deep_recursion_needs_no_python_stack():
+    f = least_fixed_point(factorial)
+    assert f(20000) % 10**10 == 0
+    assert f.steps == 20001
+
+
+def test_values_are_memoized():
+    f = least_fixed_point(factorial)
+    f(50)
+    steps = f.steps
+    assert f(50) == f(50) and f.steps == steps
+    f(51)
+    assert f.steps == steps + 1
+
+
+def test_divergence():
+    def loop(n):
+        return (yield n)
+
+    with pytest.raises(Divergence) as error:
+        least_fixed_point(loop)(3)
+    assert error.value.argument == 3
+
+    def climb(n):
+        return (yield n + 1)
+
+    with pytest.raises(Divergence):
+        least_fixed_point(climb, budget=1000)(0)
+
+
+def test_kleene_chain():
+    chain = approximations(factorial)
+    iterates = [next(chain) for _ in range(5)]
+    assert repr(iterates[2]) == "F^2(⊥)"
+    # F^k(⊥)(n) is defined exactly when n < k.
+    assert [[iterate(n) for n in range(5)] for iterate in iterates] == [
+        [BOTTOM] * 5,
+        [1, BOTTOM, BOTTOM, BOTTOM, BOTTOM],
+        [1, 1, BOTTOM, BOTTOM, BOTTOM],
+        [1, 1, 2, BOTTOM, BOTTOM],
+        [1, 1, 2, 6, BOTTOM],
+    ]
+    assert not BOTTOM and repr(BOTTOM) == "⊥"
+
+
+def test_while():
+    loop = while_loop(lambda n: n < 10, lambda n: n + 3)
+    assert loop(0) == 12
+    assert loop(20) == 20
+    with pytest.raises(Divergence):
+        while_loop(lambda n: True, lambda n: n, budget=50)(0)
+    approximation = while_approximation(lambda n: n < 10, lambda n: n + 3, 4)
+    assert approximation(0) is BOTTOM and approximation(1) == 10
+
+
+def test_semantic_functions():
+    loop = semantic_function("while", (lambda env: env.get("i", 0) < 5, lambda env: env.set("i", env.get("i", 0) + 1)))
+    assert dict(loop({})) == {"i": 5}
+    f = semantic_function("recursion", (factorial,))
+    assert f(10) == 3628800
@@ -0,0 +1,108 @@
+import pytest
+
+from denot.grammar import END, analyze, compile_grammar, proper_form
+from generators import random_grammar
+
+LL1 = {
+    "E": ["T E'"],
+    "E'": ["+ T E'", ""],
+    "T": ["F T'"],
+    "T'": ["* F T'", ""],
+    "F": ["( E )", "id"],
+}
+
+
+def naive_sets(rules):
+    """Nullable, FIRST and FOLLOW by iterating the textbook equations to a fixed point."""
+    nullable = set()
+    first = {name: set() for name in rules}
+    follow = {name: set() for name in rules}
+    follow[next(iter(rules))].add(END)
+
+    def first_of(symbols):
+        result = set()
+        for symbol in symbols:
+            if symbol not in rules:
+                return result | {symbol}, False
+            result |= first[symbol]
+            if symbol not in nullable:
+                return result, False
+        return result, True
+
+    changed = True
+    while changed:
+        changed = False
+        for lhs, bodies in rules.items():
+            for body in bodies:
+                symbols = body.split()
+                terminals, empty = first_of(symbols)
+                if empty and lhs not in nullable:
+                    nullable.add(lhs)
+                    changed = True
+                if not terminals <= first[lhs]:
+                    first[lhs] |= terminals
+                    changed = True
+                for index, symbol in enumerate(symbols):
+                    if symbol in rules:
+                        after, rest_empty = first_of(symbols[index + 1 :])
+                        if rest_empty:
+                            after = after | follow[lhs]
+                        if not after <= follow[symbol]:
+                            follow[symbol] |= after
+                            changed = True
+    return nullable, first, follow
+
+
+def test_textbook_first_and_follow():
+    analysis = analyze(LL1)
+    assert analysis.is_nullable("E'") and analysis.is_nullable("T'") and not analysis.is_nullable("E")
+    assert analysis.first_of("E") == {"(", "id"}
+    assert analysis.first_of("E'") == {"+"}
+    assert analysis.first_of("+") == {"+"}
+    assert analysis.follow_of("E") == {")", END}
+    assert analysis.follow_of("T") == {"+", ")", END}
+    assert analysis.follow_of("F") == {"+", "*", ")", END}
+    assert analysis.table()[0] == ("E", False, ["(", "id"], [END, ")"])
+
+
+def test_matches_naive_iteration_on_random_grammars():
+    for seed in range(40):
+        rules = random_grammar(6, 4, 14, seed=seed)
+        analysis = analyze(rules)
+        nullable, first, follow = naive_sets(rules)
+        for name in rules:
+            assert analysis.is_nullable(name) == (name in nullable), (rules, name)
+            assert analysis.first_of(name) == first[name], (rules, name)
+            assert analysis.follow_of(name) == follow[name], (rules, name)
+
+
+def test_unreachable_and_unproductive():
+    rules = {"S": ["a S", "b"], "Loop": ["Loop c"], "Lost": ["d"], "Uses": ["S Loop"]}
+    analysis = analyze(rules)
+    assert analysis.unproductive() == ["Loop", "Uses"]
+    assert analysis.unreachable() == ["Loop", "Lost", "Uses"]
+
+
+def test_symbol_ids():
+    grammar = compile_grammar({"S": ["a S b", ""]})
+    assert grammar.nonterminals == ["S"] and grammar.terminals == ["a", "b", END]
+    assert grammar.productions[0].rhs == (1, 0, 2) and grammar.productions[1].rhs == ()
+    assert compile_grammar({"S": ["a S b", ""]}) is grammar
+    assert compile_grammar({"A": ["x"], "S": ["A"]}, start="S").nonterminals == ["S", "A"]
+    assert grammar.digest != compile_grammar({"S": ["a S b", "c"]}).digest
+
+
+@pytest.mark.parametrize("rules, start", [({}, None), ({"S": ["a"]}, "T"), ({"S": ["$"]}, None)])
+def test_invalid_grammars(rules, start):
+    with pytest.raises(ValueError):
+        compile_grammar(rules, start)
+
+
+def test_proper_form():
+    form = proper_form({"S": ["A B", "c"], "A": ["a", ""], "B": ["A", "b"]})
+    grammar = form.grammar
+    bodies = {(grammar.nonterminals[lhs], " ".join(grammar.names(rhs))) for lhs, rhs in form.productions}
+    assert form.has_empty
+    assert all(rhs for _, rhs in form.productions)
+    assert not any(len(rhs) == 1 and grammar.is_nonterminal(rhs[0]) for _, rhs in form.productions)
+    assert {body for lhs, body in bodies if lhs == "S"} == {"A B", "a", "b", "c"}
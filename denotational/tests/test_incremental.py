@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from denot.incremental import IncrementalParser
+from denot.parser import ParseError, parse_expression
+from generators import random_expression
+
+
+def test_edit_inside_a_leaf():
+    parser = IncrementalParser("(a + b) * (c - 12)")
+    left = parser.tree["left"]
+    tree = parser.edit(15, 17, "345")
+    assert parser.last_mode == "leaf" and parser.reparsed_tokens == 1
+    assert tree == parse_expression("(a + b) * (c - 345)")
+    assert tree["left"] is left
+
+
+def test_edit_inside_parentheses():
+    parser = IncrementalParser("(a + b) * (c - 12)")
+    right = parser.tree["right"]
+    tree = parser.update("(a * b * d) * (c - 12)")
+    assert parser.last_mode == "group"
+    assert tree == parse_expression("(a * b * d) * (c - 12)")
+    assert tree["right"] is right
+
+
+def test_top_level_edits_reparse_everything():
+    parser = IncrementalParser("a + b")
+    parser.update("a * b")
+    assert parser.last_mode == "full"
+    parser.update("a * b")
+    assert parser.last_mode == "unchanged" and parser.reparsed_tokens == 0
+
+
+def test_unary_minus_folding_is_kept():
+    parser = IncrementalParser("x * -3")
+    assert parser.update("x * -35") == parse_expression("x * -35")
+    parser = IncrementalParser("y - (4)")
+    assert parser.update("y - (-4)") == parse_expression("y - (-4)")
+
+
+def test_errors_then_recovery():
+    parser = IncrementalParser("(a + b) * c")
+    with pytest.raises(ParseError) as error:
+        parser.update("(a + ) * c")
+    assert error.value.position == 5
+    assert parser.update("(a + 2) * c") == parse_expression("(a + 2) * c")
+    with pytest.raises(ParseError):
+        parser.update("1 + " + "9" * 5000)
+
+
+def test_random_edits_agree_with_a_full_parse():
+    rng = random.Random(1)
+    alphabet = ["x", "y", "7", "12", "+", "-", "*", "/", "(", ")", " ", "3.5", ""]
+    modes = set()
+    for seed in range(30):
+        text = random_expression(60, seed=seed)
+        parser = IncrementalParser(text)
+        for _ in range(30):
+            start = rng.randrange(len(text) + 1)
+            end = min(len(text), start + rng.choice([0, 0, 1, 2]))
+            new_text = text[:start] + rng.choice(alphabet) + text[end:]
+            try:
+                expected = parse_expression(new_text)
+            except ParseError:
+                with pytest.raises(ParseError):
+                    parser.update(new_text)
+                parser = IncrementalParser(text)
+                continue
+            assert parser.update(new_text) == expected, (text, new_text)
+            modes.add(parser.last_mode)
+            text = new_text
+    assert {"leaf", "group", "full"} <= modes
@@ -0,0 +1,79 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from denot.evaluator import evaluate_tree
+from denot.intervals import evaluate_intervals
+from denot.parser import parse_expression
+from generators import random_expression
+
+
+def bounds_of(expr, **bounds):
+    result = evaluate_intervals(parse_expression(expr), {name: ([lo], [hi]) for name, (lo, hi) in bounds.items()})
+    return result.lower[0], result.upper[0], bool(result.maybe_nan[0])
+
+
+def test_basic_bounds():
+    assert bounds_of("x + y", x=(1, 2), y=(-5, 3)) == (-4, 5, False)
+    assert bounds_of("x - y", x=(1, 2), y=(-5, 3)) == (-2, 7, False)
+    assert bounds_of("x * y", x=(-2, 3), y=(-5, 4)) == (-15, 12, False)
+    assert bounds_of("z * 2", x=(0, 1)) == (0, 0, False)
+
+
+def test_division_through_zero_contains_inf():
+    lower, upper, nan = bounds_of("1 / x", x=(-1, 1))
+    assert lower == -math.inf and upper == math.inf and not nan
+    # Only inf itself: the lower end is widened by one ulp like every huge bound.
+    lower, upper, _ = bounds_of("1 / x", x=(0, 0))
+    assert lower > 1e308 and upper == math.inf
+    assert bounds_of("1 / x", x=(2, 4)) == (0.25, 0.5, False)
+
+
+def test_nan_is_flagged():
+    assert bounds_of("x - x", x=(0, math.inf))[2]
+    assert bounds_of("(1 / x) * 0", x=(0, 1))[2]
+    assert not bounds_of("x * 0", x=(0, 1))[2]
+
+
+def test_large_ints_are_widened_by_one_ulp():
+    big = 2**53 + 1
+    lower, upper, _ = bounds_of(f"{big} + x", x=(0, 0))
+    assert lower < big < upper
+
+
+def test_invalid_intervals():
+    with pytest.raises(ValueError):
+        evaluate_intervals(parse_expression("x"), {"x": (2, 1)})
+    with pytest.raises(ValueError):
+        evaluate_intervals(parse_expression("x"), {"x": (float("nan"), 1)})
+
+
+def test_batches_broadcast():
+    result = evaluate_intervals(parse_expression("x * y"), {"x": (np.array([0, -1]), np.array([1, 1])), "y": (2, 3)})
+    np.testing.assert_array_equal(result.lower, [0, -3])
+    np.testing.assert_array_equal(result.upper, [3, 3])
+
+
+def test_sound_on_random_expressions():
+    rng = random.Random(4)
+    ends = [-math.inf, -3, -1, -0.5, 0, 0.5, 1, 2, math.inf]
+    for seed in range(80):
+        tree = parse_expression(random_expression(12, seed=seed))
+        bounds = {}
+        for name in "xyz":
+            lo, hi = sorted(rng.sample(ends, 2))
+            bounds[name] = (lo, hi)
+        result = evaluate_intervals(tree, {name: ([lo], [hi]) for name, (lo, hi) in bounds.items()})
+        lower, upper, maybe_nan = result.lower[0], result.upper[0], result.maybe_nan[0]
+        for _ in range(40):
+            point = {}
+            for name, (lo, hi) in bounds.items():
+                inside = [end for end in ends if lo <= end <= hi] + [rng.uniform(max(lo, -10), min(hi, 10))]
+                point[name] = rng.choice(inside)
+            value = evaluate_tree(tree, point)
+            if math.isnan(value):
+                assert maybe_nan, (tree, point)
+            else:
+                assert lower <= value <= upper, (tree, point, value, lower, upper)
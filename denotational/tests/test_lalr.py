@@ -0,0 +1,90 @@
+import os
+
+import pytest
+
+from denot import lalr
+from denot.parser import ParseError, parse_expression, token_texts
+from generators import ARITHMETIC, IF_THEN_ELSE, ast_reducer, terminal
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    # parse_table keeps built tables in memory; start every test from the disk.
+    monkeypatch.setattr(lalr, "_tables", {})
+
+
+def test_parse_and_errors(fresh):
+    table = lalr.parse_table(ARITHMETIC, cache_dir=None)
+    assert not table.conflicts
+    assert table.parse("id + num * ( id )")[0] == "E"
+    with pytest.raises(ParseError):
+        table.parse("id + * num")
+
+
+def test_table_is_cached_on_disk(fresh, tmp_path):
+    table = lalr.parse_table(ARITHMETIC, cache_dir=str(tmp_path))
+    (name,) = os.listdir(tmp_path)
+    assert name.endswith(".lalr")
+    lalr._tables.clear()
+    loaded = lalr.parse_table(ARITHMETIC, cache_dir=str(tmp_path))
+    assert loaded is not table
+    assert loaded.to_bytes() == table.to_bytes()
+
+
+@pytest.mark.parametrize("damage", [lambda data: data[: len(data) // 2], lambda data: data[:-3], lambda data: b"junk"])
+def test_damaged_cache_files_are_rebuilt(fresh, tmp_path, damage):
+    table = lalr.parse_table(ARITHMETIC, cache_dir=str(tmp_path))
+    (name,) = os.listdir(tmp_path)
+    path = tmp_path / name
+    path.write_bytes(damage(path.read_bytes()))
+    lalr._tables.clear()
+    rebuilt = lalr.parse_table(ARITHMETIC, cache_dir=str(tmp_path))
+    assert rebuilt.to_bytes() == table.to_bytes()
+
+
+def test_failed_cache_write_leaves_no_temporary_file(fresh, tmp_path, monkeypatch):
+    def replace(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(lalr.os, "replace", replace)
+    table = lalr.parse_table(ARITHMETIC, cache_dir=str(tmp_path))
+    assert table.parse("id * num")[0] == "E"
+    assert os.listdir(tmp_path) == []
+
+
+def test_lalr_but_not_slr_grammar_has_no_conflicts(fresh):
+    rules = {"S": ["L = R", "R"], "L": ["* R", "id"], "R": ["L"]}
+    table = lalr.parse_table(rules, cache_dir=None)
+    assert table.conflicts == [] and table.report() == []
+    assert table.parse("* id = id") == ("S", [("L", ["*", ("R", [("L", ["id"])])]), "=", ("R", [("L", ["id"])])])
+
+
+def test_dangling_else_prefers_shift(fresh):
+    table = lalr.parse_table(IF_THEN_ELSE, cache_dir=None)
+    report = table.report()
+    assert any("'else': shift/reduce conflict, shift to state" in line for line in report)
+    tree = table.parse("if id then if id then print id else print num")
+    # Shifting 'else' attaches it to the inner if.
+    assert tree[1][:3] == ["if", ("E", ["id"]), "then"] and len(tree[1]) == 4
+
+
+def test_epsilon_productions(fresh):
+    table = lalr.parse_table({"S": ["( S ) S", ""]}, cache_dir=None)
+    assert not table.conflicts
+    assert table.parse([]) == ("S", [])
+    with pytest.raises(ParseError) as error:
+        table.parse("( ) )")
+    assert error.value.position == 2
+
+
+def test_reduce_and_kind_callbacks(fresh):
+    table = lalr.parse_table(ARITHMETIC, cache_dir=None)
+    tree = table.parse(token_texts("(x + 2) * y"), reduce=ast_reducer(table.grammar), kind=terminal)
+    assert tree == parse_expression("(x + 2) * y")
+
+
+def test_parser_loads_its_table_on_first_parse(fresh, tmp_path):
+    parser = lalr.LALRParser(ARITHMETIC, cache_dir=str(tmp_path))
+    assert os.listdir(tmp_path) == []
+    assert parser.parse("id")[0] == "E"
+    assert len(os.listdir(tmp_path)) == 1
@@ -0,0 +1,87 @@
+import random
+
+import networkx as nx
+import pytest
+
+from denot.layout import LayoutCache, _isotonic, graph_key, layered_layout
+
+
+def reference_isotonic(desired):
+    """The min-max formula for x[i + 1] >= x[i] + 1: y[i] = max over j <= i of min over k >= i of mean(z[j..k])."""
+    z = [value - index for index, value in enumerate(desired)]
+    n = len(z)
+    y = [max(min(sum(z[j : k + 1]) / (k + 1 - j) for k in range(i, n)) for j in range(i + 1)) for i in range(n)]
+    return [value + index for index, value in enumerate(y)]
+
+
+def test_isotonic_matches_the_min_max_formula():
+    rng = random.Random(0)
+    for _ in range(200):
+        desired = [rng.choice([0, 0.5, 1, 2, 3, -1]) + rng.random() for _ in range(rng.randint(1, 9))]
+        result = _isotonic(desired)
+        assert result == pytest.approx(reference_isotonic(desired))
+        assert all(b >= a + 1 - 1e-9 for a, b in zip(result, result[1:]))
+
+
+def test_isotonic_keeps_feasible_input():
+    assert _isotonic([0, 2, 5]) == [0, 2, 5]
+    # Two nodes wanting the same spot are pushed half a gap each way.
+    assert _isotonic([1, 1]) == [0.5, 1.5]
+
+
+def grammar_graph(rules):
+    graph = nx.DiGraph()
+    for lhs, bodies in rules.items():
+        graph.add_node(lhs)
+        for body in bodies:
+            for symbol in body.split():
+                graph.add_edge(lhs, symbol)
+    return graph
+
+
+RULES = {"E": ["E + T", "T"], "T": ["T * F", "F"], "F": ["( E )", "id", "num"]}
+
+
+def check_layers(positions):
+    rows = {}
+    for x, y in positions.values():
+        rows.setdefault(y, []).append(x)
+    for xs in rows.values():
+        xs.sort()
+        assert all(b - a >= 1 - 1e-9 for a, b in zip(xs, xs[1:]))
+
+
+def test_layers_follow_breadth_first_depth():
+    positions = layered_layout(grammar_graph(RULES), roots=["E"])
+    assert positions["E"][1] == 0 and positions["T"][1] == -1 and positions["F"][1] == -2
+    # Terminals sit below their deepest parent.
+    assert positions["id"][1] == -3 and positions["+"][1] < positions["E"][1]
+    check_layers(positions)
+
+
+def test_layout_is_deterministic():
+    graph = grammar_graph(RULES)
+    assert layered_layout(graph, roots=["E"]) == layered_layout(grammar_graph(RULES), roots=["E"])
+    assert graph_key(graph) == graph_key(grammar_graph(RULES))
+    assert layered_layout(nx.DiGraph()) == {}
+
+
+def test_incremental_update_keeps_old_nodes_in_order():
+    before = layered_layout(grammar_graph(RULES), roots=["E"])
+    assert layered_layout(grammar_graph(RULES), roots=["E"], previous=before) == before
+    grown = dict(RULES, F=RULES["F"] + ["- F", "sqrt ( E )"])
+    after = layered_layout(grammar_graph(grown), roots=["E"], previous=before)
+    check_layers(after)
+    for y in {y for _, y in before.values()}:
+        old = [node for node in before if before[node][1] == y and after[node][1] == y]
+        assert sorted(old, key=lambda node: before[node][0]) == sorted(old, key=lambda node: after[node][0])
+    assert {"-", "sqrt"} <= set(after)
+
+
+def test_cache():
+    cache = LayoutCache(max_entries=1)
+    graph = grammar_graph(RULES)
+    first = cache.layout(graph, roots=["E"])
+    assert cache.layout(grammar_graph(RULES), roots=["E"]) is first
+    cache.layout(grammar_graph({"S": ["a"]}), roots=["S"])
+    assert len(cache) == 1 and (cache.hits, cache.misses) == (1, 2)
@@ -0,0 +1,128 @@
+import numpy as np
+import pytest
+
+from denot import live
+from denot.parser import parse_expression
+
+
+def bar_panel(capacity=8):
+    figure = live.LiveFigure(figsize=(6, 4), dpi=50)
+    view = live.BarView(figure, figure.figure.add_subplot(1, 1, 1), capacity=capacity)
+    return figure, view
+
+
+def shown(view):
+    return [bar.get_height() for bar in view.bars if bar.get_visible()]
+
+
+def test_bars_are_reused():
+    figure, view = bar_panel()
+    view.update(["x", "y"], [1, 2], "blue", "first")
+    bars = list(view.bars)
+    view.update(["x", "y", "z"], [2, 3, float("inf")], "red", "second")
+    assert view.bars == bars
+    assert shown(view) == [2, 3, 0]
+    assert figure.png is not None
+
+
+def test_background_is_kept_while_the_limits_are():
+    figure, view = bar_panel()
+    view.update(["x", "y"], [1, 2], "blue", "first")
+    view.update(["x", "y"], [1.5, 2.1], "blue", "second")
+    assert (figure.full_draws, figure.blits) == (1, 1)
+    view.update(["x", "y"], [1.5, 40], "blue", "third")
+    assert figure.full_draws == 2
+
+
+def test_more_values_than_capacity_grow_the_pool():
+    figure, view = bar_panel(capacity=2)
+    view.update(["a", "b"], [1, 2], "blue", "two")
+    values = list(range(1, 10))
+    view.update([f"v{i}" for i in values], values, "green", "nine")
+    assert len(view.bars) >= 9
+    assert shown(view) == values
+    assert all(bar in figure.animated for bar in view.bars)
+    assert [tick.get_text() for tick in view.ax.get_xticklabels()] == [f"v{i}" for i in values]
+    assert view.ax.get_xlim() == (-0.6, 8.6)
+    view.update(["a"], [np.float64(3)], "blue", "one")
+    assert shown(view) == [3]
+
+
+def test_earlier_scenes_are_blitted_from_cache():
+    figure, view = bar_panel()
+    view.update(["x", "y"], [1, 2], "blue", "small")
+    view.update(["x", "y"], [1, 200], "blue", "large")
+    view.update(["x", "y"], [1, 2], "blue", "small again")
+    assert (figure.full_draws, figure.blits) == (2, 1)
+    figure.invalidate()
+    view.update(["x", "y"], [1, 2], "blue", "after invalidate")
+    assert figure.full_draws == 3
+
+
+def test_text_pool_reuses_and_hides_texts():
+    figure = live.LiveFigure(figsize=(4, 4), dpi=50)
+    pool = live.TextPool(figure, figure.figure.add_subplot(1, 1, 1))
+    pool.update([0, 1, 2], [0, 1, 2], ["a", "b", "c"])
+    texts = list(pool.texts)
+    pool.update([5], [6], ["d"])
+    assert pool.texts == texts
+    assert [text.get_text() for text in texts if text.get_visible()] == ["d"]
+    assert texts[0].get_position() == (5, 6)
+    assert all(text in figure.animated for text in texts)
+
+
+def test_tree_view_updates_its_collections_in_place():
+    figure = live.LiveFigure(figsize=(4, 4), dpi=50)
+    ax = figure.figure.add_subplot(1, 1, 1)
+    view = live.TreeView(figure, ax, label_limit=10)
+    layout = view.update(parse_expression("a * (b + 2)"))
+    artists = (view.nodes, view.edges)
+    assert len(view.nodes.get_offsets()) == 5 and len(view.edges.get_segments()) == 4
+    assert sorted(text.get_text() for text in view.labels.texts if text.get_visible()) == sorted(layout.labels)
+    view.update(parse_expression(" + ".join("abcdefgh")))
+    assert (view.nodes, view.edges) == artists and len(ax.collections) == 2
+    assert len(view.nodes.get_offsets()) == 15
+    assert not any(text.get_visible() for text in view.labels.texts)
+    assert figure.full_draws == 1 and figure.blits == 1
+
+
+def test_graph_view_draws_nodes_edges_and_labels():
+    import networkx as nx
+
+    graph = nx.DiGraph()
+    graph.add_node("S", node_type="non_terminal")
+    graph.add_node("a", node_type="terminal")
+    graph.add_edge("S", "a", label="1")
+    graph.add_edge("S", "S", label="loop")
+    figure = live.LiveFigure(figsize=(4, 4), dpi=50)
+    view = live.GraphView(figure, figure.figure.add_subplot(1, 1, 1))
+    view.update(graph, {"S": (0, 0), "a": (1, -1)}, "Grammar")
+    assert view.nonterminals.get_offsets().tolist() == [[0, 0]]
+    assert view.terminals.get_offsets().tolist() == [[1, -1]]
+    assert len(view.edges.get_segments()) == 1
+    assert [text.get_text() for text in view.edge_labels.texts if text.get_visible()] == ["1"]
+    assert view.title.get_text() == "Grammar" and figure.png is not None
+
+
+def test_latency_log(monkeypatch):
+    clock = iter([0.0, 0.002, 1.0, 1.010])
+    monkeypatch.setattr(live.time, "perf_counter", lambda: next(clock))
+    log = live.LatencyLog()
+
+    class Status:
+        value = ""
+
+    status = Status()
+
+    @log.timed("update", status)
+    def update(value):
+        """Widget callback."""
+        return value + 1
+
+    assert update(1) == 2 and update(2) == 3
+    assert update.__doc__ == "Widget callback."
+    assert status.value == "update: 10 ms (median 6 ms over 2 calls)"
+    (name, calls, median, longest), = log.report()
+    assert (name, calls) == ("update", 2)
+    assert (median, longest) == (pytest.approx(6.0), pytest.approx(10.0))
+    assert log.describe("other") == "other: no calls"
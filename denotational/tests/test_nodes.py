@@ -0,0 +1,64 @@
+import math
+
+from denot.evaluator import evaluate_tree
+from denot.nodes import NodeStore, evaluate, evaluate_all, to_dict
+from denot.parser import parse_expression
+from generators import random_expression
+
+
+def test_identical_subtrees_are_one_node():
+    store = NodeStore()
+    a = store.from_dict(parse_expression("(x + 1) * (x + 1)"))
+    assert a.left is a.right
+    b = store.from_dict(parse_expression("(x + 1) - 2"))
+    assert b.left is a.left
+    # x, 1, x + 1, the product, 2 and the difference.
+    assert len(store) == 6
+
+
+def test_numbers_are_interned_by_type_and_repr():
+    store = NodeStore()
+    assert store.number(1) is store.number(1)
+    assert len({store.number(1), store.number(1.0), store.number(True)}) == 3
+    assert store.number(0.0) is not store.number(-0.0)
+    assert store.number(float("nan")) is store.number(float("nan"))
+
+
+def test_nodes_have_slots():
+    node = NodeStore().variable("x")
+    assert not hasattr(node, "__dict__")
+
+
+def test_round_trip_and_evaluation_match_the_dicts():
+    store = NodeStore()
+    variables = {"x": 3, "y": -2}
+    for seed in range(40):
+        tree = parse_expression(random_expression(60, seed=seed))
+        root = store.from_dict(tree)
+        assert to_dict(root) == tree
+        expected = evaluate_tree(tree, variables)
+        value = evaluate(root, variables)
+        assert value == expected or (math.isnan(value) and math.isnan(expected))
+
+
+def test_shared_subexpressions_are_evaluated_once():
+    store = NodeStore()
+    square = parse_expression("(x * x)")
+    roots = [store.from_dict({"type": "BinaryOp", "op": "+", "left": square, "right": {"type": "Number", "value": n}}) for n in range(5)]
+    memo = {}
+    assert [evaluate(root, {"x": 3}, memo) for root in roots] == [9, 10, 11, 12, 13]
+    # x, x * x, five constants and five sums: the square is memoized once.
+    assert len(memo) == 12
+    assert evaluate_all(roots, {"x": 2}) == [4, 5, 6, 7, 8]
+
+
+def test_shared_dicts_and_deep_trees():
+    store = NodeStore()
+    root = store.from_dict(parse_expression(" + ".join(["x"] * 50000), iterative=True))
+    assert evaluate(root, {"x": 2}) == 100000
+    tree = to_dict(root)
+    assert tree["right"] == {"type": "Variable", "name": "x"}
+    pair = store.from_dict(parse_expression("(y - 1) * (y - 1)"))
+    shared = to_dict(pair)
+    assert shared["left"] is shared["right"]
+    assert store.from_dict({"type": "Unknown"}) is store.number(0)
@@ -0,0 +1,157 @@
+import json
+import os
+
+import pytest
+
+from denot import notebook_cache
+from denot.notebook_cache import ENV_VARS, NotebookCache, local_modules, notebook_key
+from denot.precompute import ASSET_DIR, AssetStore, content_name
+
+
+def notebook(*cells, kernel="python3"):
+    return {
+        "cells": [{"cell_type": kind, "source": source} for kind, source in cells],
+        "metadata": {"kernelspec": {"name": kernel}},
+    }
+
+
+@pytest.fixture
+def book(tmp_path, monkeypatch):
+    for name in ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "__init__.py").write_text("")
+    (tmp_path / "pkg" / "draw.py").write_text("from . import colors\n\nWIDTH = 3\n")
+    (tmp_path / "pkg" / "colors.py").write_text("import math\n\nRED = 1\n")
+    (tmp_path / "pkg" / "unused.py").write_text("X = 1\n")
+    (tmp_path / "requirements.txt").write_text("numpy\n")
+    return tmp_path
+
+
+def key(book, nb, requirements=("requirements.txt",)):
+    return notebook_key(nb, str(book), [str(book / name) for name in requirements])
+
+
+BASE = notebook(("markdown", "# Title"), ("code", ["from pkg import draw\n", "print(draw.WIDTH)"]))
+
+
+def test_key_is_stable(book):
+    assert key(book, BASE) == key(book, BASE)
+
+
+def test_list_and_string_sources_hash_alike(book):
+    joined = notebook(("markdown", "# Title"), ("code", "from pkg import draw\nprint(draw.WIDTH)"))
+    assert key(book, joined) == key(book, BASE)
+
+
+def test_markdown_edits_keep_the_key(book):
+    edited = notebook(("markdown", "# Another title\n\nMore prose."), ("code", ["from pkg import draw\n", "print(draw.WIDTH)"]))
+    assert key(book, edited) == key(book, BASE)
+
+
+def test_code_edits_change_the_key(book):
+    edited = notebook(("markdown", "# Title"), ("code", ["from pkg import draw\n", "print(draw.WIDTH + 1)"]))
+    assert key(book, edited) != key(book, BASE)
+
+
+def test_kernel_changes_the_key(book):
+    other = notebook(("markdown", "# Title"), ("code", ["from pkg import draw\n", "print(draw.WIDTH)"]), kernel="python2")
+    assert key(book, other) != key(book, BASE)
+
+
+def test_requirements_change_the_key(book):
+    before = key(book, BASE)
+    (book / "requirements.txt").write_text("numpy==2.0\n")
+    assert key(book, BASE) != before
+    assert key(book, BASE, requirements=()) != key(book, BASE)
+
+
+def test_imported_modules_change_the_key(book):
+    before = key(book, BASE)
+    (book / "pkg" / "colors.py").write_text("import math\n\nRED = 2\n")
+    transitive = key(book, BASE)
+    assert transitive != before
+    (book / "pkg" / "draw.py").write_text("from . import colors\n\nWIDTH = 4\n")
+    assert key(book, BASE) != transitive
+
+
+def test_unimported_modules_keep_the_key(book):
+    before = key(book, BASE)
+    (book / "pkg" / "unused.py").write_text("X = 2\n")
+    assert key(book, BASE) == before
+
+
+def test_environment_variables_change_the_key(book, monkeypatch):
+    before = key(book, BASE)
+    monkeypatch.setenv(ENV_VARS[0], "1")
+    assert key(book, BASE) != before
+
+
+def test_local_modules_follow_imports(book):
+    sources = ["%matplotlib inline\nfrom pkg import draw", "import os"]
+    found = [path[len(str(book)) + 1 :] for path in local_modules(sources, str(book))]
+    assert sorted(found) == sorted(["pkg/__init__.py", "pkg/draw.py", "pkg/colors.py"])
+    assert local_modules(["this is not python"], str(book)) == []
+
+
+def write_book(root, names):
+    root.mkdir()
+    (root / "_config.yml").write_text("title: Test\nexecute:\n  execute_notebooks: force\n")
+    for name in names:
+        (root / name).write_text(json.dumps(notebook(("code", f"print({name!r})"))))
+    return root
+
+
+def unchanged(path, timeout, kernel_name=None):
+    """Stand-in for execute: the notebook as it is, without a kernel."""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_failed_notebooks_fail_the_run(tmp_path, monkeypatch, capsys):
+    book = write_book(tmp_path / "book", ["good.ipynb", "bad.ipynb"])
+
+    def execute(path, timeout, kernel_name=None):
+        if path.endswith("bad.ipynb"):
+            raise RuntimeError("cell failed")
+        return unchanged(path, timeout)
+
+    monkeypatch.setattr(notebook_cache, "execute", execute)
+    monkeypatch.setattr(notebook_cache.subprocess, "call", lambda command: pytest.fail("built despite a failed notebook"))
+    assert notebook_cache.main([str(book), "--requirements", "--build"]) == 1
+    assert "bad.ipynb" in capsys.readouterr().err
+    monkeypatch.setattr(notebook_cache.subprocess, "call", lambda command: 0)
+    assert notebook_cache.main([str(book), "--requirements", "--build", "--allow-errors"]) == 0
+    (book / "bad.ipynb").unlink()
+    assert notebook_cache.main([str(book), "--requirements"]) == 0
+
+
+def test_each_execution_stores_every_asset_it_uses(tmp_path, monkeypatch):
+    book = write_book(tmp_path / "book", ["a.ipynb", "b.ipynb"])
+
+    def execute(path, timeout, kernel_name=None):
+        # Both pages draw the same shared frame; b also draws one of its own.
+        store = AssetStore(os.path.join(os.path.dirname(path), ASSET_DIR))
+        store.put(b"shared frame", ".png")
+        if path.endswith("b.ipynb"):
+            store.put(b"b frame", ".png")
+        return unchanged(path, timeout)
+
+    monkeypatch.setattr(notebook_cache, "execute", execute)
+    cache = NotebookCache(str(tmp_path / "cache"))
+    staged = tmp_path / "staged"
+    rows = notebook_cache.stage(str(book), str(staged), cache, log=lambda line: None)
+    assert [status for _, status, _ in rows] == ["miss", "miss"]
+    assets = {entry["notebook"]: entry["files"] for entry in cache.index.values()}
+    shared = os.path.join("widget-states", content_name(b"shared frame", ".png"))
+    own = os.path.join("widget-states", content_name(b"b frame", ".png"))
+    assert assets == {"a.ipynb": [shared], "b.ipynb": sorted([shared, own])}
+
+    # b alone, from the cache: a is edited, so it runs again without drawing anything.
+    (book / "a.ipynb").write_text(json.dumps(notebook(("code", "print('edited')"))))
+    monkeypatch.setattr(notebook_cache, "execute", unchanged)
+    rows = notebook_cache.stage(str(book), str(staged), NotebookCache(str(tmp_path / "cache")), log=lambda line: None)
+    assert [status for _, status, _ in rows] == ["miss", "hit"]
+    assert (staged / "_static" / shared).read_bytes() == b"shared frame"
+    assert (staged / "_static" / own).read_bytes() == b"b frame"
+    assert notebook_cache.ASSET_LOG not in os.environ
@@ -0,0 +1,73 @@
+import copy
+import math
+import random
+
+import pytest
+
+from denot.evaluator import INF, evaluate_tree
+from denot.optimize import count_nodes, fold_constants, specialize
+from denot.parser import parse_expression
+from generators import random_expression
+
+
+def same(a, b):
+    return a == b or (isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b))
+
+
+@pytest.mark.parametrize(
+    "expr, folded",
+    [
+        ("2 + 3 * 4", "14"),
+        ("x * 1 + 0", "x"),
+        ("1 * (x - 0)", "x"),
+        ("x / 1", "x / 1"),
+        ("x * 0", "x * 0"),
+        ("(1 + 1) * y", "2 * y"),
+    ],
+)
+def test_fold_constants(expr, folded):
+    assert fold_constants(parse_expression(expr)) == parse_expression(folded)
+
+
+def test_division_by_zero_folds_to_inf():
+    assert fold_constants(parse_expression("1 / 0")) == {"type": "Number", "value": INF}
+
+
+def test_multiplying_by_zero_needs_assume_finite():
+    assert fold_constants(parse_expression("x * 0"), assume_finite=True) == parse_expression("0")
+    # x / y may be inf, and inf * 0 is nan, so the product stays.
+    assert fold_constants(parse_expression("(x / y) * 0"), assume_finite=True) == parse_expression("(x / y) * 0")
+
+
+def test_specialize_leaves_a_residual_over_free_variables():
+    tree = parse_expression("(a * b + c) * x + a")
+    residual = specialize(tree, {"a": 2, "b": 3, "c": 1})
+    assert residual == parse_expression("7 * x + 2")
+    assert count_nodes(residual) < count_nodes(tree)
+
+
+def test_passes_share_untouched_subtrees_and_keep_the_input():
+    tree = parse_expression("(x + y) * (1 + 2)")
+    before = copy.deepcopy(tree)
+    folded = fold_constants(tree)
+    assert folded["left"] is tree["left"]
+    assert tree == before
+
+
+def test_folding_preserves_meaning_on_random_trees():
+    rng = random.Random(2)
+    for seed in range(60):
+        tree = parse_expression(random_expression(40, seed=seed))
+        env = {"x": rng.choice([0, 1, 2, -3, 0.5])}
+        rest = {"y": rng.choice([0, 1, 4]), "z": rng.choice([0, 2, -1])}
+        full = {**env, **rest}
+        expected = evaluate_tree(tree, full)
+        assert same(evaluate_tree(fold_constants(tree), full), expected)
+        assert same(evaluate_tree(specialize(tree, env), rest), expected)
+        assert count_nodes(fold_constants(tree)) <= count_nodes(tree)
+
+
+def test_deep_trees_fold_without_recursion():
+    tree = parse_expression(" + ".join(["1"] * 50000), iterative=True)
+    assert fold_constants(tree) == {"type": "Number", "value": 50000}
+    assert count_nodes(tree) == 99999
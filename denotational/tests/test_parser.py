@@ -0,0 +1,75 @@
+import pytest
+
+from denot.parser import ParseError, parse_expression, token_texts, tokenize
+from generators import random_expression
+
+
+def num(value):
+    return {"type": "Number", "value": value}
+
+
+def var(name):
+    return {"type": "Variable", "name": name}
+
+
+def op(symbol, left, right):
+    return {"type": "BinaryOp", "op": symbol, "left": left, "right": right}
+
+
+@pytest.mark.parametrize("iterative", [False, True])
+@pytest.mark.parametrize(
+    "expr, tree",
+    [
+        ("2 + 3 * 4", op("+", num(2), op("*", num(3), num(4)))),
+        ("2 * 3 + 4", op("+", op("*", num(2), num(3)), num(4))),
+        ("8 - 4 - 2", op("-", op("-", num(8), num(4)), num(2))),
+        ("8 / 4 / 2", op("/", op("/", num(8), num(4)), num(2))),
+        ("(x + y) * z", op("*", op("+", var("x"), var("y")), var("z"))),
+        ("-3 * x", op("*", num(-3), var("x"))),
+        ("2.5", num(2.5)),
+    ],
+)
+def test_precedence_and_associativity(expr, tree, iterative):
+    assert parse_expression(expr, iterative=iterative) == tree
+
+
+def test_iterative_matches_recursive():
+    for seed in range(50):
+        expr = random_expression(200, seed=seed)
+        assert parse_expression(expr, iterative=True) == parse_expression(expr)
+
+
+def test_tokens_carry_spans():
+    tokens = tokenize("12 +x")
+    assert [(token.text, token.start, token.end) for token in tokens] == [("12", 0, 2), ("+", 3, 4), ("x", 4, 5)]
+    assert token_texts("(a*b)") == ["(", "a", "*", "b", ")"]
+
+
+@pytest.mark.parametrize("iterative", [False, True])
+@pytest.mark.parametrize(
+    "expr, position",
+    [
+        ("2 + * 3", 4),
+        ("(1 + 2", 6),
+        ("1 + 2)", 5),
+        ("3 $ 4", 2),
+        ("", 0),
+    ],
+)
+def test_errors_report_the_position(expr, position, iterative):
+    with pytest.raises(ParseError) as error:
+        parse_expression(expr, iterative=iterative)
+    assert error.value.position == position
+
+
+@pytest.mark.parametrize("iterative", [False, True])
+def test_overlong_integer_literal_is_a_parse_error(iterative):
+    with pytest.raises(ParseError) as error:
+        parse_expression("1 + " + "9" * 5000, iterative=iterative)
+    assert error.value.position == 4
+
+
+def test_deep_nesting_parses_iteratively():
+    depth = 100000
+    tree = parse_expression("(" * depth + "1" + ")" * depth, iterative=True)
+    assert tree == num(1)
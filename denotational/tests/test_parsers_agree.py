@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+from denot import lalr
+from denot.cyk import recognize
+from denot.earley import parse_forest
+from denot.parser import ParseError, parse_expression, token_texts
+from denot.sentences import language
+from generators import GRAMMARS, IF_THEN_ELSE, arithmetic_tokens, ast_reducer, random_expression, terminal
+
+
+def earley_accepts(rules, tokens):
+    try:
+        parse_forest(rules, tokens)
+    except ParseError:
+        return False
+    return True
+
+
+def lalr_accepts(table, tokens):
+    try:
+        table.parse(tokens)
+    except ParseError:
+        return False
+    return True
+
+
+def mutations(sentences, rng, count=200):
+    """Token lists near the language: sentences with one token dropped, swapped or repeated."""
+    alphabet = sorted({token for sentence in sentences for token in sentence})
+    for _ in range(count):
+        tokens = list(rng.choice(sentences))
+        position = rng.randrange(len(tokens) + 1)
+        action = rng.randrange(3)
+        if action == 0 and tokens:
+            del tokens[min(position, len(tokens) - 1)]
+        elif action == 1 and tokens:
+            tokens[min(position, len(tokens) - 1)] = rng.choice(alphabet)
+        else:
+            tokens.insert(position, rng.choice(alphabet))
+        yield tokens
+
+
+@pytest.mark.parametrize("name", GRAMMARS)
+def test_every_short_sentence_is_accepted(name):
+    rules = GRAMMARS[name]
+    table = lalr.parse_table(rules, cache_dir=None)
+    for tokens in language(rules).sentences(max_length=5):
+        assert earley_accepts(rules, tokens), tokens
+        assert recognize(rules, tokens), tokens
+        if not table.conflicts:
+            assert lalr_accepts(table, tokens), tokens
+
+
+@pytest.mark.parametrize("name", GRAMMARS)
+def test_parsers_agree_on_near_misses(name):
+    rules = GRAMMARS[name]
+    table = lalr.parse_table(rules, cache_dir=None)
+    sentences = [tokens for tokens in language(rules).sentences(max_length=6) if tokens]
+    for tokens in mutations(sentences, random.Random(name)):
+        accepted = earley_accepts(rules, tokens)
+        assert recognize(rules, tokens) == accepted, tokens
+        if not table.conflicts:
+            assert lalr_accepts(table, tokens) == accepted, tokens
+
+
+def test_long_input():
+    rules = GRAMMARS["Arithmetic Expressions"]
+    tokens = arithmetic_tokens(2001, seed=3)
+    assert parse_forest(rules, tokens).count_trees() == 1
+    assert recognize(rules, tokens)
+    assert lalr_accepts(lalr.parse_table(rules, cache_dir=None), tokens)
+    assert not recognize(rules, tokens[:-1])
+    assert not earley_accepts(rules, tokens[:-1])
+
+
+def test_lalr_builds_the_same_ast_as_parse_expression():
+    rules = GRAMMARS["Arithmetic Expressions"]
+    table = lalr.parse_table(rules, cache_dir=None)
+    reduce = ast_reducer(table.grammar)
+    for seed in range(100):
+        expr = random_expression(5 + seed % 40, seed=seed)
+        tokens = token_texts(expr)
+        assert table.parse(tokens, reduce=reduce, kind=terminal) == parse_expression(expr), expr
+
+
+def test_ambiguous_sums_count_catalan_trees():
+    catalan = [1, 1, 2, 5, 14, 42]
+    for operands in range(1, 7):
+        tokens = ["id", "="] + " + ".join(["id"] * operands).split()
+        assert parse_forest(IF_THEN_ELSE, tokens).count_trees() == catalan[operands - 1]
+        assert recognize(IF_THEN_ELSE, tokens)
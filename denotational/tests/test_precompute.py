@@ -0,0 +1,84 @@
+import json
+import os
+
+from denot import precompute
+from denot.precompute import ASSET_DIR, AssetStore, content_name, precompute_states, switcher_html
+
+
+def test_content_name():
+    assert content_name(b"abc") == content_name("abc")
+    assert content_name(b"abc", ".png").endswith(".png") and len(content_name(b"abc")) == 16
+    assert content_name(b"abc") != content_name(b"abd")
+
+
+def test_store_writes_each_content_once(tmp_path):
+    store = AssetStore(str(tmp_path / "assets"), url_prefix="assets")
+    first = store.put(b"frame", ".png")
+    assert store.put(b"frame", ".png") == first == "assets/" + content_name(b"frame", ".png")
+    store.put(b"other", ".png")
+    assert (store.written, store.reused) == (2, 1)
+    assert sorted(os.listdir(tmp_path / "assets")) == sorted([content_name(b"frame", ".png"), content_name(b"other", ".png")])
+
+
+def test_urls_are_relative_to_the_page(tmp_path):
+    (tmp_path / "_config.yml").write_text("title: Test\n")
+    (tmp_path / "chapter" / "part").mkdir(parents=True)
+    root_page = AssetStore(page_dir=str(tmp_path))
+    nested_page = AssetStore(page_dir=str(tmp_path / "chapter" / "part"))
+    assert root_page.directory == nested_page.directory == os.path.join(str(tmp_path), ASSET_DIR)
+    assert root_page.put(b"frame", ".png") == "_static/widget-states/" + content_name(b"frame", ".png")
+    assert nested_page.put(b"frame", ".png") == "../../_static/widget-states/" + content_name(b"frame", ".png")
+
+
+def test_outside_a_book_the_page_directory_is_the_root(tmp_path):
+    store = AssetStore(page_dir=str(tmp_path))
+    assert store.directory == os.path.join(str(tmp_path), ASSET_DIR)
+    assert store.url_prefix == "_static/widget-states"
+
+
+def test_asset_log_lists_new_and_reused_assets(tmp_path, monkeypatch):
+    log = tmp_path / "assets.log"
+    monkeypatch.setenv(precompute.ASSET_LOG, str(log))
+    store = AssetStore(str(tmp_path / "assets"))
+    store.put(b"frame", ".png")
+    store.put(b"frame", ".png")
+    path = os.path.join(str(tmp_path / "assets"), content_name(b"frame", ".png"))
+    assert log.read_text().split() == [path, path]
+
+
+def test_states_and_switcher(tmp_path):
+    store = AssetStore(str(tmp_path / "assets"), url_prefix="../assets")
+
+    def render(option):
+        print(f"text of {option}" if option != "c" else "text of a")
+        return option.encode() if option != "b" else b"a"
+
+    manifest = precompute_states(store, ["a", "b", "c"], render)
+    states = manifest["states"]
+    assert states["a"]["image"] == states["b"]["image"] != states["c"]["image"]
+    assert states["a"]["text"] == states["c"]["text"] and len(manifest["texts"]) == 2
+    assert store.written == 2
+
+    page = switcher_html("Pick <one>:", manifest, "b")
+    assert "Pick &lt;one&gt;:" in page
+    assert "<option selected>b</option>" in page
+    assert f'src="{states["b"]["image"]}"' in page and states["b"]["image"].startswith("../assets/")
+    embedded = page.split('<script type="application/json">')[1].split("</script>")[0]
+    assert json.loads(embedded) == manifest
+
+
+def test_switcher_escapes_script_ends(tmp_path):
+    store = AssetStore(str(tmp_path), url_prefix=".")
+    manifest = precompute_states(store, ["x"], lambda option: print("</script><b>") or b"png")
+    page = switcher_html("Pick:", manifest)
+    assert page.count("</script>") == 2
+    assert "&lt;/script&gt;&lt;b&gt;" in page
+
+
+def test_enabled_only_for_static_builds(monkeypatch):
+    monkeypatch.delenv("DENOT_STATIC_WIDGETS", raising=False)
+    assert not precompute.enabled()
+    monkeypatch.setenv("DENOT_STATIC_WIDGETS", "0")
+    assert not precompute.enabled()
+    monkeypatch.setenv("DENOT_STATIC_WIDGETS", "1")
+    assert precompute.enabled()
@@ -0,0 +1,58 @@
+from denot.semantics import Assignment, Block, semantic_function
+
+
+def assign(name, value):
+    return semantic_function("assignment", (name, value))
+
+
+def sequence(first, second):
+    return semantic_function("sequence", (first, second))
+
+
+def test_adjacent_assignments_are_fused():
+    block = semantic_function("block", ([assign("x", 1), assign("y", 2), assign("x", 3)],))
+    assert len(block) == 1
+    assert dict(block({})) == {"x": 3, "y": 2}
+
+
+def test_fusion_stops_at_other_statements():
+    double = lambda env: env.set("x", env["x"] * 2)
+    block = Block([assign("x", 1), double, assign("y", 5), assign("x", 7)])
+    assert len(block) == 3
+    assert dict(block({})) == {"x": 7, "y": 5}
+    assert len(Block(block.statements, fuse=False)) == 3
+    assert dict(Block([assign("x", 1), double], fuse=False)({})) == {"x": 2}
+
+
+def test_extending_a_block_keeps_the_earlier_one():
+    first = sequence(assign("x", 1), assign("y", 2))
+    longer = sequence(first, assign("x", 10))
+    branch = sequence(first, assign("z", 3))
+    assert dict(first({})) == {"x": 1, "y": 2}
+    assert dict(longer({})) == {"x": 10, "y": 2}
+    assert dict(branch({})) == {"x": 1, "y": 2, "z": 3}
+
+
+def test_fused_assignments_do_not_leak_into_shared_prefixes():
+    first = sequence(assign("x", 1), assign("y", 2))
+    first({})
+    longer = sequence(first, assign("x", 10))
+    assert dict(longer({})) == {"x": 10, "y": 2}
+    assert first.statements[0].bindings == {"x": 1, "y": 2}
+    assert isinstance(first.statements[0], Assignment)
+
+
+def test_long_pairwise_sequence_shares_one_list():
+    # Building is linear because every step appends to the same list instead of copying it.
+    program = assign("i", 0)
+    blocks = []
+    for i in range(40000):
+        program = sequence(program, assign(f"v{i % 100}", i))
+        blocks.append(program)
+    assert all(block._items is program._items for block in blocks)
+    assert len(program._items) == program._count == 40001
+    assert [block._count for block in blocks[:3]] == [2, 3, 4]
+    # All assignments fuse into one statement, run without recursion.
+    assert len(program) == 1
+    env = program({})
+    assert env["v99"] == 39999 and len(env) == 101
@@ -0,0 +1,66 @@
+import itertools
+import random
+from collections import Counter
+
+import pytest
+
+from denot.earley import parse_forest
+from denot.parser import ParseError
+from denot.sentences import Language, language
+from generators import ARITHMETIC, IF_THEN_ELSE, SIMPLE, random_grammar
+
+DYCK = {"S": ["( S ) S", ""]}
+CATALAN = [1, 1, 2, 5, 14, 42, 132, 429, 1430, 4862]
+
+
+def accepts(rules, tokens):
+    try:
+        parse_forest(rules, tokens)
+    except ParseError:
+        return False
+    return True
+
+
+def test_derivation_counts():
+    assert [language(DYCK).derivations(2 * n) for n in range(10)] == CATALAN
+    assert language(DYCK).derivations(3) == 0
+    assert language(SIMPLE).derivations(3) == 3  # aab, abb, ccc
+
+
+def test_sentences_are_ordered_and_distinct():
+    sentences = list(language(SIMPLE).sentences(max_length=3))
+    assert sentences == [["c"], ["a", "b"], ["c", "c"], ["a", "a", "b"], ["a", "b", "b"], ["c", "c", "c"]]
+    # The dangling else: ambiguous sentences are produced once.
+    ambiguous = list(language(IF_THEN_ELSE).sentences(length=5))
+    assert len(ambiguous) == len({tuple(sentence) for sentence in ambiguous}) == language(IF_THEN_ELSE).count_sentences(5)
+
+
+def test_sentences_match_brute_force_on_random_grammars():
+    for seed in range(25):
+        rules = random_grammar(4, 3, 9, seed=seed, max_length=3)
+        lang = Language(rules)
+        terminals = [name for name in lang.grammar.terminals if name != "$"]
+        for length in range(4):
+            expected = [list(tokens) for tokens in itertools.product(sorted(terminals), repeat=length) if accepts(rules, list(tokens))]
+            assert list(lang.sentences(length)) == expected, (rules, length)
+
+
+def test_longest():
+    assert language(SIMPLE).longest() is None
+    assert Language({"S": ["a B", "c"], "B": ["b", ""]}).longest() == 2
+    assert Language({"S": ["S a"]}).longest() == -1
+    assert list(Language({"S": ["a B", "c"], "B": ["b", ""]}).sentences()) == [["a"], ["c"], ["a", "b"]]
+
+
+def test_samples_are_uniform_sentences():
+    lang = language(ARITHMETIC)
+    rng = random.Random(3)
+    counts = Counter(tuple(lang.sample(5, rng)) for _ in range(20000))
+    assert set(counts) == {tuple(sentence) for sentence in lang.sentences(5)}
+    # Chi-squared against the uniform distribution, far above its mean of len(counts) - 1.
+    expected = 20000 / len(counts)
+    assert sum((count - expected) ** 2 / expected for count in counts.values()) < 1.5 * len(counts)
+    assert not lang.has_empty and language(DYCK).has_empty
+    assert language(DYCK).sample(0, rng) == []
+    with pytest.raises(ValueError):
+        lang.sample(2, rng)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from denot.evaluator import evaluate_tree
+from denot.parser import parse_expression
+from denot.vectorized import as_columns, evaluate_batch, evaluate_batch_chunked, evaluate_chunks, iter_chunks
+from generators import random_expression
+
+
+def test_matches_evaluate_tree_row_by_row():
+    rng = np.random.default_rng(0)
+    columns = {"x": rng.integers(-3, 4, 50).astype(float), "y": rng.integers(-3, 4, 50).astype(float)}
+    for seed in range(30):
+        tree = parse_expression(random_expression(30, seed=seed))
+        batch = evaluate_batch(tree, columns)
+        expected = [evaluate_tree(tree, {"x": x, "y": y}) for x, y in zip(columns["x"].tolist(), columns["y"].tolist())]
+        np.testing.assert_array_equal(batch, np.array(expected, dtype=float))
+
+
+def test_division_by_zero_is_inf():
+    result = evaluate_batch(parse_expression("1 / x"), {"x": np.array([0, 2, 0])})
+    np.testing.assert_array_equal(result, [np.inf, 0.5, np.inf])
+
+
+def test_unbound_variables_and_broadcasting():
+    xs, ys = np.meshgrid(np.arange(3), np.arange(2))
+    result = evaluate_batch(parse_expression("x * 10 + y + z"), {"x": xs, "y": ys})
+    assert result.shape == (2, 3)
+    np.testing.assert_array_equal(result, xs * 10 + ys)
+    assert evaluate_batch(parse_expression("2 + 3"), {}).shape == ()
+
+
+def test_result_never_aliases_a_column():
+    xs = np.arange(4)
+    result = evaluate_batch(parse_expression("x"), {"x": xs})
+    result[0] = 99
+    assert xs[0] == 0
+
+
+def test_structured_arrays_and_out():
+    rows = np.zeros(3, dtype=[("x", float), ("y", float)])
+    rows["x"], rows["y"] = [1, 2, 3], [4, 5, 6]
+    assert sorted(as_columns(rows)) == ["x", "y"]
+    out = np.empty(3)
+    assert evaluate_batch(parse_expression("x - y"), rows, out=out) is out
+    np.testing.assert_array_equal(out, [-3, -3, -3])
+
+
+def test_chunked_evaluation_matches_whole_batch(tmp_path):
+    tree = parse_expression("(x + 1) / (x - 3)")
+    xs = np.arange(1000, dtype=float)
+    expected = evaluate_batch(tree, {"x": xs})
+    assert [len(chunk["x"]) for chunk in iter_chunks({"x": xs}, 300)] == [300, 300, 300, 100]
+    np.testing.assert_array_equal(np.concatenate(list(evaluate_chunks(tree, iter_chunks({"x": xs}, 300)))), expected)
+    np.testing.assert_array_equal(evaluate_batch_chunked(tree, {"x": xs}, chunk_size=128), expected)
+    mapped = np.memmap(tmp_path / "x.bin", dtype=float, mode="w+", shape=xs.shape)
+    mapped[:] = xs
+    out = np.memmap(tmp_path / "out.bin", dtype=float, mode="w+", shape=xs.shape)
+    assert evaluate_batch_chunked(tree, {"x": mapped}, chunk_size=128, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+
+
+def test_chunked_evaluation_needs_rows():
+    with pytest.raises(ValueError):
+        evaluate_batch_chunked(parse_expression("x"), {"x": np.zeros((2, 2))})
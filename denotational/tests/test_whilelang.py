@@ -0,0 +1,100 @@
+import pytest
+
+from denot.fixpoint import Divergence
+from denot.parser import ParseError
+from denot.whilelang import _WhileParser, denote, parse_program, run_program
+
+FACTORIAL = "f := 1; while n > 1 do (f := f * n; n := n - 1)"
+
+
+def test_factorial():
+    assert run_program(FACTORIAL, {"n": 5}) == {"f": 120, "n": 1}
+
+
+def test_denotation_is_reusable():
+    program = denote(FACTORIAL)
+    assert [program.run({"n": n})["f"] for n in range(1, 7)] == [1, 2, 6, 24, 120, 720]
+
+
+@pytest.mark.parametrize(
+    "x, y",
+    [(0, 1), (1, 2), (2, 1), (3, 2)],
+)
+def test_booleans(x, y):
+    assert run_program("if x < 3 and not (x = 1) then y := 1 else y := 2", {"x": x})["y"] == y
+
+
+def test_sequence_binds_loosest():
+    # The second assignment runs once, after the loop.
+    assert run_program("while i < 3 do i := i + 1; j := j + 1") == {"i": 3, "j": 1}
+
+
+def test_expression_semantics_follow_evaluate_tree():
+    assert run_program("x := 1 / 0; y := z + 1") == {"x": float("inf"), "y": 1, "z": 0}
+
+
+def test_ast_shape():
+    assert parse_program("x := 1; skip") == {
+        "type": "Seq",
+        "statements": [{"type": "Assign", "name": "x", "expr": {"type": "Number", "value": 1}}, {"type": "Skip"}],
+    }
+
+
+def test_divergence_is_reported():
+    with pytest.raises(Divergence):
+        run_program("while true do skip", budget=100)
+
+
+@pytest.mark.parametrize("source, position", [("x := ", 5), ("if := 3", 3)])
+def test_parse_errors(source, position):
+    with pytest.raises(ParseError) as error:
+        parse_program(source)
+    assert error.value.position == position
+
+
+def test_long_programs_run_without_recursion():
+    source = "; ".join(f"x := x + {i}" for i in range(20000))
+    assert run_program(source) == {"x": sum(range(20000))}
+
+
+def test_long_expressions_run_without_recursion():
+    assert run_program("x := 1; y := " + " + ".join(["x"] * 3000)) == {"x": 1, "y": 3000}
+    assert run_program("x := 2; y := 100 - " + " - ".join(["x"] * 3000) + " * x") == {"x": 2, "y": 100 - 2 * 2999 - 4}
+    conditions = " and ".join(["x < 2"] * 3000)
+    assert run_program(f"x := 1; if {conditions} then y := 1 else y := 2")["y"] == 1
+    assert run_program(f"x := 1; if x > 1 or {conditions} then y := 1 else y := 2")["y"] == 1
+    assert run_program("x := 1; if " + "not " * 301 + "x < 2 then y := 1 else y := 2")["y"] == 2
+
+
+@pytest.mark.parametrize(
+    "condition, y",
+    [
+        ("(x + 1) * 2 > 7", 1),
+        ("((x) < 4 or (x = 0))", 1),
+        ("(x < 1 or x > 5)", 2),
+        ("not ((x < 1)) and (x) + 1 = 4", 1),
+    ],
+)
+def test_parenthesized_conditions(condition, y):
+    assert run_program(f"x := 3; if {condition} then y := 1 else y := 2")["y"] == y
+
+
+def test_parenthesized_conditions_parse_once(monkeypatch):
+    # Each '(' is decided by the token after its ')', never by reparsing the group.
+    calls = []
+    original = _WhileParser.boolean
+
+    def boolean(self):
+        calls.append(self.pos)
+        return original(self)
+
+    monkeypatch.setattr(_WhileParser, "boolean", boolean)
+    depth = 200
+    tree = parse_program("if " + "(" * depth + "x < 1" + ")" * depth + " then skip else skip")
+    assert tree["cond"] == {"type": "Compare", "op": "<", "left": {"type": "Variable", "name": "x"}, "right": {"type": "Number", "value": 1}}
+    assert len(calls) == depth + 1
+
+
+def test_unbalanced_condition():
+    with pytest.raises(ParseError):
+        parse_program("if (x < 1 then skip else skip")